@@ -1,41 +1,102 @@
 from django.contrib import admin
 from modeltranslation.admin import TranslationAdmin
 from django.utils.html import format_html
-from django.db.models import Count, Q, F, Sum, Avg
+from django.db import transaction
+from django.db.models import BinaryField, Count, Q, F, Sum, Avg
 from django.urls import reverse, path
 from django.utils.safestring import mark_safe
 from django.shortcuts import render, redirect
 from django.contrib import messages
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.utils import timezone
 from datetime import timedelta
 import csv
 import json
-import base64
-from .models import Project, NewsEvent, SuccessStory, SuccessStoryGalleryImage, ProjectGalleryImage, NewsEventGalleryImage, FAQ, FAQVote
+from .serializers import translation_field_names
+from .card_utils import invalidate_faq_widget
+from .clone_utils import clone_project
+from apps.users.certificate_utils import issue_certificates, project_has_ended
+from .models import Project, NewsEvent, SuccessStory, SuccessStoryGalleryImage, ProjectGalleryImage, NewsEventGalleryImage, FAQ, FAQVote, ContentChange
+
+
+class Echo:
+    """Pseudo-buffer whose write() returns the CSV line, so rows can be streamed instead of buffered"""
+
+    def write(self, value):
+        return value
 
 
 class ExportMixin:
     """Mixin to add export functionality to admin classes"""
-    
+
+    # Rows fetched per database round trip while streaming an export
+    export_chunk_size = 2000
+
+    def get_export_fields(self):
+        """
+        Column names for the CSV export. Binary blobs are left out, foreign keys
+        export their id, and translated fields export one column per language
+        (``title_en``, ``title_zh_tw``) in place of the active-language value.
+        """
+        localized = set(translation_field_names(self.model))
+        field_names = []
+        for field in self.model._meta.concrete_fields:
+            if isinstance(field, BinaryField) or field.name in localized:
+                continue
+            field_names.extend(translation_field_names(self.model, [field.name]) or [field.attname])
+        return field_names
+
     def export_as_csv(self, request, queryset):
-        """Export selected items as CSV"""
+        """Export selected items as CSV, streamed row by row"""
         meta = self.model._meta
-        field_names = [field.name for field in meta.fields]
-        
-        response = HttpResponse(content_type='text/csv')
+        field_names = self.get_export_fields()
+        writer = csv.writer(Echo())
+
+        def rows():
+            yield writer.writerow(field_names)
+            for row in queryset.values_list(*field_names).iterator(chunk_size=self.export_chunk_size):
+                yield writer.writerow(row)
+
+        response = StreamingHttpResponse(rows(), content_type='text/csv')
         response['Content-Disposition'] = f'attachment; filename={meta.verbose_name_plural}.csv'
-        
-        writer = csv.writer(response)
-        writer.writerow(field_names)
-        
-        for obj in queryset:
-            writer.writerow([getattr(obj, field) for field in field_names])
-        
         return response
     export_as_csv.short_description = '📥 Export selected as CSV'
 
 
+def blob_thumbnail(obj, model_name, field_name, width):
+    """
+    ``<img>`` pointing at the cached thumbnail endpoint. The blob bytes never
+    reach the admin page, and the column can stay deferred.
+    """
+    if not obj.pk or not getattr(obj, field_name + '_name', None):
+        return None
+    url = reverse('content_serve_blob_thumbnail', args=[model_name, obj.pk, field_name])
+    return format_html(
+        '<img src="{}?w={}&amp;v={}" width="{}" loading="lazy" />',
+        url, width, int(obj.updated_at.timestamp()), width
+    )
+
+
+class DeferBlobsMixin:
+    """Leave BinaryField image columns out of admin querysets; previews go through ``blob_thumbnail``."""
+    deferred_blob_fields = ('image_blob',)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer(*self.deferred_blob_fields)
+
+
+class ChangeFeedActionsMixin:
+    """Bulk actions go through ``update_and_record`` so the change feed and ``updated_at`` follow them."""
+
+    def update_and_record(self, queryset, **fields):
+        """``queryset.update(**fields)`` that also bumps ``updated_at`` and logs a ContentChange per row"""
+        with transaction.atomic():
+            ids = list(queryset.values_list('pk', flat=True))
+            count = self.model.objects.filter(pk__in=ids).update(updated_at=timezone.now(), **fields)
+            ContentChange.record(self.model, ids, ContentChange.Action.UPSERT)
+        return count
+
+
 class FAQVoteInline(admin.TabularInline):
     """Inline admin for viewing FAQ votes within FAQ admin"""
     model = FAQVote
@@ -53,7 +114,7 @@ class FAQVoteInline(admin.TabularInline):
         return False
 
 
-class ProjectGalleryImageInline(admin.TabularInline):
+class ProjectGalleryImageInline(DeferBlobsMixin, admin.TabularInline):
     """Inline admin for managing gallery images within Project admin"""
     model = ProjectGalleryImage
     extra = 1
@@ -61,24 +122,14 @@ class ProjectGalleryImageInline(admin.TabularInline):
     readonly_fields = ('image_preview',)
     ordering = ['order']
 
-    def get_queryset(self, request):
-        qs = super().get_queryset(request)
-        return qs
-
     def image_preview(self, obj):
-        if obj.image_blob:
-            encoded_image = base64.b64encode(obj.image_blob).decode('utf-8')
-            return format_html(
-                '<img src="data:{};base64,{}" width="150" />',
-                obj.image_blob_mime,
-                encoded_image
-            )
-        return "No Image / Not Saved Yet"
+        return blob_thumbnail(obj, 'project_gallery_image', 'image_blob', 150) or "No Image / Not Saved Yet"
     image_preview.short_description = 'Preview'
 
 
 @admin.register(Project)
-class ProjectAdmin(ExportMixin, TranslationAdmin):
+class ProjectAdmin(ChangeFeedActionsMixin, DeferBlobsMixin, ExportMixin, TranslationAdmin):
+    deferred_blob_fields = ('cover_image_blob',)
     list_display = (
         'image_preview',
         'project_id', 
@@ -112,6 +163,7 @@ class ProjectAdmin(ExportMixin, TranslationAdmin):
     )
     
     list_filter = (
+        'status',
         'country', 
         'theme', 
         'is_active', 
@@ -142,7 +194,9 @@ class ProjectAdmin(ExportMixin, TranslationAdmin):
         'remove_hero_highlight',
         'set_as_featured',
         'remove_featured',
-        'duplicate_project'
+        'duplicate_project',
+        'issue_certificates',
+        'issue_certificates_and_notify',
     ]
     
     # Autocomplete for enrolled users
@@ -202,6 +256,7 @@ class ProjectAdmin(ExportMixin, TranslationAdmin):
             )
         return f"{obj.headcount}/∞"
     headcount_display.short_description = 'Headcount'
+    headcount_display.admin_order_field = 'headcount'
     
     def image_preview(self, obj):
         """Display thumbnail of cover image"""
@@ -209,14 +264,14 @@ class ProjectAdmin(ExportMixin, TranslationAdmin):
             return format_html('<img src="{}" width="50" height="50" style="object-fit: cover;" />', obj.cover_image.url)
         elif obj.cover_image_url:
             return format_html('<img src="{}" width="50" height="50" style="object-fit: cover;" />', obj.cover_image_url)
-        return "No image"
+        return blob_thumbnail(obj, 'project', 'cover_image_blob', 50) or "No image"
     image_preview.short_description = 'Preview'
 
     def enrolled_count(self, obj):
         """Display number of enrolled users"""
-        count = obj.enrolled_users.count()
-        return count
+        return obj._enrolled_count
     enrolled_count.short_description = 'Enrolled'
+    enrolled_count.admin_order_field = '_enrolled_count'
     
     def duration_display(self, obj):
         """Display duration in a formatted way"""
@@ -233,20 +288,24 @@ class ProjectAdmin(ExportMixin, TranslationAdmin):
         return format_html('<span style="color: gray;">N/A</span>')
     duration_display.short_description = 'Duration'
     
+    STATUS_BADGES = {
+        Project.Status.OPEN: ('green', '✓ Open'),
+        Project.Status.CLOSED: ('red', '⏰ Deadline Passed'),
+        Project.Status.RUNNING: ('blue', '▶ Running'),
+        Project.Status.COMPLETED: ('gray', '✔ Completed'),
+    }
+
     def status_display(self, obj):
-        """Display project status based on dates"""
-        from django.utils import timezone
-        now = timezone.now()
-        
-        if obj.application_deadline and now > obj.application_deadline:
-            return format_html('<span style="color: red;">⏰ Deadline Passed</span>')
-        elif obj.is_full:
-            return format_html('<span style="color: orange;">👥 Full</span>')
-        elif obj.is_active:
-            return format_html('<span style="color: green;">✓ Open</span>')
+        """Display the stored lifecycle status, flagging inactive and full projects"""
+        if not obj.is_active:
+            color, label = 'gray', '✗ Inactive'
+        elif obj.status == Project.Status.OPEN and obj.is_full:
+            color, label = 'orange', '👥 Full'
         else:
-            return format_html('<span style="color: gray;">✗ Inactive</span>')
+            color, label = self.STATUS_BADGES[obj.status]
+        return format_html('<span style="color: {};">{}</span>', color, label)
     status_display.short_description = 'Status'
+    status_display.admin_order_field = 'status'
     
     def enrolled_users_display(self, obj):
         """Display enrolled users in a styled table with user details"""
@@ -378,51 +437,66 @@ class ProjectAdmin(ExportMixin, TranslationAdmin):
     
     # Custom actions
     def mark_as_active(self, request, queryset):
-        count = queryset.update(is_active=True)
+        count = self.update_and_record(queryset, is_active=True)
         self.message_user(request, f'{count} project(s) marked as active.')
     mark_as_active.short_description = 'Mark as active'
     
     def mark_as_inactive(self, request, queryset):
-        count = queryset.update(is_active=False)
+        count = self.update_and_record(queryset, is_active=False)
         self.message_user(request, f'{count} project(s) marked as inactive.')
     mark_as_inactive.short_description = 'Mark as inactive'
     
     def set_as_hero_highlight(self, request, queryset):
-        count = queryset.update(is_hero_highlight=True)
+        count = self.update_and_record(queryset, is_hero_highlight=True)
         self.message_user(request, f'{count} project(s) set as hero highlight.')
     set_as_hero_highlight.short_description = 'Set as hero highlight'
     
     def remove_hero_highlight(self, request, queryset):
-        count = queryset.update(is_hero_highlight=False)
+        count = self.update_and_record(queryset, is_hero_highlight=False)
         self.message_user(request, f'{count} project(s) removed from hero highlight.')
     remove_hero_highlight.short_description = 'Remove hero highlight'
     
     def set_as_featured(self, request, queryset):
-        count = queryset.update(is_featured=True)
+        count = self.update_and_record(queryset, is_featured=True)
         self.message_user(request, f'{count} project(s) set as featured.')
     set_as_featured.short_description = 'Set as featured'
     
     def remove_featured(self, request, queryset):
-        count = queryset.update(is_featured=False)
+        count = self.update_and_record(queryset, is_featured=False)
         self.message_user(request, f'{count} project(s) removed from featured.')
     remove_featured.short_description = 'Remove featured status'
     
     def duplicate_project(self, request, queryset):
-        for project in queryset:
-            # Create a duplicate
-            project.pk = None
-            project.project_id = ''
-            project.kicc_project_id = None
-            project.title = f"{project.title} (Copy)"
-            project.save()
-        self.message_user(request, f'{queryset.count()} project(s) duplicated successfully.')
+        project_ids = list(queryset.values_list('pk', flat=True))
+        for project_id in project_ids:
+            clone_project(project_id)
+        self.message_user(request, f'{len(project_ids)} project(s) duplicated successfully.')
     duplicate_project.short_description = 'Duplicate selected projects'
     
+    def _issue_certificates(self, request, queryset, notify):
+        projects = queryset.defer('cover_image_blob')
+        ended = [project for project in projects if project_has_ended(project)]
+        issued = sum(
+            len(issue_certificates(project, notify=notify, protocol=request.scheme, domain=request.get_host()))
+            for project in ended
+        )
+        self.message_user(request, f'{issued} certificate(s) issued for {len(ended)} ended project(s).')
+        skipped = len(projects) - len(ended)
+        if skipped:
+            self.message_user(request, f'{skipped} project(s) skipped because they have not ended yet.', messages.WARNING)
+    
+    def issue_certificates(self, request, queryset):
+        self._issue_certificates(request, queryset, notify=False)
+    issue_certificates.short_description = 'Issue certificates to enrolled users'
+    
+    def issue_certificates_and_notify(self, request, queryset):
+        self._issue_certificates(request, queryset, notify=True)
+    issue_certificates_and_notify.short_description = 'Issue certificates to enrolled users and email them'
+    
     def get_queryset(self, request):
-        """Optimize queryset with prefetch"""
+        """Annotate enrollment counts so the changelist column doesn't query per row"""
         qs = super().get_queryset(request)
-        qs = qs.prefetch_related('enrolled_users', 'success_stories')
-        return qs
+        return qs.annotate(_enrolled_count=Count('enrolled_users', distinct=True))
 
     def cover_image_preview(self, obj):
         """Show preview of cover image in detail view"""
@@ -430,11 +504,11 @@ class ProjectAdmin(ExportMixin, TranslationAdmin):
             return format_html('<img src="{}" width="200" />', obj.cover_image.url)
         if obj.cover_image_url:
             return format_html('<img src="{}" width="200" />', obj.cover_image_url)
-        return "No image provided"
+        return blob_thumbnail(obj, 'project', 'cover_image_blob', 200) or "No image provided"
     cover_image_preview.short_description = 'Cover Preview'
 
 
-class NewsEventGalleryImageInline(admin.TabularInline):
+class NewsEventGalleryImageInline(DeferBlobsMixin, admin.TabularInline):
     """Inline admin for managing gallery images within NewsEvent admin"""
     model = NewsEventGalleryImage
     extra = 1
@@ -442,24 +516,14 @@ class NewsEventGalleryImageInline(admin.TabularInline):
     readonly_fields = ('image_preview',)
     ordering = ['order']
 
-    def get_queryset(self, request):
-        qs = super().get_queryset(request)
-        return qs
-
     def image_preview(self, obj):
-        if obj.image_blob:
-            encoded_image = base64.b64encode(obj.image_blob).decode('utf-8')
-            return format_html(
-                '<img src="data:{};base64,{}" width="150" />',
-                obj.image_blob_mime,
-                encoded_image
-            )
-        return "No Image / Not Saved Yet"
+        return blob_thumbnail(obj, 'news_event_gallery_image', 'image_blob', 150) or "No Image / Not Saved Yet"
     image_preview.short_description = 'Preview'
 
 
 @admin.register(NewsEvent)
-class NewsEventAdmin(ExportMixin, TranslationAdmin):
+class NewsEventAdmin(ChangeFeedActionsMixin, DeferBlobsMixin, ExportMixin, TranslationAdmin):
+    deferred_blob_fields = ('cover_image_blob',)
     list_display = (
         'image_preview',
         'news_event_id', 
@@ -552,37 +616,37 @@ class NewsEventAdmin(ExportMixin, TranslationAdmin):
             return format_html('<img src="{}" width="50" height="50" style="object-fit: cover;" />', obj.cover_image.url)
         elif obj.cover_image_url:
             return format_html('<img src="{}" width="50" height="50" style="object-fit: cover;" />', obj.cover_image_url)
-        return "No image"
+        return blob_thumbnail(obj, 'news_event', 'cover_image_blob', 50) or "No image"
     image_preview.short_description = 'Preview'
     
     # Custom actions
     def publish_items(self, request, queryset):
-        count = queryset.update(is_published=True)
+        count = self.update_and_record(queryset, is_published=True)
         self.message_user(request, f'{count} item(s) published.')
     publish_items.short_description = 'Publish selected items'
     
     def unpublish_items(self, request, queryset):
-        count = queryset.update(is_published=False)
+        count = self.update_and_record(queryset, is_published=False)
         self.message_user(request, f'{count} item(s) unpublished.')
     unpublish_items.short_description = 'Unpublish selected items'
     
     def set_as_hero_highlight(self, request, queryset):
-        count = queryset.update(is_hero_highlight=True)
+        count = self.update_and_record(queryset, is_hero_highlight=True)
         self.message_user(request, f'{count} item(s) set as hero highlight.')
     set_as_hero_highlight.short_description = 'Set as hero highlight'
     
     def remove_hero_highlight(self, request, queryset):
-        count = queryset.update(is_hero_highlight=False)
+        count = self.update_and_record(queryset, is_hero_highlight=False)
         self.message_user(request, f'{count} item(s) removed from hero highlight.')
     remove_hero_highlight.short_description = 'Remove hero highlight'
     
     def set_as_featured(self, request, queryset):
-        count = queryset.update(is_featured=True)
+        count = self.update_and_record(queryset, is_featured=True)
         self.message_user(request, f'{count} item(s) set as featured.')
     set_as_featured.short_description = 'Set as featured'
     
     def remove_featured(self, request, queryset):
-        count = queryset.update(is_featured=False)
+        count = self.update_and_record(queryset, is_featured=False)
         self.message_user(request, f'{count} item(s) removed from featured.')
     remove_featured.short_description = 'Remove featured status'
 
@@ -592,18 +656,19 @@ class NewsEventAdmin(ExportMixin, TranslationAdmin):
             return format_html('<img src="{}" width="200" />', obj.cover_image.url)
         if obj.cover_image_url:
             return format_html('<img src="{}" width="200" />', obj.cover_image_url)
-        return "No image provided"
+        return blob_thumbnail(obj, 'news_event', 'cover_image_blob', 200) or "No image provided"
     cover_image_preview.short_description = 'Cover Preview'
 
 
 @admin.register(ProjectGalleryImage)
-class ProjectGalleryImageAdmin(admin.ModelAdmin):
+class ProjectGalleryImageAdmin(DeferBlobsMixin, admin.ModelAdmin):
     """Admin for managing project gallery images"""
     list_display = ('id', 'project_link', 'image_preview', 'image_blob_name', 'caption', 'order', 'created_at')
     list_filter = ('project', 'created_at')
     search_fields = ('project__title', 'caption', 'image_blob_name')
     readonly_fields = ('image_preview', 'image_blob', 'image_blob_mime', 'image_blob_name', 'updated_at')
     ordering = ('project', 'order', 'created_at')
+    list_select_related = ('project',)
     
     fieldsets = (
         ('Image Association', {
@@ -631,25 +696,19 @@ class ProjectGalleryImageAdmin(admin.ModelAdmin):
     project_link.short_description = 'Project'
 
     def image_preview(self, obj):
-        if obj.image_blob:
-            encoded_image = base64.b64encode(obj.image_blob).decode('utf-8')
-            return format_html(
-                '<img src="data:{};base64,{}" width="150" />',
-                obj.image_blob_mime,
-                encoded_image
-            )
-        return "No Image"
+        return blob_thumbnail(obj, 'project_gallery_image', 'image_blob', 150) or "No Image"
     image_preview.short_description = 'Preview'
 
 
 @admin.register(NewsEventGalleryImage)
-class NewsEventGalleryImageAdmin(admin.ModelAdmin):
+class NewsEventGalleryImageAdmin(DeferBlobsMixin, admin.ModelAdmin):
     """Admin for managing news/event gallery images"""
     list_display = ('id', 'news_event_link', 'image_preview', 'image_blob_name', 'caption', 'order', 'created_at')
     list_filter = ('news_event', 'created_at')
     search_fields = ('news_event__title', 'caption', 'image_blob_name')
     readonly_fields = ('image_preview', 'image_blob', 'image_blob_mime', 'image_blob_name', 'updated_at')
     ordering = ('news_event', 'order', 'created_at')
+    list_select_related = ('news_event',)
     
     fieldsets = (
         ('Image Association', {
@@ -677,25 +736,19 @@ class NewsEventGalleryImageAdmin(admin.ModelAdmin):
     news_event_link.short_description = 'News/Event'
 
     def image_preview(self, obj):
-        if obj.image_blob:
-            encoded_image = base64.b64encode(obj.image_blob).decode('utf-8')
-            return format_html(
-                '<img src="data:{};base64,{}" width="150" />',
-                obj.image_blob_mime,
-                encoded_image
-            )
-        return "No Image"
+        return blob_thumbnail(obj, 'news_event_gallery_image', 'image_blob', 150) or "No Image"
     image_preview.short_description = 'Preview'
 
 
 @admin.register(SuccessStoryGalleryImage)
-class SuccessStoryGalleryImageAdmin(admin.ModelAdmin):
+class SuccessStoryGalleryImageAdmin(DeferBlobsMixin, admin.ModelAdmin):
     """Admin for managing success story gallery images"""
     list_display = ('id', 'success_story_link', 'image_preview', 'image_blob_name', 'caption', 'order', 'created_at')
     list_filter = ('success_story', 'created_at')
     search_fields = ('success_story__title', 'caption', 'image_blob_name')
     readonly_fields = ('image_preview', 'image_blob', 'image_blob_mime', 'image_blob_name', 'updated_at')
     ordering = ('success_story', 'order', 'created_at')
+    list_select_related = ('success_story',)
     
     fieldsets = (
         ('Image Association', {
@@ -723,18 +776,11 @@ class SuccessStoryGalleryImageAdmin(admin.ModelAdmin):
     success_story_link.short_description = 'Success Story'
 
     def image_preview(self, obj):
-        if obj.image_blob:
-            encoded_image = base64.b64encode(obj.image_blob).decode('utf-8')
-            return format_html(
-                '<img src="data:{};base64,{}" width="150" />',
-                obj.image_blob_mime,
-                encoded_image
-            )
-        return "No Image"
+        return blob_thumbnail(obj, 'success_story_gallery_image', 'image_blob', 150) or "No Image"
     image_preview.short_description = 'Preview'
 
 
-class SuccessStoryGalleryImageInline(admin.TabularInline):
+class SuccessStoryGalleryImageInline(DeferBlobsMixin, admin.TabularInline):
     """Inline admin for managing gallery images within SuccessStory admin"""
     model = SuccessStoryGalleryImage
     extra = 1
@@ -743,19 +789,13 @@ class SuccessStoryGalleryImageInline(admin.TabularInline):
     ordering = ['order']
 
     def image_preview(self, obj):
-        if obj.image_blob:
-            encoded_image = base64.b64encode(obj.image_blob).decode('utf-8')
-            return format_html(
-                '<img src="data:{};base64,{}" width="150" />',
-                obj.image_blob_mime,
-                encoded_image
-            )
-        return "No Image / Not Saved Yet"
+        return blob_thumbnail(obj, 'success_story_gallery_image', 'image_blob', 150) or "No Image / Not Saved Yet"
     image_preview.short_description = 'Preview'
 
 
 @admin.register(SuccessStory)
-class SuccessStoryAdmin(ExportMixin, TranslationAdmin):
+class SuccessStoryAdmin(ChangeFeedActionsMixin, DeferBlobsMixin, ExportMixin, TranslationAdmin):
+    deferred_blob_fields = ('cover_image_blob',)
     list_display = (
         'image_preview',
         'success_story_id', 
@@ -894,37 +934,37 @@ class SuccessStoryAdmin(ExportMixin, TranslationAdmin):
             return format_html('<img src="{}" width="50" height="50" style="object-fit: cover;" />', obj.cover_image.url)
         elif obj.cover_image_url:
             return format_html('<img src="{}" width="50" height="50" style="object-fit: cover;" />', obj.cover_image_url)
-        return "No image"
+        return blob_thumbnail(obj, 'success_story', 'cover_image_blob', 50) or "No image"
     image_preview.short_description = 'Preview'
     
     # Custom actions
     def publish_stories(self, request, queryset):
-        count = queryset.update(is_published=True)
+        count = self.update_and_record(queryset, is_published=True)
         self.message_user(request, f'{count} story(ies) published.')
     publish_stories.short_description = 'Publish selected stories'
     
     def unpublish_stories(self, request, queryset):
-        count = queryset.update(is_published=False)
+        count = self.update_and_record(queryset, is_published=False)
         self.message_user(request, f'{count} story(ies) unpublished.')
     unpublish_stories.short_description = 'Unpublish selected stories'
     
     def set_as_hero_highlight(self, request, queryset):
-        count = queryset.update(is_hero_highlight=True)
+        count = self.update_and_record(queryset, is_hero_highlight=True)
         self.message_user(request, f'{count} story(ies) set as hero highlight.')
     set_as_hero_highlight.short_description = 'Set as hero highlight'
     
     def remove_hero_highlight(self, request, queryset):
-        count = queryset.update(is_hero_highlight=False)
+        count = self.update_and_record(queryset, is_hero_highlight=False)
         self.message_user(request, f'{count} story(ies) removed from hero highlight.')
     remove_hero_highlight.short_description = 'Remove hero highlight'
     
     def set_as_featured(self, request, queryset):
-        count = queryset.update(is_featured=True)
+        count = self.update_and_record(queryset, is_featured=True)
         self.message_user(request, f'{count} story(ies) set as featured.')
     set_as_featured.short_description = 'Set as featured'
     
     def remove_featured(self, request, queryset):
-        count = queryset.update(is_featured=False)
+        count = self.update_and_record(queryset, is_featured=False)
         self.message_user(request, f'{count} story(ies) removed from featured.')
     remove_featured.short_description = 'Remove featured status'
 
@@ -934,7 +974,7 @@ class SuccessStoryAdmin(ExportMixin, TranslationAdmin):
             return format_html('<img src="{}" width="200" />', obj.cover_image.url)
         if obj.cover_image_url:
             return format_html('<img src="{}" width="200" />', obj.cover_image_url)
-        return "No image provided"
+        return blob_thumbnail(obj, 'success_story', 'cover_image_blob', 200) or "No image provided"
     cover_image_preview.short_description = 'Cover Preview'
 
 
@@ -1037,6 +1077,8 @@ class FAQAdmin(ExportMixin, TranslationAdmin):
     
     def reset_votes(self, request, queryset):
         count = queryset.update(thumbs_up=0, thumbs_down=0)
+        # update() sends no signals; the widget shows vote counts
+        invalidate_faq_widget()
         self.message_user(request, f'Votes reset for {count} FAQ(s).')
     reset_votes.short_description = 'Reset all votes'
     
@@ -1,31 +1,417 @@
-from rest_framework import viewsets
-from .models import Project, NewsEvent, SuccessStory, FAQ
-from .serializers import ProjectSerializer, NewsEventSerializer, SuccessStorySerializer, FAQSerializer
+import calendar
+import hashlib
+import uuid
 
-class ProjectViewSet(viewsets.ModelViewSet):
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils import translation
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from .models import Project, NewsEvent, SuccessStory, FAQ, ContentChange
+from .serializers import (
+    ProjectSerializer, NewsEventSerializer, SuccessStorySerializer, FAQSerializer,
+    ProjectListSerializer, NewsEventListSerializer, SuccessStoryListSerializer,
+    ProjectBulkSerializer, NewsEventBulkSerializer, SuccessStoryBulkSerializer,
+    translation_field_names,
+)
+
+
+class SparseFieldsetViewSetMixin:
+    """
+    Use a compact serializer for the list action and narrow the SQL to the
+    columns the (possibly ``?fields=``-restricted) serializer actually reads,
+    which also keeps the image blob columns out of read queries. Fields that
+    aren't columns are resolved through the serializer's
+    ``sparse_field_dependencies``; if a selected field is in neither, the
+    query is left unnarrowed rather than deferring a column it may read.
+    """
+    list_serializer_class = None
+
+    def get_serializer_class(self):
+        if self.action == 'list' and self.list_serializer_class is not None:
+            return self.list_serializer_class
+        return super().get_serializer_class()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method not in SAFE_METHODS:
+            return queryset
+
+        model = queryset.model
+        concrete_fields = {field.name for field in model._meta.concrete_fields}
+        serializer = self.get_serializer()
+        dependencies = getattr(serializer, 'sparse_field_dependencies', {})
+        columns = [model._meta.pk.name]
+        for name, field in serializer.fields.items():
+            if name in dependencies:
+                columns.extend(dependencies[name])
+            elif field.source in concrete_fields:
+                columns.append(field.source)
+            else:
+                return queryset
+        return queryset.only(*columns)
+
+
+class GalleryImagesCountMixin:
+    """Annotate ``gallery_images_count`` so serializers don't COUNT per row."""
+
+    def get_queryset(self):
+        return super().get_queryset().annotate(gallery_images_count=Count('gallery_images'))
+
+
+class ConditionalGetMixin:
+    """
+    ETag/Last-Modified support for list and retrieve.
+
+    Validators come from a single cheap query (``Max('updated_at')`` and the
+    row count for collections, the row's ``updated_at`` for objects), so a
+    matching ``If-None-Match``/``If-Modified-Since`` returns 304 before the
+    page is fetched or serialized. Anonymous reads are also marked publicly
+    cacheable for ``API_CACHE_MAX_AGE`` seconds.
+    """
+    last_modified_field = 'updated_at'
+
+    def get_validator_queryset(self):
+        # The plain class queryset: no annotations or column narrowing needed here
+        return self.filter_queryset(self.queryset.all())
+
+    def make_etag(self, *parts):
+        request = self.request
+        key = '|'.join(str(part) for part in (
+            self.queryset.model._meta.label,
+            request.get_full_path(),
+            translation.get_language(),
+            request.accepted_renderer.format,
+            *parts,
+        ))
+        return quote_etag(hashlib.md5(key.encode()).hexdigest())
+
+    def conditional_response(self, request, handler, etag, last_modified, *args, **kwargs):
+        timestamp = calendar.timegm(last_modified.utctimetuple()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+            if request.user.is_authenticated:
+                patch_cache_control(response, private=True, no_cache=True)
+            else:
+                patch_cache_control(response, public=True, max_age=getattr(settings, 'API_CACHE_MAX_AGE', 60))
+            patch_vary_headers(response, ('Accept', 'Accept-Language'))
+        return response
+
+    def list(self, request, *args, **kwargs):
+        stats = self.get_validator_queryset().aggregate(
+            last_modified=Max(self.last_modified_field), count=Count('pk'),
+        )
+        etag = self.make_etag(stats['last_modified'], stats['count'])
+        return self.conditional_response(request, super().list, etag, stats['last_modified'], *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            row = (
+                self.get_validator_queryset()
+                .filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+                .values_list('pk', self.last_modified_field)
+                .first()
+            )
+        except (ValueError, TypeError, ValidationError):
+            # A malformed id; the regular lookup answers it with a 404
+            row = None
+        if row is None:
+            return super().retrieve(request, *args, **kwargs)
+        etag = self.make_etag(*row)
+        return self.conditional_response(request, super().retrieve, etag, row[1], *args, **kwargs)
+
+
+class BulkWriteMixin:
+    """
+    Batch write endpoints:
+
+    * ``POST <collection>/bulk/`` creates a list of objects.
+    * ``PATCH <collection>/bulk/`` partially updates a list of objects by ``id``.
+    * ``POST <collection>/bulk-upsert/`` updates the items matching an existing
+      ``id`` (or ``upsert_field``) and creates the rest.
+
+    The whole batch is validated first; if any item is invalid nothing is
+    written and the per-item errors are returned. Valid batches are written
+    with ``bulk_create``/``bulk_update`` in one transaction, which bypasses
+    ``save()`` and the signals, so public ids, fields derived in ``save()``
+    (see ``prepare_bulk_object``) and the change log are maintained here.
+    """
+    bulk_serializer_class = None
+    public_id_field = None
+    upsert_field = None
+    max_bulk_size = 500
+
+    def get_bulk_items(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return None, Response({'detail': 'Expected a non-empty list of objects.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > self.max_bulk_size:
+            return None, Response(
+                {'detail': f'At most {self.max_bulk_size} objects can be written per request.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not all(isinstance(item, dict) for item in items):
+            return None, Response({'detail': 'Every item must be an object.'}, status=status.HTTP_400_BAD_REQUEST)
+        return items, None
+
+    def prepare_bulk_object(self, obj):
+        """Set the fields ``save()`` would derive and return their names."""
+        return []
+
+    def get_bulk_instances(self, items, require_id=False):
+        """Map each item to its existing instance (or None) with a single query."""
+        model = self.queryset.model
+        ids = [item['id'] for item in items if item.get('id') is not None]
+        keys = [item[self.upsert_field] for item in items if self.upsert_field and item.get('id') is None and item.get(self.upsert_field)]
+        blob_fields = [field.name for field in model._meta.concrete_fields if isinstance(field, models.BinaryField)]
+
+        lookup = models.Q(pk__in=ids)
+        if keys:
+            lookup |= models.Q(**{f'{self.upsert_field}__in': keys})
+        existing = list(self.queryset.filter(lookup).defer(*blob_fields)) if ids or keys else []
+        by_id = {obj.pk: obj for obj in existing}
+        by_key = {getattr(obj, self.upsert_field): obj for obj in existing} if keys else {}
+
+        instances, errors, seen = [], [], set()
+        for index, item in enumerate(items):
+            if item.get('id') is not None:
+                instance = by_id.get(item['id'])
+                if instance is None:
+                    errors.append({'index': index, 'errors': {'id': ['Object does not exist.']}})
+            elif require_id:
+                instance = None
+                errors.append({'index': index, 'errors': {'id': ['This field is required.']}})
+            else:
+                instance = by_key.get(item.get(self.upsert_field)) if self.upsert_field else None
+            if instance is not None:
+                if instance.pk in seen:
+                    errors.append({'index': index, 'errors': {'id': ['Object appears more than once in the batch.']}})
+                seen.add(instance.pk)
+            instances.append(instance)
+        return instances, errors
+
+    def validate_bulk(self, items, instances, errors):
+        serializers = []
+        for index, (item, instance) in enumerate(zip(items, instances)):
+            serializer = self.bulk_serializer_class(
+                instance, data=item, partial=instance is not None, context=self.get_serializer_context(),
+            )
+            if not serializer.is_valid():
+                errors.append({'index': index, 'errors': serializer.errors})
+            serializers.append(serializer)
+        errors.sort(key=lambda error: error['index'])
+        return serializers
+
+    def perform_bulk_write(self, serializers):
+        """Write the validated batch and return the saved objects in item order."""
+        model = self.queryset.model
+        objects, to_create, to_update, update_fields = [], [], [], set()
+        now = timezone.now()
+        for serializer in serializers:
+            if serializer.instance is None:
+                obj = model(**serializer.validated_data)
+                self.prepare_bulk_object(obj)
+                to_create.append(obj)
+            else:
+                obj = serializer.instance
+                for name, value in serializer.validated_data.items():
+                    setattr(obj, name, value)
+                obj.updated_at = now
+                update_fields.update(serializer.validated_data)
+                update_fields.update(self.prepare_bulk_object(obj))
+                to_update.append(obj)
+            objects.append(obj)
+
+        with transaction.atomic():
+            logged = list(to_update)
+            if to_create and connection.features.can_return_rows_from_bulk_insert:
+                # Public ids derive from the primary key, so insert unique placeholders first
+                for obj in to_create:
+                    setattr(obj, self.public_id_field, f'pending_{uuid.uuid4().hex[:24]}')
+                model.objects.bulk_create(to_create)
+                for obj in to_create:
+                    setattr(obj, self.public_id_field, f'{self.public_id_field}_{obj.pk}')
+                model.objects.bulk_update(to_create, [self.public_id_field])
+                logged += to_create
+            else:
+                # Backends that can't return ids fall back to save(), which logs via signals
+                for obj in to_create:
+                    obj.save()
+            if to_update:
+                # Assigning a translated field sets the active language's column; write them all
+                fields = update_fields | set(translation_field_names(model, update_fields)) | {'updated_at'}
+                model.objects.bulk_update(to_update, sorted(fields))
+            ContentChange.record(model, [obj.pk for obj in logged], ContentChange.Action.UPSERT)
+        return objects
+
+    def bulk_write(self, request, require_id=False, allow_update=True):
+        items, error_response = self.get_bulk_items(request)
+        if error_response is not None:
+            return error_response
+        if allow_update:
+            instances, errors = self.get_bulk_instances(items, require_id=require_id)
+        else:
+            instances, errors = [None] * len(items), []
+        serializers = self.validate_bulk(items, instances, errors)
+        if errors:
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            objects = self.perform_bulk_write(serializers)
+        except IntegrityError as exc:
+            return Response({'detail': f'Batch rejected by the database: {exc}'}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = [
+            {
+                'index': index,
+                'status': 'updated' if instance is not None else 'created',
+                'id': obj.pk,
+                self.public_id_field: getattr(obj, self.public_id_field),
+            }
+            for index, (instance, obj) in enumerate(zip(instances, objects))
+        ]
+        return Response({'results': results}, status=status.HTTP_200_OK if allow_update else status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post', 'patch'], url_path='bulk')
+    def bulk(self, request):
+        if request.method == 'PATCH':
+            return self.bulk_write(request, require_id=True)
+        return self.bulk_write(request, allow_update=False)
+
+    @action(detail=False, methods=['post'], url_path='bulk-upsert')
+    def bulk_upsert(self, request):
+        return self.bulk_write(request)
+
+
+class ProjectViewSet(BulkWriteMixin, ConditionalGetMixin, SparseFieldsetViewSetMixin, GalleryImagesCountMixin, viewsets.ModelViewSet):
     """
     API endpoint for Projects
     """
     queryset = Project.objects.all().order_by('-created_at')
     serializer_class = ProjectSerializer
+    list_serializer_class = ProjectListSerializer
+    bulk_serializer_class = ProjectBulkSerializer
+    public_id_field = 'project_id'
+    upsert_field = 'kicc_project_id'
+
+    def prepare_bulk_object(self, obj):
+        obj.status = obj.compute_status()
+        return ['status']
 
-class NewsEventViewSet(viewsets.ModelViewSet):
+class NewsEventViewSet(BulkWriteMixin, ConditionalGetMixin, SparseFieldsetViewSetMixin, GalleryImagesCountMixin, viewsets.ModelViewSet):
     """
     API endpoint for News & Events
     """
     queryset = NewsEvent.objects.all().order_by('-publish_date')
     serializer_class = NewsEventSerializer
+    list_serializer_class = NewsEventListSerializer
+    bulk_serializer_class = NewsEventBulkSerializer
+    public_id_field = 'news_event_id'
 
-class SuccessStoryViewSet(viewsets.ModelViewSet):
+class SuccessStoryViewSet(BulkWriteMixin, ConditionalGetMixin, SparseFieldsetViewSetMixin, GalleryImagesCountMixin, viewsets.ModelViewSet):
     """
     API endpoint for Success Stories
     """
     queryset = SuccessStory.objects.all().order_by('-published_at')
     serializer_class = SuccessStorySerializer
+    list_serializer_class = SuccessStoryListSerializer
+    bulk_serializer_class = SuccessStoryBulkSerializer
+    public_id_field = 'success_story_id'
 
-class FAQViewSet(viewsets.ModelViewSet):
+class FAQViewSet(SparseFieldsetViewSetMixin, viewsets.ModelViewSet):
     """
     API endpoint for FAQs
     """
     queryset = FAQ.objects.all().order_by('order')
-    serializer_class = FAQSerializer
\ No newline at end of file
+    serializer_class = FAQSerializer
+
+
+class ChangeFeedView(APIView):
+    """
+    Delta sync feed for projects, news/events and success stories.
+
+    ``GET /api/changes/?since=<cursor>`` returns the items created, updated or
+    deleted after ``cursor`` in change order, collapsed to the latest change
+    per item, together with the cursor to resume from. Start with ``since=0``
+    for a full sync. Optional ``types=project,news_event`` and ``limit``
+    (default 100, max 500) parameters narrow the page.
+
+    Only changes older than ``CONTENT_CHANGE_SETTLE_SECONDS`` are served, so
+    a change shows up in the feed that much later. In return no change is
+    skipped: a transaction still in flight when a later id committed is
+    committed before its change is served, provided it commits within the
+    window. Resuming from any returned cursor therefore never misses a
+    change.
+    """
+    default_limit = 100
+    max_limit = 500
+    serializers = {
+        ContentChange.Kind.PROJECT: ProjectSerializer,
+        ContentChange.Kind.NEWS_EVENT: NewsEventSerializer,
+        ContentChange.Kind.SUCCESS_STORY: SuccessStorySerializer,
+    }
+
+    def get(self, request):
+        try:
+            since = int(request.query_params.get('since', 0))
+            limit = min(int(request.query_params.get('limit', self.default_limit)), self.max_limit)
+        except ValueError:
+            return Response({'detail': 'since and limit must be integers.'}, status=status.HTTP_400_BAD_REQUEST)
+        if since < 0 or limit < 1:
+            return Response({'detail': 'since must be >= 0 and limit >= 1.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        changes = ContentChange.settled().filter(id__gt=since)
+        types = request.query_params.get('types')
+        if types:
+            changes = changes.filter(kind__in=[kind.strip() for kind in types.split(',')])
+
+        page = list(changes.order_by('id').values('id', 'kind', 'object_id', 'action', 'changed_at')[:limit + 1])
+        has_more = len(page) > limit
+        page = page[:limit]
+        cursor = page[-1]['id'] if page else since
+
+        # Collapse to the latest change per object, keeping log order
+        latest = {}
+        for change in page:
+            latest.pop((change['kind'], change['object_id']), None)
+            latest[(change['kind'], change['object_id'])] = change
+
+        # Load all upserted objects with one query per kind
+        objects = {}
+        models_by_kind = ContentChange.models_by_kind()
+        for kind, serializer_class in self.serializers.items():
+            ids = [object_id for (k, object_id), change in latest.items() if k == kind and change['action'] == ContentChange.Action.UPSERT]
+            if ids:
+                queryset = models_by_kind[kind].objects.filter(pk__in=ids).annotate(gallery_images_count=Count('gallery_images'))
+                data = serializer_class(queryset, many=True, context={'request': request}).data
+                objects.update({(kind, item['id']): item for item in data})
+
+        results = []
+        for key, change in latest.items():
+            data = objects.get(key)
+            # Upserts of objects deleted since are reported as deletes
+            action = 'upsert' if data is not None else 'delete'
+            results.append({
+                'cursor': change['id'],
+                'type': change['kind'],
+                'id': change['object_id'],
+                'action': action,
+                'changed_at': change['changed_at'],
+                'data': data,
+            })
+
+        return Response({'cursor': cursor, 'has_more': has_more, 'changes': results})
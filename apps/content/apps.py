@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ContentConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.content'
+
+    def ready(self):
+        # Import signals to ensure they're connected
+        import apps.content.signals  # noqa
@@ -0,0 +1,187 @@
+"""
+Content cards: the small, per-language projections of projects, news/events and
+success stories shown on list pages, the landing page and the profile page.
+
+Cards are built from narrow ``values()`` queries (no blobs; of long text only
+the first ``CARD_SUMMARY_SOURCE_CHARS`` characters, cut in the database) and are plain dicts, so they pickle cheaply into the cache. Named card
+lists are cached per language under the id of the latest settled ``ContentChange``
+entry. That log is appended by the content signal handlers and by bulk writes, so
+any content change moves every card list to a fresh key in every process within
+``CONTENT_CHANGE_SETTLE_SECONDS``, and a card list costs one indexed query plus a
+cache get.
+
+The FAQ widget is not part of the change log; its cache entries are dropped by
+the FAQ signal handler and otherwise expire after ``FAQ_WIDGET_CACHE_SECONDS``.
+"""
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce, Left, NullIf
+from django.urls import reverse
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+from modeltranslation.utils import build_localized_fieldname, get_language
+
+from apps.content_management.perf import cache_get_or_set
+
+from .models import FAQ, ContentChange, NewsEvent, Project, SuccessStory
+
+CARD_SUMMARY_WORDS = 40
+# Start of the body (markup included) read to build the summary
+CARD_SUMMARY_SOURCE_CHARS = 1000
+
+# Vote counts may lag by this much in processes that don't share the cache
+FAQ_WIDGET_CACHE_SECONDS = 60 * 5
+FAQ_WIDGET_VERSION_KEY = 'faq_widget:version'
+
+# name: (model, filters, ordering, size)
+CARD_LISTS = {
+    'featured_projects': (Project, {'is_active': True, 'is_featured': True}, '-created_at', 3),
+    'latest_projects': (Project, {'is_active': True}, '-created_at', 3),
+    'featured_news_events': (NewsEvent, {'is_published': True, 'is_featured': True}, '-publish_date', 4),
+    'latest_news_events': (NewsEvent, {'is_published': True}, '-publish_date', 4),
+    'recent_news_events': (NewsEvent, {'is_published': True}, '-publish_date', 5),
+    'featured_success_stories': (SuccessStory, {'is_published': True, 'is_featured': True}, '-published_at', 3),
+    'latest_success_stories': (SuccessStory, {'is_published': True}, '-published_at', 3),
+}
+
+COVER_FIELDS = ('cover_image', 'cover_image_blob_name', 'cover_image_url')
+
+
+def _cover_src(model, kind, row):
+    if row['cover_image_blob_name']:
+        return reverse('content_serve_blob', args=[kind, row['pk'], 'cover_image_blob'])
+    if row['cover_image']:
+        return model._meta.get_field('cover_image').storage.url(row['cover_image'])
+    return row['cover_image_url'] or ''
+
+
+def _body_start():
+    # The active language's body, falling back to the default language like
+    # modeltranslation does, cut to CARD_SUMMARY_SOURCE_CHARS in SQL
+    columns = [build_localized_fieldname('body', code) for code in dict.fromkeys((get_language(), settings.LANGUAGE_CODE))]
+    body = F(columns[0]) if len(columns) == 1 else Coalesce(NullIf(columns[0], Value('')), columns[1])
+    return Left(body, CARD_SUMMARY_SOURCE_CHARS)
+
+
+def _summary(text):
+    text = text or ''
+    cut = len(text) >= CARD_SUMMARY_SOURCE_CHARS
+    if cut and text.rfind('<') > text.rfind('>'):
+        # Drop a tag the cut went through
+        text = text[:text.rfind('<')]
+    summary = Truncator(strip_tags(text)).words(CARD_SUMMARY_WORDS)
+    if cut and not summary.endswith('…'):
+        summary += '…'
+    return summary
+
+
+def _project_card(row):
+    return {
+        'pk': row['pk'],
+        'title': row['title'],
+        'teaser': row['teaser'],
+        'cover_src': _cover_src(Project, 'project', row),
+        'country': row['country'],
+        'theme': row['theme'],
+        'difficulty': row['difficulty'],
+        'difficulty_display': str(dict(Project._meta.get_field('difficulty').choices).get(row['difficulty'], row['difficulty'])),
+        'is_active': row['is_active'],
+        'is_featured': row['is_featured'],
+        'is_full': (row['headcount'] or 0) >= row['total_headcount'],
+        'application_deadline': row['application_deadline'],
+        'start_date': row['start_date'],
+        'end_date': row['end_date'],
+        'status': row['status'],
+    }
+
+
+def _news_event_card(row):
+    return {
+        'pk': row['pk'],
+        'title': row['title'],
+        'summary': _summary(row['body_start']),
+        'cover_src': _cover_src(NewsEvent, 'news_event', row),
+        'content_type': row['content_type'],
+        'content_type_display': str(dict(NewsEvent.Type.choices).get(row['content_type'], row['content_type'])),
+        'publish_date': row['publish_date'],
+    }
+
+
+def _success_story_card(row):
+    return {
+        'pk': row['pk'],
+        'title': row['title'],
+        'summary': _summary(row['body_start']),
+        'cover_src': _cover_src(SuccessStory, 'success_story', row),
+        'is_featured': row['is_featured'],
+        'related_project_id': row['related_project'],
+        'related_project_title': row['related_project_title'] or row['related_project__title'] or '',
+        'published_at': row['published_at'],
+    }
+
+
+CARD_BUILDERS = {
+    Project: (
+        ('pk', 'title', 'teaser', 'country', 'theme', 'difficulty', 'headcount', 'total_headcount',
+         'application_deadline', 'start_date', 'end_date', 'status', 'is_active', 'is_featured') + COVER_FIELDS,
+        _project_card,
+    ),
+    NewsEvent: (
+        ('pk', 'title', 'content_type', 'publish_date') + COVER_FIELDS,
+        _news_event_card,
+    ),
+    SuccessStory: (
+        ('pk', 'title', 'is_featured', 'related_project', 'related_project__title', 'published_at') + COVER_FIELDS,
+        _success_story_card,
+    ),
+}
+
+
+def build_cards(queryset):
+    """Turn a (possibly sliced) content queryset into cards with a single narrow query."""
+    fields, builder = CARD_BUILDERS[queryset.model]
+    expressions = {}
+    if queryset.model is not Project:
+        expressions['body_start'] = _body_start()
+    if queryset.model is SuccessStory:
+        # modeltranslation only localizes the model's own fields, not lookups across relations
+        expressions['related_project_title'] = F('related_project__' + build_localized_fieldname('title', get_language()))
+    return [builder(row) for row in queryset.values(*fields, **expressions)]
+
+
+def content_cursor():
+    """Id of the latest settled content change; 0 while there is none."""
+    return ContentChange.settled().order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def card_lists(*names, timeout=DEFAULT_TIMEOUT):
+    """Return ``{name: cards}`` for the named ``CARD_LISTS`` in the active language."""
+    cursor = content_cursor()
+    language = get_language()
+    lists = {}
+    for name in names:
+        model, filters, ordering, size = CARD_LISTS[name]
+        lists[name] = cache_get_or_set(
+            f'content_cards:{cursor}:{language}:{name}',
+            lambda: build_cards(model.objects.filter(**filters).order_by(ordering)[:size]),
+            timeout=timeout,
+        )
+    return lists
+
+
+def faq_widget(size):
+    """The first ``size`` FAQs (by ``order``) as dicts in the active language."""
+    version = cache.get_or_set(FAQ_WIDGET_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+    return cache_get_or_set(
+        f'faq_widget:{version}:{get_language()}:{size}',
+        lambda: list(FAQ.objects.order_by('order').values('id', 'question', 'answer', 'thumbs_up', 'thumbs_down')[:size]),
+        timeout=FAQ_WIDGET_CACHE_SECONDS,
+    )
+
+
+def invalidate_faq_widget():
+    cache.delete(FAQ_WIDGET_VERSION_KEY)
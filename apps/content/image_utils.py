@@ -0,0 +1,48 @@
+"""
+Thumbnail generation for images stored in model BinaryFields.
+"""
+from io import BytesIO
+import logging
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+# Widths the thumbnail endpoint will render; anything else is rounded up to the next one
+THUMBNAIL_WIDTHS = (50, 150, 200, 400)
+
+
+def thumbnail_width(requested):
+    """Return the smallest allowed width that is at least ``requested`` (capped at the largest)."""
+    try:
+        requested = int(requested)
+    except (TypeError, ValueError):
+        return THUMBNAIL_WIDTHS[1]
+    for width in THUMBNAIL_WIDTHS:
+        if width >= requested:
+            return width
+    return THUMBNAIL_WIDTHS[-1]
+
+
+def make_thumbnail(data, width):
+    """
+    Downscale image bytes so they fit in a ``width`` x ``width`` box.
+
+    Returns ``(bytes, content_type)``. Images with transparency become PNG and
+    everything else becomes JPEG. Returns None when Pillow cannot read the
+    data, so the caller can fall back to the original.
+    """
+    try:
+        image = Image.open(BytesIO(data))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((width, width))
+    except (UnidentifiedImageError, OSError, ValueError) as e:
+        logger.warning(f"Could not build a {width}px thumbnail: {e}")
+        return None
+
+    output = BytesIO()
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image.save(output, format='PNG', optimize=True)
+        return output.getvalue(), 'image/png'
+    image.convert('RGB').save(output, format='JPEG', quality=80, optimize=True)
+    return output.getvalue(), 'image/jpeg'
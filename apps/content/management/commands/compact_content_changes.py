@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+from apps.content.models import ContentChange
+
+
+class Command(BaseCommand):
+    help = 'Compact the content change log, keeping only the latest change per item'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many entries would be removed',
+        )
+
+    def handle(self, *args, **options):
+        # Any cursor stays valid: an item changed after the cursor still has its
+        # latest entry after the cursor, and tombstones are never removed.
+        latest_ids = (
+            ContentChange.objects
+            .values('kind', 'object_id')
+            .annotate(latest=Max('id'))
+            .values('latest')
+        )
+        superseded = ContentChange.objects.exclude(id__in=latest_ids)
+        count = superseded.count()
+
+        if options.get('dry_run'):
+            self.stdout.write(f'{count} superseded change log entries would be removed')
+            return
+
+        superseded.delete()
+        self.stdout.write(self.style.SUCCESS(f'Removed {count} superseded change log entries'))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from apps.content.models import Project
+
+
+class Command(BaseCommand):
+    help = 'Move projects to their current lifecycle status (open -> closed -> running -> completed); run periodically, e.g. from cron'
+
+    def handle(self, *args, **options):
+        changed = Project.update_statuses()
+        self.stdout.write(self.style.SUCCESS(f'Updated the status of {len(changed)} project(s)'))
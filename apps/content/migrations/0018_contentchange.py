@@ -0,0 +1,45 @@
+# Generated by Django 5.2.6 on 2026-10-19 12:26
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def seed_existing_content(apps, schema_editor):
+    """Log every existing item as an upsert so a sync from cursor 0 sees the whole corpus."""
+    ContentChange = apps.get_model('content', 'ContentChange')
+    for kind, model_name in (('project', 'Project'), ('news_event', 'NewsEvent'), ('success_story', 'SuccessStory')):
+        Model = apps.get_model('content', model_name)
+        ContentChange.objects.bulk_create(
+            [
+                ContentChange(kind=kind, object_id=pk, action='UPSERT', changed_at=updated_at)
+                for pk, updated_at in Model.objects.order_by('updated_at').values_list('pk', 'updated_at').iterator()
+            ],
+            batch_size=500,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0017_faqvote'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentChange',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('project', 'Project'), ('news_event', 'News/Event'), ('success_story', 'Success Story')], max_length=20)),
+                ('object_id', models.IntegerField()),
+                ('action', models.CharField(choices=[('UPSERT', 'Created or updated'), ('DELETE', 'Deleted')], max_length=10)),
+                ('changed_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Content Change',
+                'verbose_name_plural': 'Content Changes',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['kind', 'id'], name='content_con_kind_6aac3c_idx'), models.Index(fields=['kind', 'object_id'], name='content_con_kind_74eac1_idx')],
+            },
+        ),
+        migrations.RunPython(seed_existing_content, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-19 13:02
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_status(apps, schema_editor):
+    """Derive the status of existing projects from their dates (mirrors Project.status_expression)."""
+    Project = apps.get_model('content', 'Project')
+    now = timezone.now()
+    today = now.date()
+    Project.objects.update(status=models.Case(
+        models.When(end_date__lt=today, then=models.Value('completed')),
+        models.When(start_date__lte=today, then=models.Value('running')),
+        models.When(application_deadline__lt=now, then=models.Value('closed')),
+        default=models.Value('open'),
+        output_field=models.CharField(),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0018_contentchange'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='status',
+            field=models.CharField(choices=[('open', 'Open'), ('closed', 'Applications closed'), ('running', 'Running'), ('completed', 'Completed')], db_index=True, default='open', editable=False, help_text='Lifecycle status derived from the dates; updated on save and by the update_project_status command.', max_length=20),
+        ),
+        migrations.RunPython(backfill_status, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-19 13:31
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0019_project_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SharedBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data', models.BinaryField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Shared Blob',
+                'verbose_name_plural': 'Shared Blobs',
+            },
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='cover_image_shared_blob',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='content.sharedblob'),
+        ),
+        migrations.AddField(
+            model_name='projectgalleryimage',
+            name='image_shared_blob',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='content.sharedblob'),
+        ),
+    ]
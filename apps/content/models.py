@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.db import models
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
@@ -21,6 +22,11 @@ class Project(models.Model):
     def save(self, *args, **kwargs):
         # Check if this is a new instance
         is_new = self.pk is None
+
+        # Keep the stored lifecycle status in step with the dates being saved
+        self.status = self.compute_status()
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'status'}
         
         # Save first to get the ID
         super().save(*args, **kwargs)
@@ -44,7 +50,10 @@ class Project(models.Model):
                     cover_image_blob=data,
                     cover_image_blob_mime=(mime or ''),
                     cover_image_blob_name=name,
+                    cover_image_shared_blob=None,
                 )
+                shared_blob_id, self.cover_image_shared_blob_id = self.cover_image_shared_blob_id, None
+                SharedBlob.release([shared_blob_id])
                 self.refresh_from_db(fields=['cover_image_blob', 'cover_image_blob_mime', 'cover_image_blob_name'])
         except Exception:
             # Don't break saves if blob copy fails
@@ -101,6 +110,10 @@ class Project(models.Model):
     cover_image_blob = models.BinaryField(null=True, blank=True, editable=False)
     cover_image_blob_mime = models.CharField(max_length=255, null=True, blank=True, editable=False)
     cover_image_blob_name = models.CharField(max_length=255, null=True, blank=True, editable=False)
+    # Cover bytes shared with clones (see SharedBlob); cover_image_blob takes precedence when set
+    cover_image_shared_blob = models.ForeignKey(
+        'SharedBlob', null=True, blank=True, editable=False, on_delete=models.PROTECT, related_name='+'
+    )
     cover_image_url = models.URLField(
         max_length=500, 
         null=True, 
@@ -124,6 +137,21 @@ class Project(models.Model):
     application_deadline = models.DateTimeField(db_index=True)
     start_date = models.DateField(null=True, blank=True, help_text=_("Project start date"))
     end_date = models.DateField(null=True, blank=True, help_text=_("Project end date"))
+
+    class Status(models.TextChoices):
+        OPEN = 'open', _('Open')
+        CLOSED = 'closed', _('Applications closed')
+        RUNNING = 'running', _('Running')
+        COMPLETED = 'completed', _('Completed')
+
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.OPEN,
+        db_index=True,
+        editable=False,
+        help_text=_("Lifecycle status derived from the dates; updated on save and by the update_project_status command.")
+    )
     is_active = models.BooleanField(default=True)
     is_hero_highlight = models.BooleanField(
         default=False, 
@@ -152,6 +180,41 @@ class Project(models.Model):
     def is_full(self):
         return (self.headcount or 0) >= self.total_headcount
 
+    def compute_status(self, now=None):
+        """Lifecycle status for ``now``: open -> closed at the deadline -> running -> completed."""
+        now = now or timezone.now()
+        today = now.date()
+        if self.end_date and self.end_date < today:
+            return self.Status.COMPLETED
+        if self.start_date and self.start_date <= today:
+            return self.Status.RUNNING
+        if self.application_deadline and self.application_deadline < now:
+            return self.Status.CLOSED
+        return self.Status.OPEN
+
+    @classmethod
+    def status_expression(cls, now=None):
+        """The same rules as ``compute_status`` as a database expression."""
+        now = now or timezone.now()
+        today = now.date()
+        return models.Case(
+            models.When(end_date__lt=today, then=models.Value(cls.Status.COMPLETED)),
+            models.When(start_date__lte=today, then=models.Value(cls.Status.RUNNING)),
+            models.When(application_deadline__lt=now, then=models.Value(cls.Status.CLOSED)),
+            default=models.Value(cls.Status.OPEN),
+            output_field=models.CharField(),
+        )
+
+    @classmethod
+    def update_statuses(cls, now=None):
+        """Move projects whose dates have passed to their current status; returns the changed ids."""
+        expression = cls.status_expression(now)
+        changed = list(cls.objects.exclude(status=expression).values_list('pk', flat=True))
+        if changed:
+            cls.objects.filter(pk__in=changed).update(status=expression, updated_at=timezone.now())
+            ContentChange.record(cls, changed, ContentChange.Action.UPSERT)
+        return changed
+
     def can_user_apply(self, user):
         if not user or not user.is_authenticated:
             return False
@@ -474,6 +537,10 @@ class ProjectGalleryImage(models.Model):
         max_length=255,
         help_text=_("Original filename of the uploaded image.")
     )
+    # Bytes shared with clones (see SharedBlob); image_blob takes precedence when not empty
+    image_shared_blob = models.ForeignKey(
+        'SharedBlob', null=True, blank=True, editable=False, on_delete=models.PROTECT, related_name='+'
+    )
     
     # Optional caption/description for the image
     caption = models.CharField(
@@ -644,3 +711,128 @@ class FAQVote(models.Model):
     
     def __str__(self):
         return f"{self.user.username} - {self.faq.question[:30]} - {self.get_vote_type_display()}"
+
+
+# -----------------------------------------------------------------------------
+# 7. Content Change Log (Delta sync feed)
+# -----------------------------------------------------------------------------
+
+class ContentChange(models.Model):
+    """
+    Append-only log of content creates, updates and deletes.
+
+    Backs the ``/api/changes/`` delta feed: the auto-increment ``id`` is the
+    sync cursor, and DELETE rows act as tombstones for removed objects.
+    Entries are written by the signal handlers in apps/content/signals.py.
+
+    Ids are assigned on insert but become visible on commit, so a lower id
+    can appear after a higher one. Cursor readers use ``settled()``.
+    """
+    class Kind(models.TextChoices):
+        PROJECT = 'project', _('Project')
+        NEWS_EVENT = 'news_event', _('News/Event')
+        SUCCESS_STORY = 'success_story', _('Success Story')
+
+    class Action(models.TextChoices):
+        UPSERT = 'UPSERT', _('Created or updated')
+        DELETE = 'DELETE', _('Deleted')
+
+    id = models.BigAutoField(primary_key=True)
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    object_id = models.IntegerField()
+    action = models.CharField(max_length=10, choices=Action.choices)
+    changed_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        verbose_name = _("Content Change")
+        verbose_name_plural = _("Content Changes")
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['kind', 'id']),
+            models.Index(fields=['kind', 'object_id']),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} {self.action} {self.kind} {self.object_id}"
+
+    @classmethod
+    def models_by_kind(cls):
+        return {
+            cls.Kind.PROJECT: Project,
+            cls.Kind.NEWS_EVENT: NewsEvent,
+            cls.Kind.SUCCESS_STORY: SuccessStory,
+        }
+
+    @classmethod
+    def kind_for(cls, model):
+        for kind, kind_model in cls.models_by_kind().items():
+            if issubclass(model, kind_model):
+                return kind
+        return None
+
+    @classmethod
+    def settled(cls):
+        """
+        Changes older than ``CONTENT_CHANGE_SETTLE_SECONDS``. Once the newest of
+        them is visible, so is every lower id, as long as the transactions
+        writing changes commit within the window.
+        """
+        settle = getattr(settings, 'CONTENT_CHANGE_SETTLE_SECONDS', 5)
+        return cls.objects.filter(changed_at__lte=timezone.now() - timezone.timedelta(seconds=settle))
+
+    @classmethod
+    def record(cls, model, object_ids, action):
+        """Append one change per object id; used by signals and bulk writes alike."""
+        kind = cls.kind_for(model)
+        if kind is None:
+            return []
+        now = timezone.now()
+        return cls.objects.bulk_create([
+            cls(kind=kind, object_id=object_id, action=action, changed_at=now)
+            for object_id in object_ids
+        ])
+
+
+# -----------------------------------------------------------------------------
+# 8. Shared Blob (Image bytes referenced by several rows)
+# -----------------------------------------------------------------------------
+
+class SharedBlob(models.Model):
+    """
+    Image bytes referenced by more than one row, e.g. a template project and
+    its clones, so cloning doesn't copy them.
+
+    A row's own blob column takes precedence over its shared blob, so an image
+    replaced on one row never changes the others and shared bytes are never
+    modified. A shared blob is deleted once no row references it.
+    """
+    data = models.BinaryField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = _("Shared Blob")
+        verbose_name_plural = _("Shared Blobs")
+
+    def __str__(self):
+        return f"Shared blob #{self.pk}"
+
+    @classmethod
+    def release(cls, blob_ids):
+        """Delete those of the given shared blobs that no row references any more."""
+        blob_ids = {blob_id for blob_id in blob_ids if blob_id}
+        if not blob_ids:
+            return
+        referenced = set()
+        for model, fields in SHARED_BLOB_FIELDS.items():
+            for field_name in fields.values():
+                referenced.update(
+                    model.objects.filter(**{f'{field_name}__in': blob_ids}).values_list(f'{field_name}_id', flat=True)
+                )
+        cls.objects.filter(pk__in=blob_ids - referenced).delete()
+
+
+# Blob field -> shared blob foreign key, per model
+SHARED_BLOB_FIELDS = {
+    Project: {'cover_image_blob': 'cover_image_shared_blob'},
+    ProjectGalleryImage: {'image_blob': 'image_shared_blob'},
+}
@@ -1,8 +1,135 @@
+from operator import attrgetter
+
 from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import PKOnlyObject
+from django.db import models
+from modeltranslation.settings import AVAILABLE_LANGUAGES
+from modeltranslation.translator import translator, NotRegistered
+from modeltranslation.utils import build_localized_fieldname
 from .models import Project, NewsEvent, SuccessStory, FAQ
 
-class ProjectSerializer(serializers.ModelSerializer):
+# Fields whose to_representation() is a no-op for values loaded from the DB,
+# so the fast list path can read the attribute directly.
+PASSTHROUGH_FIELDS = (serializers.CharField, serializers.IntegerField, serializers.BooleanField, serializers.ChoiceField)
+
+
+def requested_fields(request):
+    """Return the set of field names requested via ``?fields=a,b`` or None."""
+    if request is None:
+        return None
+    value = getattr(request, 'query_params', request.GET).get('fields')
+    if not value:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin that limits the output to the fields named in the
+    ``?fields=`` query parameter. Unknown names are ignored; if none of the
+    requested names exist the full representation is returned. Only reads
+    are trimmed; writes always accept every field.
+
+    ``sparse_field_dependencies`` maps fields that aren't a model column
+    (properties, method fields) to the columns they read, so the viewset can
+    still narrow the query to the selected fields.
+    """
+    sparse_field_dependencies = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS:
+            return
+        requested = requested_fields(request)
+        if requested and requested & set(self.fields):
+            for name in set(self.fields) - requested:
+                self.fields.pop(name)
+
+
+class FastReadOnlyListSerializer(serializers.ListSerializer):
+    """
+    List serializer for read-only list endpoints.
+
+    Field accessors are resolved once per page instead of once per row, and
+    plain scalar fields skip ``get_attribute``/``to_representation`` entirely.
+    The output is identical to ``ListSerializer.to_representation``.
+    """
+
+    def _compile_fields(self):
+        compiled = []
+        for field in self.child._readable_fields:
+            if isinstance(field, PASSTHROUGH_FIELDS) and len(field.source_attrs) == 1:
+                compiled.append((field.field_name, attrgetter(field.source_attrs[0]), None))
+            else:
+                compiled.append((field.field_name, field.get_attribute, field.to_representation))
+        return compiled
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        compiled = self._compile_fields()
+        results = []
+        for instance in iterable:
+            ret = {}
+            for name, get, to_representation in compiled:
+                try:
+                    attribute = get(instance)
+                except SkipField:
+                    continue
+                if to_representation is None:
+                    ret[name] = attribute
+                    continue
+                check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+                ret[name] = None if check_for_none is None else to_representation(attribute)
+            results.append(ret)
+        return results
+
+
+def translation_field_names(model, names=None):
+    """
+    Return the per-language column names (``title_en``, ``title_zh_tw``...)
+    of a model's translated fields, optionally only those among ``names``.
+    """
+    try:
+        options = translator.get_options_for_model(model)
+    except NotRegistered:
+        return []
+    return [
+        build_localized_fieldname(name, language)
+        for name in options.fields
+        if names is None or name in names
+        for language in AVAILABLE_LANGUAGES
+    ]
+
+
+class TranslationFieldsMixin:
+    """
+    ModelSerializer mixin that also exposes the per-language columns, so bulk
+    imports can write every translation in one request.
+    """
+
+    def get_field_names(self, declared_fields, info):
+        names = list(super().get_field_names(declared_fields, info))
+        return names + [name for name in translation_field_names(self.Meta.model) if name not in names]
+
+
+def gallery_images_count(obj):
+    """
+    Return the gallery image count, preferring the ``gallery_images_count``
+    annotation added by the viewsets so list pages don't run a COUNT per row.
+    """
+    count = getattr(obj, 'gallery_images_count', None)
+    if count is None:
+        count = obj.gallery_images.count()
+    return count
+
+
+class ProjectSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     gallery_images_count = serializers.SerializerMethodField()
+    # Read from the viewset's annotation, not from a column
+    sparse_field_dependencies = {'gallery_images_count': ()}
     
     class Meta:
         model = Project
@@ -11,15 +138,36 @@ class ProjectSerializer(serializers.ModelSerializer):
                  'duration', 'difficulty', 'headcount', 'total_headcount', 
                  'cover_image', 'cover_image_url', 'video_urls', 'image_urls',
                  'gallery_images_count', 'application_deadline', 'start_date', 
-                 'end_date', 'is_active', 'is_hero_highlight', 'is_featured',
+                 'end_date', 'status', 'is_active', 'is_hero_highlight', 'is_featured',
                  'created_at', 'updated_at']
     
     def get_gallery_images_count(self, obj):
         """Return the count of gallery images"""
-        return obj.gallery_images.count()
+        return gallery_images_count(obj)
+
+class ProjectListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Compact project card used by the list endpoint."""
+    gallery_images_count = serializers.SerializerMethodField()
+    # Read from the viewset's annotation, not from a column
+    sparse_field_dependencies = {'gallery_images_count': ()}
+
+    class Meta:
+        model = Project
+        fields = ['id', 'project_id', 'title', 'teaser', 'country', 'theme',
+                 'duration', 'difficulty', 'headcount', 'total_headcount',
+                 'cover_image', 'cover_image_url', 'gallery_images_count',
+                 'application_deadline', 'start_date', 'end_date', 'status',
+                 'is_active', 'is_featured', 'updated_at']
+        list_serializer_class = FastReadOnlyListSerializer
+
+    def get_gallery_images_count(self, obj):
+        """Return the count of gallery images"""
+        return gallery_images_count(obj)
 
-class NewsEventSerializer(serializers.ModelSerializer):
+class NewsEventSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     gallery_images_count = serializers.SerializerMethodField()
+    # Read from the viewset's annotation, not from a column
+    sparse_field_dependencies = {'gallery_images_count': ()}
     
     class Meta:
         model = NewsEvent
@@ -31,10 +179,30 @@ class NewsEventSerializer(serializers.ModelSerializer):
     
     def get_gallery_images_count(self, obj):
         """Return the count of gallery images"""
-        return obj.gallery_images.count()
+        return gallery_images_count(obj)
+
+class NewsEventListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Compact news/event card used by the list endpoint (no body text)."""
+    gallery_images_count = serializers.SerializerMethodField()
+    # Read from the viewset's annotation, not from a column
+    sparse_field_dependencies = {'gallery_images_count': ()}
+
+    class Meta:
+        model = NewsEvent
+        fields = ['id', 'news_event_id', 'title', 'content_type',
+                 'cover_image', 'cover_image_url', 'external_link',
+                 'gallery_images_count', 'publish_date', 'is_published',
+                 'is_featured', 'updated_at']
+        list_serializer_class = FastReadOnlyListSerializer
+
+    def get_gallery_images_count(self, obj):
+        """Return the count of gallery images"""
+        return gallery_images_count(obj)
 
-class SuccessStorySerializer(serializers.ModelSerializer):
+class SuccessStorySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     gallery_images_count = serializers.SerializerMethodField()
+    # Read from the viewset's annotation, not from a column
+    sparse_field_dependencies = {'gallery_images_count': ()}
     
     class Meta:
         model = SuccessStory
@@ -46,11 +214,42 @@ class SuccessStorySerializer(serializers.ModelSerializer):
     
     def get_gallery_images_count(self, obj):
         """Return the count of gallery images"""
-        return obj.gallery_images.count()
+        return gallery_images_count(obj)
+
+class SuccessStoryListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Compact success story card used by the list endpoint (no body text)."""
+    gallery_images_count = serializers.SerializerMethodField()
+    # Read from the viewset's annotation, not from a column
+    sparse_field_dependencies = {'gallery_images_count': ()}
+
+    class Meta:
+        model = SuccessStory
+        fields = ['id', 'success_story_id', 'title', 'related_project',
+                 'cover_image', 'cover_image_url', 'gallery_images_count',
+                 'beneficiaries', 'total_hours_contributed', 'is_published',
+                 'published_at', 'is_featured', 'updated_at']
+        list_serializer_class = FastReadOnlyListSerializer
+
+    def get_gallery_images_count(self, obj):
+        """Return the count of gallery images"""
+        return gallery_images_count(obj)
+
+class ProjectBulkSerializer(TranslationFieldsMixin, ProjectSerializer):
+    """Project serializer used by the bulk write endpoints."""
+
+class NewsEventBulkSerializer(TranslationFieldsMixin, NewsEventSerializer):
+    """News/event serializer used by the bulk write endpoints."""
+
+class SuccessStoryBulkSerializer(TranslationFieldsMixin, SuccessStorySerializer):
+    """Success story serializer used by the bulk write endpoints."""
 
-class FAQSerializer(serializers.ModelSerializer):
+class FAQSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     total_votes = serializers.ReadOnlyField()
     helpfulness_ratio = serializers.ReadOnlyField()
+    sparse_field_dependencies = {
+        'total_votes': ('thumbs_up', 'thumbs_down'),
+        'helpfulness_ratio': ('thumbs_up', 'thumbs_down'),
+    }
     
     class Meta:
         model = FAQ
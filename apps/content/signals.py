@@ -0,0 +1,68 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .card_utils import invalidate_faq_widget
+from .models import (
+    Project, NewsEvent, SuccessStory, ContentChange, FAQ, SharedBlob, SHARED_BLOB_FIELDS,
+    ProjectGalleryImage, NewsEventGalleryImage, SuccessStoryGalleryImage,
+)
+
+# Gallery images change the parent's gallery_images_count, so they touch the
+# parent's updated_at (which the API's ETags and the sitemap's lastmod read)
+GALLERY_PARENTS = {
+    ProjectGalleryImage: (Project, 'project_id'),
+    NewsEventGalleryImage: (NewsEvent, 'news_event_id'),
+    SuccessStoryGalleryImage: (SuccessStory, 'success_story_id'),
+}
+
+
+# Receivers are connected per model, so saves of unrelated models don't run them
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=NewsEvent)
+@receiver(post_save, sender=SuccessStory)
+def log_content_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        ContentChange.record(sender, [instance.pk], ContentChange.Action.UPSERT)
+
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=NewsEvent)
+@receiver(post_delete, sender=SuccessStory)
+def log_content_deleted(sender, instance, **kwargs):
+    ContentChange.record(sender, [instance.pk], ContentChange.Action.DELETE)
+
+
+@receiver(post_save, sender=ProjectGalleryImage)
+@receiver(post_save, sender=NewsEventGalleryImage)
+@receiver(post_save, sender=SuccessStoryGalleryImage)
+def log_gallery_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    parent_model, parent_field = GALLERY_PARENTS[sender]
+    parent_id = getattr(instance, parent_field)
+    parent_model.objects.filter(pk=parent_id).update(updated_at=timezone.now())
+    ContentChange.record(parent_model, [parent_id], ContentChange.Action.UPSERT)
+
+
+@receiver(post_delete, sender=ProjectGalleryImage)
+@receiver(post_delete, sender=NewsEventGalleryImage)
+@receiver(post_delete, sender=SuccessStoryGalleryImage)
+def log_gallery_deleted(sender, instance, **kwargs):
+    parent_model, parent_field = GALLERY_PARENTS[sender]
+    parent_id = getattr(instance, parent_field)
+    # Cascade deletes of the parent log their own DELETE
+    if parent_model.objects.filter(pk=parent_id).update(updated_at=timezone.now()):
+        ContentChange.record(parent_model, [parent_id], ContentChange.Action.UPSERT)
+
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=ProjectGalleryImage)
+def release_shared_blobs(sender, instance, **kwargs):
+    SharedBlob.release(getattr(instance, f'{field}_id') for field in SHARED_BLOB_FIELDS[sender].values())
+
+
+@receiver(post_save, sender=FAQ)
+@receiver(post_delete, sender=FAQ)
+def faq_changed(sender, **kwargs):
+    invalidate_faq_widget()
@@ -1,4 +1,7 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import Project, ProjectGalleryImage, NewsEvent, NewsEventGalleryImage, SuccessStory, SuccessStoryGalleryImage
 
 # Create your tests here.
 
@@ -9,3 +12,613 @@ class SmokeTest(TestCase):
 		response = self.client.get('/')
 		# Allow either 200 (if root view exists) or 404 if no route defined yet
 		self.assertIn(response.status_code, (200, 302, 404))
+
+
+def make_project(**kwargs):
+	defaults = {
+		'title': 'Project', 'teaser': 'Teaser', 'background_objectives': 'Background',
+		'tasks_eligibility': 'Tasks', 'country': 'Taiwan', 'theme': 'Education',
+		'duration': 10, 'difficulty': 'Easy', 'total_headcount': 10,
+		'application_deadline': timezone.now() + timezone.timedelta(days=30),
+	}
+	defaults.update(kwargs)
+	return Project.objects.create(**defaults)
+
+
+class APIGalleryImagesCountTest(TestCase):
+	def create_items(self, count):
+		for i in range(count):
+			project = make_project(title=f'Project {i}')
+			ProjectGalleryImage.objects.create(project=project, image_blob=b'x', image_blob_mime='image/png', image_blob_name='a.png')
+			news = NewsEvent.objects.create(title=f'News {i}', body='Body')
+			NewsEventGalleryImage.objects.create(news_event=news, image_blob=b'x', image_blob_mime='image/png', image_blob_name='a.png')
+			story = SuccessStory.objects.create(title=f'Story {i}', body='Body', related_project=project, published_at=timezone.now())
+			SuccessStoryGalleryImage.objects.create(success_story=story, image_blob=b'x', image_blob_mime='image/png', image_blob_name='a.png')
+
+	def test_list_query_count_is_constant_per_page(self):
+		# ETag validator query + page count query + page query, independent of the number of rows
+		for count in (1, 5):
+			self.create_items(count)
+			for url in ('/api/projects/', '/api/news-events/', '/api/success-stories/'):
+				with self.assertNumQueries(3):
+					response = self.client.get(url)
+				self.assertEqual(response.status_code, 200)
+				self.assertTrue(all(item['gallery_images_count'] == 1 for item in response.json()['results']))
+
+
+class APISparseFieldsetTest(TestCase):
+	def setUp(self):
+		self.project = make_project(title='Sparse')
+
+	def test_list_uses_compact_representation(self):
+		item = self.client.get('/api/projects/').json()['results'][0]
+		self.assertEqual(item['title'], 'Sparse')
+		self.assertNotIn('background_objectives', item)
+		self.assertNotIn('tasks_eligibility', item)
+
+	def test_fields_parameter_limits_output_and_columns(self):
+		from django.db import connection
+		from django.test.utils import CaptureQueriesContext
+		with CaptureQueriesContext(connection) as queries:
+			response = self.client.get('/api/projects/?fields=id,title')
+		self.assertEqual(response.json()['results'], [{'id': self.project.id, 'title': 'Sparse'}])
+		select = queries.captured_queries[-1]['sql']
+		self.assertNotIn('cover_image_blob', select)
+		self.assertNotIn('teaser', select)
+
+	def test_detail_returns_full_object_and_honours_fields(self):
+		detail = self.client.get(f'/api/projects/{self.project.id}/').json()
+		self.assertEqual(detail['background_objectives'], 'Background')
+		detail = self.client.get(f'/api/projects/{self.project.id}/?fields=teaser').json()
+		self.assertEqual(detail, {'teaser': 'Teaser'})
+
+	def test_property_fields_load_their_columns(self):
+		from rest_framework.test import APIRequestFactory
+		from .api_views import FAQViewSet
+		from .models import FAQ
+		# The FAQ viewset isn't routed, so call it directly
+		view = FAQViewSet.as_view({'get': 'list'})
+		# Page count query + page query, however many rows there are
+		for count in (1, 5):
+			for i in range(count):
+				FAQ.objects.create(question=f'Question {i}', answer='Answer', order=FAQ.objects.count(), thumbs_up=3, thumbs_down=1)
+			request = APIRequestFactory().get('/api/faqs/', {'fields': 'total_votes,helpfulness_ratio'})
+			with self.assertNumQueries(2):
+				response = view(request)
+				response.render()
+			self.assertTrue(all(item == {'total_votes': 4, 'helpfulness_ratio': 75.0} for item in response.data['results']))
+
+
+class APIConditionalGetTest(TestCase):
+	def setUp(self):
+		self.project = make_project(title='Cached')
+
+	def test_list_returns_304_without_fetching_the_page(self):
+		response = self.client.get('/api/projects/')
+		etag = response['ETag']
+		self.assertIn('public', response['Cache-Control'])
+		self.assertIn('Last-Modified', response)
+
+		with self.assertNumQueries(1):
+			response = self.client.get('/api/projects/', HTTP_IF_NONE_MATCH=etag)
+		self.assertEqual(response.status_code, 304)
+		self.assertEqual(response['ETag'], etag)
+
+		# Different pages or field selections get their own validators
+		self.assertNotEqual(self.client.get('/api/projects/?fields=id')['ETag'], etag)
+
+	def test_etags_change_when_content_changes(self):
+		list_etag = self.client.get('/api/projects/')['ETag']
+		detail_url = f'/api/projects/{self.project.id}/'
+		detail_etag = self.client.get(detail_url)['ETag']
+		self.assertEqual(self.client.get(detail_url, HTTP_IF_NONE_MATCH=detail_etag).status_code, 304)
+
+		self.project.title = 'Changed'
+		self.project.save()
+		self.assertEqual(self.client.get(detail_url, HTTP_IF_NONE_MATCH=detail_etag).status_code, 200)
+		self.assertEqual(self.client.get('/api/projects/', HTTP_IF_NONE_MATCH=list_etag).status_code, 200)
+
+		make_project(title='Another')
+		self.assertNotEqual(self.client.get('/api/projects/')['ETag'], list_etag)
+
+	def test_etags_change_when_gallery_changes(self):
+		detail_url = f'/api/projects/{self.project.id}/'
+		list_etag = self.client.get('/api/projects/')['ETag']
+		detail_etag = self.client.get(detail_url)['ETag']
+
+		image = ProjectGalleryImage.objects.create(project=self.project, image_blob=b'img', image_blob_mime='image/png', image_blob_name='a.png')
+		response = self.client.get(detail_url, HTTP_IF_NONE_MATCH=detail_etag)
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(response.json()['gallery_images_count'], 1)
+		self.assertEqual(self.client.get('/api/projects/', HTTP_IF_NONE_MATCH=list_etag).status_code, 200)
+
+		detail_etag = response['ETag']
+		image.delete()
+		self.assertEqual(self.client.get(detail_url, HTTP_IF_NONE_MATCH=detail_etag).status_code, 200)
+
+	def test_malformed_id_is_not_found(self):
+		self.assertEqual(self.client.get('/api/projects/abc/').status_code, 404)
+		self.assertEqual(self.client.get('/api/news-events/abc/').status_code, 404)
+
+
+@override_settings(CONTENT_CHANGE_SETTLE_SECONDS=0)
+class ChangeFeedTest(TestCase):
+	def test_feed_returns_creates_updates_and_deletes_with_resumable_cursor(self):
+		project = make_project(title='First')
+		doomed = make_project(title='Doomed')
+		news = NewsEvent.objects.create(title='News', body='Body')
+
+		response = self.client.get('/api/changes/?since=0').json()
+		self.assertEqual([(c['type'], c['id'], c['action']) for c in response['changes']], [
+			('project', project.id, 'upsert'), ('project', doomed.id, 'upsert'), ('news_event', news.id, 'upsert'),
+		])
+		self.assertEqual(response['changes'][0]['data']['title'], 'First')
+		cursor = response['cursor']
+
+		project.title = 'Renamed'
+		project.save()
+		project.save()
+		doomed_id = doomed.id
+		doomed.delete()
+
+		response = self.client.get(f'/api/changes/?since={cursor}').json()
+		self.assertEqual([(c['type'], c['id'], c['action']) for c in response['changes']], [
+			('project', project.id, 'upsert'), ('project', doomed_id, 'delete'),
+		])
+		self.assertEqual(response['changes'][0]['data']['title'], 'Renamed')
+		self.assertIsNone(response['changes'][1]['data'])
+
+		response = self.client.get(f"/api/changes/?since={response['cursor']}").json()
+		self.assertEqual(response['changes'], [])
+		self.assertFalse(response['has_more'])
+
+	@override_settings(CONTENT_CHANGE_SETTLE_SECONDS=60)
+	def test_changes_are_served_once_settled(self):
+		from .models import ContentChange
+		first = make_project(title='Settled')
+		second = make_project(title='Recent')
+		ContentChange.objects.filter(object_id=first.id).update(changed_at=timezone.now() - timezone.timedelta(seconds=61))
+
+		response = self.client.get('/api/changes/?since=0').json()
+		self.assertEqual([c['id'] for c in response['changes']], [first.id])
+
+		ContentChange.objects.filter(object_id=second.id).update(changed_at=timezone.now() - timezone.timedelta(seconds=61))
+		response = self.client.get(f"/api/changes/?since={response['cursor']}").json()
+		self.assertEqual([c['id'] for c in response['changes']], [second.id])
+
+	def test_limit_and_types(self):
+		for i in range(3):
+			make_project(title=f'P{i}')
+		NewsEvent.objects.create(title='News', body='Body')
+		response = self.client.get('/api/changes/?since=0&limit=2&types=project').json()
+		self.assertEqual(len(response['changes']), 2)
+		self.assertTrue(response['has_more'])
+		response = self.client.get(f"/api/changes/?since={response['cursor']}&types=project").json()
+		self.assertEqual(len(response['changes']), 1)
+		self.assertFalse(response['has_more'])
+
+	def test_admin_bulk_actions_are_logged(self):
+		from apps.users.models import CustomUser
+		self.client.force_login(CustomUser.objects.create_superuser(username='admin', email='admin@example.com', password='pw-12345!'))
+		project = make_project(title='Featured')
+		news = NewsEvent.objects.create(title='News', body='Body', is_published=True)
+		before = Project.objects.get(pk=project.pk).updated_at
+		cursor = self.client.get('/api/changes/?since=0').json()['cursor']
+
+		self.client.post('/admin/content/project/', {'action': 'set_as_featured', '_selected_action': [project.pk]})
+		self.client.post('/admin/content/newsevent/', {'action': 'unpublish_items', '_selected_action': [news.pk]})
+
+		response = self.client.get(f'/api/changes/?since={cursor}').json()
+		self.assertEqual([(c['type'], c['id'], c['action']) for c in response['changes']], [
+			('project', project.pk, 'upsert'),
+			('news_event', news.pk, 'upsert'),
+		])
+		project.refresh_from_db()
+		self.assertTrue(project.is_featured)
+		self.assertGreater(project.updated_at, before)
+
+
+class BulkWriteTest(TestCase):
+	def setUp(self):
+		from apps.users.models import CustomUser
+		self.user = CustomUser.objects.create_user(
+			username='bulk', email='bulk@example.com', password='pw-12345!',
+			onboarding_complete=True, date_of_birth='2000-01-01', guardian_name='G', guardian_relation='Parent',
+			address='Taipei', contact='0912345678', country_code='TW',
+		)
+		self.client.force_login(self.user)
+
+	def project_payload(self, title, **kwargs):
+		payload = {
+			'title': title, 'teaser': 'Teaser', 'background_objectives': 'Background',
+			'tasks_eligibility': 'Tasks', 'country': 'Taiwan', 'theme': 'Education',
+			'duration': 10, 'difficulty': 'Easy', 'total_headcount': 10,
+			'application_deadline': (timezone.now() + timezone.timedelta(days=30)).isoformat(),
+		}
+		payload.update(kwargs)
+		return payload
+
+	@override_settings(AUTH_USER_CACHE_TTL=0)
+	def test_bulk_create_uses_constant_queries_and_assigns_public_ids(self):
+		from .models import ContentChange
+		for count in (2, 10):
+			payload = [self.project_payload(f'Bulk {count}-{i}', title_zh_tw=f'批次 {i}') for i in range(count)]
+			# Session + user, then savepoint, INSERT, public id UPDATE, change log, release
+			with self.assertNumQueries(7):
+				response = self.client.post('/api/projects/bulk/', payload, content_type='application/json')
+			self.assertEqual(response.status_code, 201)
+		results = response.json()['results']
+		self.assertEqual([r['status'] for r in results], ['created'] * 10)
+		project = Project.objects.get(pk=results[3]['id'])
+		self.assertEqual(project.project_id, f'project_id_{project.pk}')
+		self.assertEqual(results[3]['project_id'], project.project_id)
+		self.assertEqual(project.title_en, 'Bulk 10-3')
+		self.assertEqual(project.title_zh_tw, '批次 3')
+		self.assertTrue(ContentChange.objects.filter(kind='project', object_id=project.pk).exists())
+
+	def test_invalid_item_rejects_the_whole_batch(self):
+		payload = [self.project_payload('Good'), self.project_payload('Bad', duration='many')]
+		response = self.client.post('/api/projects/bulk/', payload, content_type='application/json')
+		self.assertEqual(response.status_code, 400)
+		self.assertEqual([e['index'] for e in response.json()['errors']], [1])
+		self.assertFalse(Project.objects.exists())
+
+	def test_bulk_update_and_upsert(self):
+		first = make_project(title='First', kicc_project_id='K1')
+		second = make_project(title='Second')
+		response = self.client.patch('/api/projects/bulk/', [
+			{'id': first.id, 'title': 'First updated'}, {'id': second.id, 'is_active': False},
+		], content_type='application/json')
+		self.assertEqual(response.status_code, 200)
+		first.refresh_from_db()
+		second.refresh_from_db()
+		self.assertEqual(first.title_en, 'First updated')
+		self.assertFalse(second.is_active)
+
+		response = self.client.patch('/api/projects/bulk/', [{'title': 'No id'}], content_type='application/json')
+		self.assertEqual(response.status_code, 400)
+
+		response = self.client.post('/api/projects/bulk-upsert/', [
+			{'kicc_project_id': 'K1', 'teaser': 'Matched by KICC id'},
+			self.project_payload('New', kicc_project_id='K2'),
+		], content_type='application/json')
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual([r['status'] for r in response.json()['results']], ['updated', 'created'])
+		first.refresh_from_db()
+		self.assertEqual(first.teaser, 'Matched by KICC id')
+		self.assertTrue(Project.objects.filter(kicc_project_id='K2').exists())
+
+	def test_fields_parameter_does_not_drop_submitted_fields(self):
+		project = make_project(title='Before')
+		response = self.client.patch('/api/projects/bulk/?fields=id', [
+			{'id': project.id, 'title': 'After', 'teaser': 'New teaser'},
+		], content_type='application/json')
+		self.assertEqual(response.status_code, 200)
+		project.refresh_from_db()
+		self.assertEqual((project.title_en, project.teaser), ('After', 'New teaser'))
+
+	def test_bulk_create_news_requires_authentication(self):
+		self.client.logout()
+		response = self.client.post('/api/news-events/bulk/', [{'title': 'News', 'body': 'Body'}], content_type='application/json')
+		self.assertIn(response.status_code, (401, 403))
+		self.assertFalse(NewsEvent.objects.exists())
+
+
+class BlobThumbnailTest(TestCase):
+	def setUp(self):
+		from io import BytesIO
+		from PIL import Image
+		from django.core.cache import cache
+		cache.clear()
+		buffer = BytesIO()
+		Image.new('RGB', (1200, 800), 'red').save(buffer, format='JPEG')
+		self.image = ProjectGalleryImage.objects.create(
+			project=make_project(), image_blob=buffer.getvalue(), image_blob_mime='image/jpeg', image_blob_name='big.jpg',
+		)
+
+	def test_thumbnail_is_resized_and_cached(self):
+		from io import BytesIO
+		from PIL import Image
+		url = f'/blob/project_gallery_image/{self.image.pk}/image_blob/thumbnail/?w=150'
+		response = self.client.get(url)
+		self.assertEqual(response['Content-Type'], 'image/jpeg')
+		self.assertEqual(Image.open(BytesIO(response.content)).size, (150, 100))
+		# Cached: only the version lookup runs, the blob is not read again
+		with self.assertNumQueries(1):
+			self.assertEqual(self.client.get(url).content, response.content)
+		self.assertEqual(self.client.get(f'/blob/project_gallery_image/{self.image.pk}/caption/thumbnail/').status_code, 404)
+
+	def test_admin_changelist_links_thumbnails_and_defers_blobs(self):
+		from django.db import connection
+		from django.test.utils import CaptureQueriesContext
+		from apps.users.models import CustomUser
+		admin_user = CustomUser.objects.create_superuser(username='admin', email='admin@example.com', password='pw-12345!')
+		self.client.force_login(admin_user)
+		with CaptureQueriesContext(connection) as queries:
+			response = self.client.get('/admin/content/projectgalleryimage/')
+		self.assertContains(response, f'/blob/project_gallery_image/{self.image.pk}/image_blob/thumbnail/?w=150')
+		self.assertNotContains(response, 'base64')
+		self.assertFalse([q for q in queries if '"content_projectgalleryimage"."image_blob",' in q['sql']])
+
+
+class ProjectAdminChangelistTest(TestCase):
+	def test_query_count_does_not_grow_with_rows(self):
+		from django.db import connection
+		from django.test.utils import CaptureQueriesContext
+		from apps.users.models import CustomUser
+		self.client.force_login(CustomUser.objects.create_superuser(username='admin', email='admin@example.com', password='pw-12345!'))
+		volunteers = [CustomUser.objects.create_user(username=f'v{i}', email=f'v{i}@example.com') for i in range(3)]
+
+		self.client.get('/admin/content/project/')
+
+		counts = []
+		for total in (2, 8):
+			while Project.objects.count() < total:
+				project = make_project(title=f'Project {Project.objects.count()}', total_headcount=2, headcount=Project.objects.count() % 3)
+				project.enrolled_users.add(*volunteers[:Project.objects.count() % 4])
+			with CaptureQueriesContext(connection) as queries:
+				response = self.client.get('/admin/content/project/?o=9')
+			self.assertEqual(response.status_code, 200)
+			counts.append(len(queries))
+		self.assertEqual(counts[0], counts[1])
+
+	def test_status_and_enrolled_count_columns(self):
+		from apps.content.admin import ProjectAdmin
+		from django.contrib.admin.sites import site
+		from apps.users.models import CustomUser
+		open_project = make_project(title='Open')
+		open_project.enrolled_users.add(CustomUser.objects.create_user(username='v', email='v@example.com'))
+		make_project(title='Closed', application_deadline=timezone.now() - timezone.timedelta(days=1))
+		make_project(title='Full', headcount=10)
+		make_project(title='Inactive', is_active=False)
+
+		model_admin = ProjectAdmin(Project, site)
+		rows = {p.title: p for p in model_admin.get_queryset(None)}
+		self.assertEqual(rows['Open']._enrolled_count, 1)
+		self.assertIn('Open', model_admin.status_display(rows['Open']))
+		self.assertIn('Deadline Passed', model_admin.status_display(rows['Closed']))
+		self.assertIn('Full', model_admin.status_display(rows['Full']))
+		self.assertIn('Inactive', model_admin.status_display(rows['Inactive']))
+
+
+class AdminCSVExportTest(TestCase):
+	def setUp(self):
+		from apps.users.models import CustomUser
+		self.client.force_login(CustomUser.objects.create_superuser(username='admin', email='admin@example.com', password='pw-12345!'))
+
+	def export(self, queryset_ids):
+		return self.client.post('/admin/content/project/', {'action': 'export_as_csv', '_selected_action': queryset_ids})
+
+	def test_export_streams_text_columns_without_blobs(self):
+		import csv
+		project = make_project(title_en='Beach', title_zh_tw='海灘', cover_image_blob=b'\x89PNG' * 1000)
+		response = self.export([project.pk])
+		self.assertTrue(response.streaming)
+		rows = list(csv.reader(b''.join(response.streaming_content).decode().splitlines()))
+		header = rows[0]
+		self.assertNotIn('cover_image_blob', header)
+		self.assertNotIn('title', header)
+		self.assertEqual(rows[1][header.index('title_en')], 'Beach')
+		self.assertEqual(rows[1][header.index('title_zh_tw')], '海灘')
+		self.assertNotIn('PNG', rows[1])
+
+	def test_export_query_count_does_not_grow_with_rows(self):
+		from django.db import connection
+		from django.test.utils import CaptureQueriesContext
+		self.export([make_project().pk])
+
+		counts = []
+		for total in (2, 20):
+			ids = [make_project(title=f'P{i}').pk for i in range(total)]
+			with CaptureQueriesContext(connection) as queries:
+				response = self.export(ids)
+				self.assertEqual(b''.join(response.streaming_content).count(b'\n'), total + 1)
+			counts.append(len(queries))
+		self.assertEqual(counts[0], counts[1])
+
+
+class CloneProjectTest(TestCase):
+	def test_clone_shares_image_bytes_with_the_source(self):
+		from apps.users.models import CustomUser
+		from .clone_utils import clone_project
+		from .models import ContentChange, SharedBlob
+		source = make_project(title_en='Beach', title_zh_tw='海灘', kicc_project_id='K1', headcount=3, cover_image_blob=b'cover', cover_image_blob_name='c.png')
+		source.enrolled_users.add(CustomUser.objects.create_user(username='v', email='v@example.com'))
+		for order in range(3):
+			ProjectGalleryImage.objects.create(project=source, image_blob=f'img{order}'.encode(), image_blob_mime='image/png', image_blob_name=f'{order}.png', order=order)
+
+		# The first clone moves the source's blobs into the shared table
+		clone = clone_project(source.pk)
+		self.assertEqual(SharedBlob.objects.count(), 4)
+		# Later clones only copy metadata: savepoint, two share checks, read, insert, id, gallery read/insert, change log, release
+		with self.assertNumQueries(10):
+			second = clone_project(source.pk)
+		self.assertEqual(SharedBlob.objects.count(), 4)
+
+		clone = Project.objects.get(pk=clone.pk)
+		self.assertEqual(clone.project_id, f'project_id_{clone.pk}')
+		self.assertEqual((clone.title_en, clone.title_zh_tw), ('Beach (Copy)', '海灘 (Copy)'))
+		self.assertIsNone(clone.kicc_project_id)
+		self.assertEqual((clone.headcount, clone.enrolled_users.count()), (0, 0))
+		self.assertEqual(clone.cover_image_shared_blob_id, Project.objects.get(pk=source.pk).cover_image_shared_blob_id)
+		for project in (source, clone, second):
+			self.assertEqual(self.client.get(f'/blob/project/{project.pk}/cover_image_blob/').content, b'cover')
+			self.assertEqual(
+				[(self.client.get(f'/blob/project_gallery_image/{g.pk}/image_blob/').content, g.image_blob_name) for g in project.gallery_images.order_by('order')],
+				[(b'img0', '0.png'), (b'img1', '1.png'), (b'img2', '2.png')],
+			)
+		self.assertEqual(self.client.get(f'/blob/project/{second.pk}/cover_image_blob/thumbnail/?w=150').content, b'cover')
+		self.assertTrue(ContentChange.objects.filter(kind='project', object_id=clone.pk).exists())
+
+		# A replaced image only changes its own row; shared bytes go once nothing references them
+		gallery_image = clone.gallery_images.get(order=0)
+		gallery_image.image_blob = b'new'
+		gallery_image.save()
+		self.assertEqual(self.client.get(f'/blob/project_gallery_image/{gallery_image.pk}/image_blob/').content, b'new')
+		self.assertEqual(self.client.get(f'/blob/project_gallery_image/{source.gallery_images.get(order=0).pk}/image_blob/').content, b'img0')
+		Project.objects.filter(pk__in=[source.pk, second.pk]).delete()
+		self.assertEqual(SharedBlob.objects.count(), 4)
+		clone.delete()
+		self.assertEqual(SharedBlob.objects.count(), 0)
+
+
+@override_settings(CONTENT_CHANGE_SETTLE_SECONDS=0)
+class ContentCardTest(TestCase):
+	def setUp(self):
+		from django.core.cache import cache
+		cache.clear()
+		self.project = make_project(title_en='Beach', title_zh_tw='海灘', is_featured=True, cover_image_blob=b'cover', cover_image_blob_name='c.png')
+		self.news = NewsEvent.objects.create(title='Launch', body='<p>Hello volunteers</p>')
+		SuccessStory.objects.create(title='Story', body='Body', related_project=self.project, published_at=timezone.now())
+
+	def test_cards_are_narrow_and_localized(self):
+		from django.db import connection
+		from django.test.utils import CaptureQueriesContext
+		from django.utils import translation
+		from .card_utils import card_lists
+		with CaptureQueriesContext(connection) as queries:
+			cards = card_lists('featured_projects', 'latest_news_events', 'latest_success_stories')
+		self.assertFalse([q for q in queries if 'cover_image_blob"' in q['sql']])
+		project_card = cards['featured_projects'][0]
+		self.assertEqual((project_card['title'], project_card['cover_src']), ('Beach', f'/blob/project/{self.project.pk}/cover_image_blob/'))
+		self.assertEqual(cards['latest_news_events'][0]['summary'], 'Hello volunteers')
+		self.assertEqual(cards['latest_success_stories'][0]['related_project_title'], 'Beach')
+		with translation.override('zh-tw'):
+			cards = card_lists('featured_projects', 'latest_success_stories')
+		self.assertEqual(cards['featured_projects'][0]['title'], '海灘')
+		self.assertEqual(cards['latest_success_stories'][0]['related_project_title'], '海灘')
+
+	def test_summaries_are_cut_in_the_database(self):
+		from django.db import connection
+		from django.test.utils import CaptureQueriesContext
+		from django.utils import translation
+		from .card_utils import CARD_SUMMARY_SOURCE_CHARS, build_cards
+		self.news.body = '<p>' + 'word ' * 2000 + '</p>'
+		self.news.save()
+		with CaptureQueriesContext(connection) as queries:
+			card = build_cards(NewsEvent.objects.filter(pk=self.news.pk))[0]
+		self.assertIn('SUBSTR(', queries[0]['sql'])
+		self.assertNotIn('"body_en" AS', queries[0]['sql'])
+		self.assertEqual(card['summary'], ' '.join(['word'] * 40) + '…')
+		self.assertLess(len(card['summary']), CARD_SUMMARY_SOURCE_CHARS)
+		# Untranslated bodies fall back to the default language
+		with translation.override('zh-tw'):
+			self.assertEqual(build_cards(NewsEvent.objects.filter(pk=self.news.pk))[0]['summary'], card['summary'])
+
+	def test_landing_page_served_from_cache_until_content_changes(self):
+		self.assertContains(self.client.get('/'), 'Beach')
+		# Cached: only the change cursor is queried
+		with self.assertNumQueries(1):
+			self.client.get('/')
+		self.project.title = 'Mountain'
+		self.project.save()
+		response = self.client.get('/')
+		self.assertContains(response, 'Mountain')
+		self.assertNotContains(response, 'Beach')
+
+	def test_list_pages_render_cards(self):
+		response = self.client.get('/projects/')
+		self.assertContains(response, 'Beach')
+		self.assertContains(response, f'/blob/project/{self.project.pk}/cover_image_blob/')
+		self.assertContains(self.client.get('/news-events/'), 'Hello volunteers')
+		self.assertContains(self.client.get('/success-stories/'), 'Story')
+
+
+class ProjectStatusTest(TestCase):
+	def setUp(self):
+		today = timezone.now().date()
+		day = timezone.timedelta(days=1)
+		self.projects = {
+			'open': make_project(title='Open'),
+			'closed': make_project(title='Closed', application_deadline=timezone.now() - day, start_date=today + day),
+			'running': make_project(title='Running', application_deadline=timezone.now() - day, start_date=today, end_date=today + day),
+			'completed': make_project(title='Completed', application_deadline=timezone.now() - 3 * day, start_date=today - 2 * day, end_date=today - day),
+		}
+
+	def test_save_and_database_expression_agree(self):
+		for status, project in self.projects.items():
+			self.assertEqual(Project.objects.get(pk=project.pk).status, status)
+		annotated = dict(Project.objects.annotate(expected=Project.status_expression()).values_list('title', 'expected'))
+		self.assertEqual(annotated, {'Open': 'open', 'Closed': 'closed', 'Running': 'running', 'Completed': 'completed'})
+
+	def test_transition_job_moves_projects_past_their_dates(self):
+		from io import StringIO
+		from django.core.management import call_command
+		from .models import ContentChange
+		self.assertEqual(Project.update_statuses(), [])
+		later = timezone.now() + timezone.timedelta(days=40)
+		changed = Project.update_statuses(now=later)
+		self.assertEqual(sorted(changed), sorted(p.pk for p in self.projects.values() if p.title != 'Completed'))
+		self.assertEqual(
+			dict(Project.objects.values_list('title', 'status')),
+			{'Open': 'closed', 'Closed': 'running', 'Running': 'completed', 'Completed': 'completed'},
+		)
+		self.assertTrue(ContentChange.objects.filter(kind='project', object_id=self.projects['open'].pk).exists())
+		# Status always follows the dates, so running the job now restores the current statuses
+		out = StringIO()
+		call_command('update_project_status', stdout=out)
+		self.assertIn('Updated the status of 3 project(s)', out.getvalue())
+		self.assertEqual(Project.objects.get(pk=self.projects['open'].pk).status, 'open')
+
+	def test_list_categories_filter_on_status(self):
+		response = self.client.get('/projects/?category=upcoming')
+		self.assertEqual([card['title'] for card in response.context['projects']], ['Closed', 'Open'])
+		response = self.client.get('/projects/?category=current')
+		self.assertEqual([card['title'] for card in response.context['projects']], ['Running'])
+		response = self.client.get('/projects/?category=past')
+		self.assertEqual([card['title'] for card in response.context['projects']], ['Completed'])
+
+
+@override_settings(SITEMAP_REFRESH_SECONDS=0, CONTENT_CHANGE_SETTLE_SECONDS=0)
+class SitemapTest(TestCase):
+	def setUp(self):
+		from gda.seo import sitemap_store
+		sitemap_store.clear()
+		self.addCleanup(sitemap_store.clear)
+		self.project = make_project(title='Beach')
+		self.hidden = make_project(title='Hidden', is_active=False)
+		NewsEvent.objects.create(title='News', body='Body', is_published=True)
+
+	def test_index_and_partitions_come_from_the_database(self):
+		index = self.client.get('/sitemap.xml')
+		self.assertEqual(index['Content-Type'], 'application/xml')
+		for name in ('pages-1', 'projects-1', 'news-events-1'):
+			self.assertContains(index, f'<loc>http://testserver/sitemap-{name}.xml</loc>')
+		self.assertNotContains(index, 'success-stories')
+
+		projects = self.client.get('/sitemap-projects-1.xml')
+		self.assertContains(projects, f'<loc>http://testserver/projects/{self.project.pk}/</loc>')
+		self.assertContains(projects, f'<lastmod>{self.project.updated_at.date().isoformat()}</lastmod>')
+		self.assertContains(projects, f'hreflang="zh-TW" href="http://testserver/projects/{self.project.pk}/?lang=zh-tw"')
+		self.assertNotContains(projects, f'/projects/{self.hidden.pk}/')
+		self.assertEqual(self.client.get('/sitemap-projects-2.xml').status_code, 404)
+
+	def test_served_gzipped_from_memory_with_etags(self):
+		import gzip
+		self.client.get('/sitemap-projects-1.xml')
+		# Only the change log cursor is read once the sitemap is built
+		with self.assertNumQueries(1):
+			response = self.client.get('/sitemap-projects-1.xml', HTTP_ACCEPT_ENCODING='gzip')
+		self.assertEqual(response['Content-Encoding'], 'gzip')
+		self.assertIn(b'<urlset', gzip.decompress(response.content))
+		self.assertEqual(self.client.get('/sitemap-projects-1.xml', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+	def test_regenerates_only_changed_sections(self):
+		projects = self.client.get('/sitemap-projects-1.xml')['ETag']
+		news = self.client.get('/sitemap-news-events-1.xml')['ETag']
+		added = make_project(title='New')
+		response = self.client.get('/sitemap-projects-1.xml')
+		self.assertNotEqual(response['ETag'], projects)
+		self.assertContains(response, f'/projects/{added.pk}/')
+		with self.assertNumQueries(1):
+			self.assertEqual(self.client.get('/sitemap-news-events-1.xml')['ETag'], news)
+
+	def test_lang_parameter_selects_the_language(self):
+		response = self.client.get('/faq/?lang=zh-tw')
+		self.assertEqual(response['Content-Language'], 'zh-tw')
+
+	def test_language_pages_are_canonical_to_themselves(self):
+		detail_url = f'/projects/{self.project.pk}/'
+		self.assertContains(self.client.get(detail_url + '?lang=zh-tw'), f'<link rel="canonical" href="http://testserver{detail_url}?lang=zh-tw">')
+		self.assertContains(self.client.get(detail_url + '?lang=xx&page=2'), f'<link rel="canonical" href="http://testserver{detail_url}">')
+		self.assertContains(self.client.get('/faq/?lang=en'), '<link rel="canonical" href="http://testserver/faq/?lang=en">')
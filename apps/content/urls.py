@@ -22,6 +22,7 @@ urlpatterns = [
 
     # Blob access (serves images stored in model BinaryField)
     path('blob/<str:model_name>/<int:pk>/<str:field_name>/', views.serve_blob, name='content_serve_blob'),
+    path('blob/<str:model_name>/<int:pk>/<str:field_name>/thumbnail/', views.serve_blob_thumbnail, name='content_serve_blob_thumbnail'),
 
 # -------------------- Additional Pages ---------------- #
 
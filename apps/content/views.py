@@ -2,13 +2,17 @@ from django.shortcuts import render, redirect
 from django.views.generic import ListView, DetailView
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.conf import settings
 from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 from django.core.paginator import Paginator
-from .models import Project, NewsEvent, SuccessStory, SuccessStoryGalleryImage, ProjectGalleryImage, NewsEventGalleryImage, FAQ, FAQVote
+from .models import Project, NewsEvent, SuccessStory, SuccessStoryGalleryImage, ProjectGalleryImage, NewsEventGalleryImage, FAQ, FAQVote, SharedBlob, SHARED_BLOB_FIELDS
 import json
 from django.http import HttpResponse, Http404
 from django.shortcuts import get_object_or_404
+from apps.content_management.perf import cache_get_or_set
+from .image_utils import make_thumbnail, thumbnail_width
+from .card_utils import build_cards, card_lists, faq_widget
 
 _BLOB_MODEL_MAP = {
     'project': Project,
@@ -19,15 +23,39 @@ _BLOB_MODEL_MAP = {
     'news_event_gallery_image': NewsEventGalleryImage,
 }
 
+_BLOB_FIELDS = {
+    Project: {'cover_image_blob',},
+    NewsEvent: {'cover_image_blob',},
+    SuccessStory: {'cover_image_blob',},
+    SuccessStoryGalleryImage: {'image_blob',},
+    ProjectGalleryImage: {'image_blob',},
+    NewsEventGalleryImage: {'image_blob',},
+}
+
+# Project list categories and the lifecycle statuses they cover
+PROJECT_CATEGORY_STATUSES = {
+    'past': [Project.Status.COMPLETED],
+    'current': [Project.Status.RUNNING],
+    'upcoming': [Project.Status.OPEN, Project.Status.CLOSED],
+}
+
+# Thumbnails are keyed by object version, so they can live as long as the cache allows
+BLOB_THUMBNAIL_CACHE_SECONDS = 60 * 60 * 24 * 7
+
 
 def build_canonical_url(request):
     """Return a canonical absolute URL for the current request path (no query string).
     Favor the request path so templates that rely on it get a stable canonical.
+    A valid ``?lang=`` is kept: each language version is its own page (see the sitemap's hreflang alternates).
     """
     try:
-        return request.build_absolute_uri(request.path)
+        url = request.build_absolute_uri(request.path)
     except Exception:
         return None
+    language = request.GET.get('lang')
+    if language in dict(settings.LANGUAGES):
+        url += f'?lang={language}'
+    return url
 
 # Project Views
 class ProjectListView(ListView):
@@ -52,24 +80,10 @@ class ProjectListView(ListView):
         if difficulty:
             queryset = queryset.filter(difficulty=difficulty)
         
-        # Category filtering (Past, Current, Upcoming)
+        # Category filtering (Past, Current, Upcoming) on the stored lifecycle status
         category = self.request.GET.get('category')
-        if category:
-            from django.utils import timezone
-            now = timezone.now().date()
-            
-            if category == 'past':
-                # Projects that have ended
-                queryset = queryset.filter(end_date__lt=now)
-            elif category == 'current':
-                # Projects that are currently running
-                queryset = queryset.filter(
-                    start_date__lte=now,
-                    end_date__gte=now
-                )
-            elif category == 'upcoming':
-                # Projects that haven't started yet
-                queryset = queryset.filter(start_date__gt=now)
+        if category in PROJECT_CATEGORY_STATUSES:
+            queryset = queryset.filter(status__in=PROJECT_CATEGORY_STATUSES[category])
         
         # Searching
         search = self.request.GET.get('search')
@@ -87,11 +101,9 @@ class ProjectListView(ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        context['projects'] = context['object_list'] = build_cards(context['object_list'])
         active_projects = Project.objects.filter(is_active=True)
-        # Get hero projects for the carousel
-        context['hero_projects'] = active_projects.filter(is_hero_highlight=True).order_by('-created_at')[:3]
-        # Get featured projects
-        context['featured_projects'] = active_projects.filter(is_featured=True).order_by('-created_at')[:3]
+        context.update(card_lists('featured_projects'))
         context['countries'] = sorted(set(active_projects.values_list('country', flat=True)))
         context['themes'] = sorted(set(active_projects.values_list('theme', flat=True)))
         context['durations'] = sorted(set(active_projects.values_list('duration', flat=True)))
@@ -286,12 +298,8 @@ class NewsEventListView(ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        from .models import NewsEvent
-        published_news_events = NewsEvent.objects.filter(is_published=True)
-        # Get hero news/events for carousel
-        context['hero_news_events'] = published_news_events.filter(is_hero_highlight=True).order_by('-publish_date')[:3]
-        # Get featured news/events
-        context['featured_news_events'] = published_news_events.filter(is_featured=True).order_by('-publish_date')[:4]
+        context['news_events'] = context['object_list'] = build_cards(context['object_list'])
+        context.update(card_lists('featured_news_events'))
         context['content_types'] = NewsEvent.Type.choices
         context['sort_options'] = [
             {'value': '-publish_date', 'label': _('Publication Date (Newest First)')},
@@ -420,12 +428,8 @@ class SuccessStoryListView(ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        from .models import Project
-        published_success_stories = SuccessStory.objects.filter(is_published=True)
-        # Get hero success stories for carousel
-        context['hero_success_stories'] = published_success_stories.filter(is_hero_highlight=True).order_by('-published_at')[:3]
-        # Get featured success stories
-        context['featured_success_stories'] = published_success_stories.filter(is_featured=True).order_by('-published_at')[:3]
+        context['success_stories'] = context['object_list'] = build_cards(context['object_list'])
+        context.update(card_lists('featured_success_stories'))
         context['projects'] = Project.objects.filter(is_active=True).values('id', 'title')
         context['sort_options'] = [
             {'value': '-published_at', 'label': _('Publication Date (Newest First)')},
@@ -579,30 +583,18 @@ class FAQListView(ListView):
 
 # Landing Page View
 def landing_page_view(request):
-    # Get hero highlighted items (is_hero_highlight)
-    hero_projects = Project.objects.filter(is_active=True, is_hero_highlight=True).order_by('-created_at')[:3]
-    hero_news_events = NewsEvent.objects.filter(is_published=True, is_hero_highlight=True).order_by('-publish_date')[:3]
-    hero_success_stories = SuccessStory.objects.filter(is_published=True, is_hero_highlight=True).order_by('-published_at')[:3]
-    
-    # Get featured items first, then fall back to latest if no featured items exist
-    featured_projects = Project.objects.filter(is_active=True, is_featured=True).order_by('-created_at')[:3]
-    latest_projects = featured_projects if featured_projects.exists() else Project.objects.filter(is_active=True).order_by('-created_at')[:3]
-    
-    featured_news_events = NewsEvent.objects.filter(is_published=True, is_featured=True).order_by('-publish_date')[:4]
-    latest_news_events = featured_news_events if featured_news_events.exists() else NewsEvent.objects.filter(is_published=True).order_by('-publish_date')[:4]
-    
-    featured_success_stories = SuccessStory.objects.filter(is_published=True, is_featured=True).order_by('-published_at')[:3]
-    latest_success_stories = featured_success_stories if featured_success_stories.exists() else SuccessStory.objects.filter(is_published=True).order_by('-published_at')[:3]
-    
-    latest_faqs = FAQ.objects.order_by('order')[:5]
+    cards = card_lists(
+        'featured_projects', 'latest_projects',
+        'featured_news_events', 'latest_news_events',
+        'featured_success_stories', 'latest_success_stories',
+    )
+    latest_faqs = faq_widget(5)
 
     context = {
-        'hero_projects': hero_projects,
-        'hero_news_events': hero_news_events,
-        'hero_success_stories': hero_success_stories,
-        'latest_projects': latest_projects,
-        'latest_news_events': latest_news_events,
-        'latest_success_stories': latest_success_stories,
+        # Featured items first, falling back to the latest if none are featured
+        'latest_projects': cards['featured_projects'] or cards['latest_projects'],
+        'latest_news_events': cards['featured_news_events'] or cards['latest_news_events'],
+        'latest_success_stories': cards['featured_success_stories'] or cards['latest_success_stories'],
         'latest_faqs': latest_faqs,
         'canonical_url': build_canonical_url(request),
     }
@@ -670,19 +662,13 @@ def serve_blob(request, model_name, pk, field_name):
     obj = get_object_or_404(Model, pk=pk)
 
     # Only allow a small whitelist of blob fields to be served
-    allowed_fields = {
-        Project: {'cover_image_blob',},
-        NewsEvent: {'cover_image_blob',},
-        SuccessStory: {'cover_image_blob',},
-        SuccessStoryGalleryImage: {'image_blob',},
-        ProjectGalleryImage: {'image_blob',},
-        NewsEventGalleryImage: {'image_blob',},
-    }
-
-    if field_name not in allowed_fields.get(Model, set()):
+    if field_name not in _BLOB_FIELDS.get(Model, set()):
         raise Http404("Field not allowed")
 
     blob = getattr(obj, field_name, None)
+    shared_field = SHARED_BLOB_FIELDS.get(Model, {}).get(field_name)
+    if not blob and shared_field:
+        blob = SharedBlob.objects.filter(pk=getattr(obj, f'{shared_field}_id')).values_list('data', flat=True).first()
     if not blob:
         raise Http404("Blob not found")
 
@@ -697,6 +683,46 @@ def serve_blob(request, model_name, pk, field_name):
         resp['Content-Disposition'] = f'inline; filename="{filename}"'
     return resp
 
+
+def serve_blob_thumbnail(request, model_name, pk, field_name):
+    """Serve a downscaled copy of a blob image field.
+
+    URL pattern: /blob/<model_name>/<pk>/<field_name>/thumbnail/?w=150
+    Thumbnails are cached per object version (``updated_at``), so the blob is
+    only read from the database when the image changes. Callers can add
+    ``&v=<updated_at timestamp>`` to the URL to let browsers cache it for good.
+    """
+    Model = _BLOB_MODEL_MAP.get(model_name)
+    if Model is None:
+        raise Http404("Unknown model")
+    if field_name not in _BLOB_FIELDS.get(Model, set()):
+        raise Http404("Field not allowed")
+
+    version = Model.objects.filter(pk=pk).values_list('updated_at', flat=True).first()
+    if version is None:
+        raise Http404("Not found")
+    width = thumbnail_width(request.GET.get('w'))
+
+    shared_field = SHARED_BLOB_FIELDS.get(Model, {}).get(field_name)
+
+    def build():
+        columns = [field_name + '_mime', field_name] + ([f'{shared_field}__data'] if shared_field else [])
+        row = Model.objects.filter(pk=pk).values_list(*columns).first()
+        data = row and next((blob for blob in row[1:] if blob), None)
+        if not data:
+            return None
+        return make_thumbnail(bytes(data), width) or (bytes(data), row[0] or 'application/octet-stream')
+
+    key = f'blob-thumbnail:{model_name}:{pk}:{field_name}:{width}:{version.timestamp()}'
+    thumbnail = cache_get_or_set(key, build, timeout=BLOB_THUMBNAIL_CACHE_SECONDS)
+    if thumbnail is None:
+        raise Http404("Blob not found")
+
+    data, content_type = thumbnail
+    resp = HttpResponse(data, content_type=content_type)
+    resp['Cache-Control'] = 'max-age=31536000, immutable' if request.GET.get('v') else 'max-age=300'
+    return resp
+
 def privacy_policy_view(request):
     """Render the Privacy Policy static page."""
     return render(request, 'content/privacy_policy.html', {'canonical_url': build_canonical_url(request)})
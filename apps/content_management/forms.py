@@ -1,4 +1,5 @@
 from django import forms
+from django.conf import settings
 from apps.content.models import Project, NewsEvent, SuccessStory, FAQ
 
 class ProjectForm(forms.ModelForm):
@@ -34,3 +35,8 @@ class FAQForm(forms.ModelForm):
     class Meta:
         model = FAQ
         exclude = ['question', 'answer', 'faq_id']
+
+class ProjectAnnouncementForm(forms.Form):
+    subject = forms.CharField(max_length=255)
+    message = forms.CharField(widget=forms.Textarea(attrs={'rows': 8}))
+    language = forms.ChoiceField(choices=settings.LANGUAGES, initial=settings.LANGUAGE_CODE)
@@ -0,0 +1,60 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+
+class Command(BaseCommand):
+    help = 'Measure in-process requests per second and queries per request for the given URLs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='URL paths to request, e.g. /api/projects/')
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help='Number of requests to time per path',
+        )
+        parser.add_argument(
+            '--rounds',
+            type=int,
+            default=5,
+            help='Repeat the timing this many times and report the fastest round',
+        )
+        parser.add_argument(
+            '--login',
+            help='Username to log in as (session cookie sent with every request)',
+        )
+
+    def handle(self, *args, **options):
+        client = Client(HTTP_HOST=(settings.ALLOWED_HOSTS or ['localhost'])[0])
+        if options['login']:
+            try:
+                client.force_login(get_user_model().objects.get(username=options['login']))
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"User {options['login']} does not exist")
+
+        for path in options['paths']:
+            # Warm up caches, URL resolution and lazily loaded middleware
+            status = client.get(path).status_code
+            with CaptureQueriesContext(connection) as queries:
+                client.get(path)
+            query_count = len(queries)
+
+            timings = []
+            for _ in range(options['rounds']):
+                started = time.perf_counter()
+                for _ in range(options['requests']):
+                    client.get(path)
+                timings.append(time.perf_counter() - started)
+            elapsed = min(timings)
+
+            self.stdout.write(self.style.SUCCESS(
+                f"{path}: {options['requests'] / elapsed:.0f} req/s, "
+                f"{elapsed * 1000 / options['requests']:.2f} ms/request, "
+                f"{query_count} queries/request (HTTP {status})"
+            ))
@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.db import connection
+import logging
+
+from .perf import RequestMetrics, PerfBudgetExceeded, current_metrics, get_budget, history
+
+logger = logging.getLogger(__name__)
+
+
+class PerfInstrumentationMiddleware:
+    """
+    Middleware that records query count, DB time, duplicate queries, cache hits
+    and template render time for each request.
+
+    Results are exposed through a ``Server-Timing`` header (staff users, or
+    everyone when ``PERF_SERVER_TIMING_PUBLIC`` is enabled), kept in the
+    ``/management/perf/`` history and checked against ``PERF_BUDGETS``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'PERF_INSTRUMENTATION', True)
+        self.excluded_prefixes = tuple(getattr(settings, 'PERF_EXCLUDED_PATHS', ('/static/', '/media/')))
+
+    def __call__(self, request):
+        if not self.enabled or request.path.startswith(self.excluded_prefixes):
+            return self.get_response(request)
+
+        metrics = RequestMetrics(request.method, request.path)
+        token = current_metrics.set(metrics)
+        try:
+            with connection.execute_wrapper(metrics):
+                response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+
+        metrics.finish(response.status_code)
+        resolver_match = getattr(request, 'resolver_match', None)
+        metrics.route = (resolver_match.view_name if resolver_match else '') or ''
+
+        user = getattr(request, 'user', None)
+        if getattr(settings, 'PERF_SERVER_TIMING_PUBLIC', settings.DEBUG) or (user is not None and user.is_staff):
+            response['Server-Timing'] = metrics.server_timing()
+
+        violations = metrics.check_budget(get_budget(metrics.route))
+        history.add(metrics)
+        if violations:
+            message = f"Performance budget exceeded for {metrics.method} {metrics.path} ({metrics.route}): {', '.join(violations)}"
+            if getattr(settings, 'PERF_BUDGET_ACTION', 'log') == 'raise':
+                raise PerfBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+    def process_template_response(self, request, response):
+        metrics = current_metrics.get()
+        if metrics is not None:
+            metrics.start_render()
+            response.add_post_render_callback(lambda r: metrics.finish_render())
+        return response
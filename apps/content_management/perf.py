@@ -0,0 +1,182 @@
+"""
+Per-request performance metrics.
+
+``RequestMetrics`` is filled in by ``apps.content_management.middleware.PerfInstrumentationMiddleware``
+through a ``connection.execute_wrapper`` hook. The metrics of the current request
+are kept in a context variable so code outside the middleware (e.g. cache
+lookups) can report into them, and finished requests are kept in a small
+per-process ring buffer shown on the ``/management/perf/`` page.
+"""
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+current_metrics = ContextVar('current_metrics', default=None)
+
+_IN_LIST_RE = re.compile(r'\((?:\s*%s\s*,)+\s*%s\s*\)')
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """Normalise a SQL statement so repeated queries with different parameters compare equal."""
+    sql = _IN_LIST_RE.sub('(%s, ...)', sql)
+    sql = _STRING_RE.sub('%s', sql)
+    sql = _NUMBER_RE.sub('%s', sql)
+    return _WHITESPACE_RE.sub(' ', sql).strip()
+
+
+class PerfBudgetExceeded(AssertionError):
+    """Raised when a request exceeds its budget and ``PERF_BUDGET_ACTION`` is ``'raise'``."""
+
+
+class RequestMetrics:
+    def __init__(self, method='', path=''):
+        self.method = method
+        self.path = path
+        self.route = ''
+        self.status_code = None
+        self.started = time.perf_counter()
+        self.total_ms = 0.0
+        self.query_count = 0
+        self.db_ms = 0.0
+        self.render_ms = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.fingerprints = Counter()
+        self.violations = []
+        self._render_started = None
+
+    def __call__(self, execute, sql, params, many, context):
+        """``connection.execute_wrapper`` hook."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_ms += (time.perf_counter() - start) * 1000
+            self.query_count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    def start_render(self):
+        self._render_started = time.perf_counter()
+
+    def finish_render(self):
+        if self._render_started is not None:
+            self.render_ms += (time.perf_counter() - self._render_started) * 1000
+            self._render_started = None
+
+    def finish(self, status_code):
+        self.status_code = status_code
+        self.total_ms = (time.perf_counter() - self.started) * 1000
+
+    @property
+    def duplicates(self):
+        """Query fingerprints executed more than once, most frequent first (likely N+1s)."""
+        return [(sql, count) for sql, count in self.fingerprints.most_common() if count > 1]
+
+    @property
+    def duplicate_count(self):
+        return sum(count - 1 for _, count in self.duplicates)
+
+    def check_budget(self, budget):
+        """Record every limit in ``budget`` that this request exceeded."""
+        limits = {
+            'queries': self.query_count,
+            'db_ms': self.db_ms,
+            'duplicates': self.duplicate_count,
+            'total_ms': self.total_ms,
+        }
+        self.violations = [
+            f"{name} {round(value, 1)} > {budget[name]}"
+            for name, value in limits.items()
+            if name in budget and value > budget[name]
+        ]
+        return self.violations
+
+    def server_timing(self):
+        return ', '.join([
+            f'db;dur={self.db_ms:.1f};desc="{self.query_count} queries, {self.duplicate_count} duplicate"',
+            f'render;dur={self.render_ms:.1f}',
+            f'cache;desc="{self.cache_hits} hits, {self.cache_misses} misses"',
+            f'total;dur={self.total_ms:.1f}',
+        ])
+
+    def as_dict(self):
+        return {
+            'method': self.method,
+            'path': self.path,
+            'route': self.route,
+            'status_code': self.status_code,
+            'total_ms': round(self.total_ms, 1),
+            'query_count': self.query_count,
+            'db_ms': round(self.db_ms, 1),
+            'render_ms': round(self.render_ms, 1),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'duplicate_count': self.duplicate_count,
+            'duplicates': self.duplicates[:5],
+            'violations': self.violations,
+        }
+
+
+class MetricsHistory:
+    """Thread-safe ring buffer of recently finished requests for this process."""
+
+    def __init__(self, size):
+        self._items = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, metrics):
+        with self._lock:
+            self._items.appendleft(metrics.as_dict())
+
+    def all(self):
+        with self._lock:
+            return list(self._items)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+history = MetricsHistory(getattr(settings, 'PERF_HISTORY_SIZE', 200))
+
+
+def record_cache_access(hit):
+    """Count a cache hit or miss against the current request, if it is being instrumented."""
+    metrics = current_metrics.get()
+    if metrics is None:
+        return
+    if hit:
+        metrics.cache_hits += 1
+    else:
+        metrics.cache_misses += 1
+
+
+_missing = object()
+
+
+def cache_get_or_set(key, default, timeout=DEFAULT_TIMEOUT):
+    """``cache.get_or_set`` that reports hits and misses into the request metrics."""
+    value = cache.get(key, _missing)
+    if value is not _missing:
+        record_cache_access(True)
+        return value
+    record_cache_access(False)
+    value = default() if callable(default) else default
+    cache.set(key, value, timeout)
+    return value
+
+
+def get_budget(route):
+    budgets = getattr(settings, 'PERF_BUDGETS', {})
+    if route in budgets:
+        return budgets[route]
+    return budgets.get('*', {})
@@ -8,3 +8,123 @@ class ContentManagementSmokeTest(TestCase):
 from django.test import TestCase
 
 # Create your tests here.
+
+
+class StreamingXLSXWriterTest(TestCase):
+    def test_multi_sheet_export_with_precomputed_widths(self):
+        from io import BytesIO
+        from openpyxl import load_workbook
+        from .export_utils import StreamingXLSXWriter
+
+        writer = StreamingXLSXWriter()
+        writer.add_sheet('Summary', ['Metric', 'Value'], [['Total', 3]])
+        writer.add_sheet('Themes', ['Theme', 'Count'], (['Education' * 10, n] for n in range(3)))
+        output = BytesIO()
+        writer.save(output)
+
+        wb = load_workbook(BytesIO(output.getvalue()))
+        self.assertEqual(wb.sheetnames, ['Summary', 'Themes'])
+        themes = wb['Themes']
+        self.assertEqual(themes.max_row, 4)
+        self.assertTrue(themes['A1'].font.bold)
+        self.assertEqual(themes.column_dimensions['A'].width, 50)
+        self.assertEqual(themes.column_dimensions['B'].width, 7)
+
+
+class PerfInstrumentationMiddlewareTest(TestCase):
+    def setUp(self):
+        from apps.users.models import CustomUser
+        from .perf import history
+        history.clear()
+        self.staff = CustomUser.objects.create_user(
+            username='staff', email='staff@example.com', password='pw-12345!', is_staff=True,
+            onboarding_complete=True, date_of_birth='2000-01-01', guardian_name='G', guardian_relation='Parent',
+            address='Taipei', contact='0912345678', country_code='TW',
+        )
+
+    def test_server_timing_and_history_for_staff(self):
+        self.client.force_login(self.staff)
+        response = self.client.get('/management/perf/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertIn('render;dur=', response['Server-Timing'])
+
+        response = self.client.get('/management/perf/?export=json')
+        recorded = response.json()['requests']
+        self.assertEqual(recorded[0]['route'], 'perf_metrics')
+        self.assertGreater(recorded[0]['query_count'], 0)
+
+    def test_budget_violation_raises_when_configured(self):
+        from django.test import override_settings
+        from .perf import PerfBudgetExceeded
+        self.client.force_login(self.staff)
+        with override_settings(PERF_BUDGET_ACTION='raise', PERF_BUDGETS={'perf_metrics': {'queries': 0}}):
+            with self.assertRaises(PerfBudgetExceeded):
+                self.client.get('/management/perf/')
+
+
+class ProjectNotifyViewTest(TestCase):
+    def test_staff_can_email_enrolled_users(self):
+        from django.core import mail
+        from django.utils import timezone
+        from apps.content.models import Project
+        from apps.users.models import CustomUser, EmailOutbox
+        from apps.users.email_utils import send_queued_emails, EmailRateLimiter
+
+        profile = dict(onboarding_complete=True, date_of_birth='2000-01-01', guardian_name='G', guardian_relation='Parent',
+                       address='Taipei', contact='0912345678', country_code='TW')
+        staff = CustomUser.objects.create_user(username='staff', email='staff@example.com', password='pw-12345!', is_staff=True, **profile)
+        project = Project.objects.create(
+            title='Beach Cleanup', teaser='T', background_objectives='B', tasks_eligibility='T', country='Taiwan',
+            theme='Environment', duration=5, difficulty='Easy', total_headcount=10,
+            application_deadline=timezone.now() + timezone.timedelta(days=10),
+        )
+        for i in range(3):
+            project.enrolled_users.add(CustomUser.objects.create_user(username=f'v{i}', email=f'v{i}@example.com', first_name=f'Vol{i}'))
+
+        self.client.force_login(staff)
+        url = f'/management/projects/{project.pk}/notify/'
+        self.assertEqual(self.client.get(url).context['recipient_count'], 3)
+        response = self.client.post(url, {'subject': 'Meeting point', 'message': 'Bring gloves', 'language': 'en'})
+        self.assertEqual(response.context['sent_count'], 3)
+        self.assertEqual(EmailOutbox.objects.count(), 3)
+
+        send_queued_emails(limiter=EmailRateLimiter({}))
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertIn('Vol0', mail.outbox[0].body)
+        self.assertIn('Bring gloves', mail.outbox[0].body)
+
+
+
+class ProjectExportTest(TestCase):
+    def test_xlsx_export_counts_enrolments_in_one_query(self):
+        from io import BytesIO
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from django.utils import timezone
+        from openpyxl import load_workbook
+        from apps.content.models import Project
+        from apps.users.models import CustomUser
+
+        profile = dict(onboarding_complete=True, date_of_birth='2000-01-01', guardian_name='G', guardian_relation='Parent',
+                       address='Taipei', contact='0912345678', country_code='TW')
+        self.client.force_login(CustomUser.objects.create_user(username='staff', email='staff@example.com', is_staff=True, **profile))
+        volunteers = [CustomUser.objects.create_user(username=f'v{i}', email=f'v{i}@example.com') for i in range(3)]
+        for i in range(3):
+            project = Project.objects.create(
+                title=f'Project {i}', teaser='T', background_objectives='B', tasks_eligibility='T', country='Taiwan',
+                theme='Environment', duration=5, difficulty='Easy', total_headcount=10, cover_image_blob=b'cover',
+                application_deadline=timezone.now() + timezone.timedelta(days=10),
+            )
+            project.enrolled_users.add(*volunteers[:i])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/management/projects/?export=xlsx&sort=title')
+            content = b''.join(response.streaming_content) if response.streaming else response.content
+        project_queries = [query['sql'] for query in queries if 'content_project' in query['sql']]
+        self.assertEqual(len(project_queries), 1)
+        self.assertNotIn('"cover_image_blob"', project_queries[0])
+
+        sheet = load_workbook(BytesIO(content)).active
+        count_column = [cell.value for cell in sheet[1]].index('Enrolled Users Count')
+        self.assertEqual([row[count_column] for row in sheet.iter_rows(min_row=2, values_only=True)], [0, 1, 2])
@@ -10,12 +10,14 @@ urlpatterns = [
     path('users/<int:pk>/update/', views.UserUpdateView.as_view(), name='user_update'),
     path('users/<int:pk>/delete/', views.UserDeleteView.as_view(), name='user_delete'),
     path('application-analytics/', views.ApplicationAnalyticsView.as_view(), name='application_analytics'),
+    path('perf/', views.PerfMetricsView.as_view(), name='perf_metrics'),
 
     # Project URLs
     path('projects/', views.ProjectListView.as_view(), name='project_list'),
     path('projects/create/', views.ProjectCreateView.as_view(), name='project_create'),
     path('projects/<int:pk>/', views.ProjectDetailView.as_view(), name='project_detail'),
     path('projects/<int:pk>/update/', views.ProjectUpdateView.as_view(), name='project_update'),
+    path('projects/<int:pk>/notify/', views.ProjectNotifyView.as_view(), name='project_notify'),
     path('projects/<int:pk>/delete/', views.ProjectDeleteView.as_view(), name='project_delete'),
 
     # News/Event URLs
@@ -1,10 +1,11 @@
-from django.shortcuts import render
-from django.urls import reverse_lazy
+from django.shortcuts import render, redirect, get_object_or_404
+from django.conf import settings
+from django.urls import reverse, reverse_lazy
 from django.http import JsonResponse, HttpResponse
 from django.views import View
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from apps.content.models import Project, NewsEvent, SuccessStory, SuccessStoryGalleryImage, ProjectGalleryImage, NewsEventGalleryImage, FAQ
-from django.views.generic import TemplateView
+from django.views.generic import TemplateView, FormView
 from django.db.models import Count, Sum, Q, Max, Avg, F, ExpressionWrapper, FloatField, Case, When, Value
 from django.utils import timezone
 import logging
@@ -16,14 +17,11 @@ from datetime import timedelta
 from apps.users.models import CustomUser
 from django.db.models.functions import TruncMonth, TruncYear, TruncDay, TruncWeek
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from .forms import SuccessStoryForm, ProjectForm, NewsEventForm, FAQForm
+from .forms import SuccessStoryForm, ProjectForm, NewsEventForm, FAQForm, ProjectAnnouncementForm
+from apps.users.email_utils import recipient_from_user, send_batch_email
 from django.core.serializers.json import DjangoJSONEncoder
-try:
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill
-    XLSX_AVAILABLE = True
-except ImportError:
-    XLSX_AVAILABLE = False
+from .export_utils import StreamingXLSXWriter, XLSX_AVAILABLE
+from . import perf
 
 # Get an instance of a logger
 logger = logging.getLogger(__name__)
@@ -389,8 +387,8 @@ class ManagementDashboardView(LoginRequiredMixin, UserPassesTestMixin, TemplateV
         # --- Project Stats ---
         context['total_projects'] = Project.objects.count()
         context['active_projects'] = Project.objects.filter(is_active=True).count()
-        context['completed_projects'] = Project.objects.filter(end_date__lt=timezone.now().date()).count()
-        context['upcoming_projects'] = Project.objects.filter(start_date__gt=timezone.now().date()).count()
+        context['completed_projects'] = Project.objects.filter(status=Project.Status.COMPLETED).count()
+        context['upcoming_projects'] = Project.objects.filter(status__in=[Project.Status.OPEN, Project.Status.CLOSED]).count()
         context['featured_projects'] = Project.objects.filter(is_featured=True).count()
         context['hero_projects'] = Project.objects.filter(is_hero_highlight=True).count()
         
@@ -700,15 +698,7 @@ class ManagementDashboardView(LoginRequiredMixin, UserPassesTestMixin, TemplateV
         if not XLSX_AVAILABLE:
             return HttpResponse("XLSX export not available. Please install openpyxl.", status=400)
             
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Dashboard Summary"
-        
         headers = ['Category', 'Metric', 'Value']
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_num, value=header)
-            cell.font = Font(bold=True)
-        
         data = [
             ['Users', 'Total Users', context['total_users']],
             ['Users', 'New Users (30d)', context['new_users_30d']],
@@ -734,14 +724,9 @@ class ManagementDashboardView(LoginRequiredMixin, UserPassesTestMixin, TemplateV
             ['Impact', 'Avg Hours per Story', context['avg_hours_per_story']]
         ]
         
-        for row_num, row in enumerate(data, 2):
-            for col_num, value in enumerate(row, 1):
-                ws.cell(row=row_num, column=col_num, value=value)
-        
-        response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-        response['Content-Disposition'] = 'attachment; filename="management_dashboard.xlsx"'
-        wb.save(response)
-        return response
+        writer = StreamingXLSXWriter()
+        writer.add_sheet("Dashboard Summary", headers, data)
+        return writer.to_response('management_dashboard.xlsx')
 
     def export_html(self, context):
         html_content = f"""
@@ -998,9 +983,6 @@ class UserAnalyticsView(LoginRequiredMixin, UserPassesTestMixin, ListView):
             return HttpResponse("XLSX export not available. Please install openpyxl.", status=400)
             
         queryset = self.get_queryset()
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "User Analytics"
         
         headers = [
             'ID', 'Username', 'Email', 'First Name', 'Last Name', 'Date of Birth', 
@@ -1010,50 +992,35 @@ class UserAnalyticsView(LoginRequiredMixin, UserPassesTestMixin, ListView):
             'Last Login'
         ]
         
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_num, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-        
-        for row_num, user in enumerate(queryset, 2):
-            ws.cell(row=row_num, column=1, value=user.id)
-            ws.cell(row=row_num, column=2, value=user.username)
-            ws.cell(row=row_num, column=3, value=user.email)
-            ws.cell(row=row_num, column=4, value=user.first_name)
-            ws.cell(row=row_num, column=5, value=user.last_name)
-            ws.cell(row=row_num, column=6, value=user.date_of_birth.strftime('%Y-%m-%d') if user.date_of_birth else '')
-            ws.cell(row=row_num, column=7, value=user.gender)
-            ws.cell(row=row_num, column=8, value=user.blood_group)
-            ws.cell(row=row_num, column=9, value=user.guardian_name)
-            ws.cell(row=row_num, column=10, value=user.guardian_relation)
-            ws.cell(row=row_num, column=11, value=user.address)
-            ws.cell(row=row_num, column=12, value=user.contact)
-            ws.cell(row=row_num, column=13, value=user.country_code)
-            ws.cell(row=row_num, column=14, value=user.login_method)
-            ws.cell(row=row_num, column=15, value='Yes' if user.onboarding_complete else 'No')
-            ws.cell(row=row_num, column=16, value='Yes' if user.email_verified else 'No')
-            ws.cell(row=row_num, column=17, value='Yes' if user.is_active else 'No')
-            ws.cell(row=row_num, column=18, value='Yes' if user.is_staff else 'No')
-            ws.cell(row=row_num, column=19, value='Yes' if user.is_superuser else 'No')
-            ws.cell(row=row_num, column=20, value=user.date_joined.strftime('%Y-%m-%d %H:%M:%S'))
-            ws.cell(row=row_num, column=21, value=user.last_login.strftime('%Y-%m-%d %H:%M:%S') if user.last_login else '')
-        
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-        
-        response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-        response['Content-Disposition'] = 'attachment; filename="user_analytics.xlsx"'
-        wb.save(response)
-        return response
+        def rows():
+            for user in queryset.iterator():
+                yield [
+                    user.id,
+                    user.username,
+                    user.email,
+                    user.first_name,
+                    user.last_name,
+                    user.date_of_birth.strftime('%Y-%m-%d') if user.date_of_birth else '',
+                    user.gender,
+                    user.blood_group,
+                    user.guardian_name,
+                    user.guardian_relation,
+                    user.address,
+                    user.contact,
+                    user.country_code,
+                    user.login_method,
+                    'Yes' if user.onboarding_complete else 'No',
+                    'Yes' if user.email_verified else 'No',
+                    'Yes' if user.is_active else 'No',
+                    'Yes' if user.is_staff else 'No',
+                    'Yes' if user.is_superuser else 'No',
+                    user.date_joined.strftime('%Y-%m-%d %H:%M:%S'),
+                    user.last_login.strftime('%Y-%m-%d %H:%M:%S') if user.last_login else '',
+                ]
+        
+        writer = StreamingXLSXWriter(header_fill="CCCCCC")
+        writer.add_sheet("User Analytics", headers, rows())
+        return writer.to_response('user_analytics.xlsx')
 
     def export_html(self):
         queryset = self.get_queryset()
@@ -1466,72 +1433,43 @@ class ApplicationAnalyticsView(LoginRequiredMixin, UserPassesTestMixin, Template
         if not XLSX_AVAILABLE:
             return HttpResponse("XLSX export not available. Please install openpyxl.", status=400)
             
-        wb = Workbook()
+        writer = StreamingXLSXWriter()
         
         # Summary Sheet
-        ws_summary = wb.active
-        ws_summary.title = "Summary"
-        ws_summary['A1'] = 'Metric'
-        ws_summary['B1'] = 'Value'
-        ws_summary['A1'].font = Font(bold=True)
-        ws_summary['B1'].font = Font(bold=True)
-        ws_summary['A2'] = 'Total Enrollments'
-        ws_summary['B2'] = context['total_enrollments']
-        ws_summary['A3'] = 'Projects with Enrollments'
-        ws_summary['B3'] = context['projects_with_enrollments']
+        writer.add_sheet("Summary", ['Metric', 'Value'], [
+            ['Total Enrollments', context['total_enrollments']],
+            ['Projects with Enrollments', context['projects_with_enrollments']],
+        ])
         
         # Theme Sheet
-        ws_theme = wb.create_sheet("Enrollments by Theme")
-        ws_theme['A1'] = 'Theme'
-        ws_theme['B1'] = 'Total Enrollments'
-        ws_theme['C1'] = 'Project Count'
-        for cell in [ws_theme['A1'], ws_theme['B1'], ws_theme['C1']]:
-            cell.font = Font(bold=True)
-        for row_num, item in enumerate(context['enrollments_by_theme'], 2):
-            ws_theme.cell(row=row_num, column=1, value=item['theme'])
-            ws_theme.cell(row=row_num, column=2, value=item['total_enrollments'])
-            ws_theme.cell(row=row_num, column=3, value=item['project_count'])
+        writer.add_sheet(
+            "Enrollments by Theme",
+            ['Theme', 'Total Enrollments', 'Project Count'],
+            ([item['theme'], item['total_enrollments'], item['project_count']] for item in context['enrollments_by_theme'])
+        )
         
         # Country Sheet
-        ws_country = wb.create_sheet("Enrollments by Country")
-        ws_country['A1'] = 'Country'
-        ws_country['B1'] = 'Total Enrollments'
-        ws_country['C1'] = 'Project Count'
-        for cell in [ws_country['A1'], ws_country['B1'], ws_country['C1']]:
-            cell.font = Font(bold=True)
-        for row_num, item in enumerate(context['enrollments_by_country'], 2):
-            ws_country.cell(row=row_num, column=1, value=item['country'])
-            ws_country.cell(row=row_num, column=2, value=item['total_enrollments'])
-            ws_country.cell(row=row_num, column=3, value=item['project_count'])
+        writer.add_sheet(
+            "Enrollments by Country",
+            ['Country', 'Total Enrollments', 'Project Count'],
+            ([item['country'], item['total_enrollments'], item['project_count']] for item in context['enrollments_by_country'])
+        )
         
         # Popular Projects Sheet
-        ws_popular = wb.create_sheet("Popular Projects")
-        ws_popular['A1'] = 'Title'
-        ws_popular['B1'] = 'Enrollments'
-        for cell in [ws_popular['A1'], ws_popular['B1']]:
-            cell.font = Font(bold=True)
-        for row_num, project in enumerate(context['popular_projects'], 2):
-            ws_popular.cell(row=row_num, column=1, value=project.title)
-            ws_popular.cell(row=row_num, column=2, value=project.headcount)
+        writer.add_sheet(
+            "Popular Projects",
+            ['Title', 'Enrollments'],
+            ([project.title, project.headcount] for project in context['popular_projects'])
+        )
         
         # Capacity Sheet
-        ws_capacity = wb.create_sheet("Capacity Utilization")
-        ws_capacity['A1'] = 'Project Title'
-        ws_capacity['B1'] = 'Enrolled'
-        ws_capacity['C1'] = 'Capacity'
-        ws_capacity['D1'] = 'Utilization %'
-        for cell in [ws_capacity['A1'], ws_capacity['B1'], ws_capacity['C1'], ws_capacity['D1']]:
-            cell.font = Font(bold=True)
-        for row_num, item in enumerate(context['capacity_data'], 2):
-            ws_capacity.cell(row=row_num, column=1, value=item['title'])
-            ws_capacity.cell(row=row_num, column=2, value=item['enrolled'])
-            ws_capacity.cell(row=row_num, column=3, value=item['capacity'])
-            ws_capacity.cell(row=row_num, column=4, value=round(item['utilization'], 1))
-        
-        response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-        response['Content-Disposition'] = 'attachment; filename="application_analytics.xlsx"'
-        wb.save(response)
-        return response
+        writer.add_sheet(
+            "Capacity Utilization",
+            ['Project Title', 'Enrolled', 'Capacity', 'Utilization %'],
+            ([item['title'], item['enrolled'], item['capacity'], round(item['utilization'], 1)] for item in context['capacity_data'])
+        )
+        
+        return writer.to_response('application_analytics.xlsx')
 
     def export_html(self, context):
         html_content = f"""
@@ -1592,6 +1530,54 @@ class ApplicationAnalyticsView(LoginRequiredMixin, UserPassesTestMixin, Template
 
 
 
+# --- Performance ---
+class PerfMetricsView(LoginRequiredMixin, UserPassesTestMixin, TemplateView):
+    """Recent per-request query counts and timings recorded by PerfInstrumentationMiddleware."""
+    template_name = 'content_management/perf_metrics.html'
+    login_url = '/login/'
+    redirect_field_name = 'next'
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        requests_data = perf.history.all()
+        context['perf_requests'] = requests_data
+        context['perf_enabled'] = getattr(settings, 'PERF_INSTRUMENTATION', True)
+        context['perf_budgets'] = getattr(settings, 'PERF_BUDGETS', {})
+        context['over_budget_count'] = sum(1 for item in requests_data if item['violations'])
+
+        # Aggregate by route so the heaviest views stand out
+        by_route = {}
+        for item in requests_data:
+            route = by_route.setdefault(item['route'] or item['path'], {
+                'route': item['route'] or item['path'], 'requests': 0, 'queries': 0,
+                'max_queries': 0, 'db_ms': 0.0, 'total_ms': 0.0, 'duplicates': 0,
+            })
+            route['requests'] += 1
+            route['queries'] += item['query_count']
+            route['max_queries'] = max(route['max_queries'], item['query_count'])
+            route['db_ms'] += item['db_ms']
+            route['total_ms'] += item['total_ms']
+            route['duplicates'] += item['duplicate_count']
+        for route in by_route.values():
+            route['avg_queries'] = round(route['queries'] / route['requests'], 1)
+            route['avg_db_ms'] = round(route['db_ms'] / route['requests'], 1)
+            route['avg_total_ms'] = round(route['total_ms'] / route['requests'], 1)
+        context['perf_routes'] = sorted(by_route.values(), key=lambda r: r['avg_queries'], reverse=True)
+        return context
+
+    def get(self, request, *args, **kwargs):
+        if request.GET.get('export') == 'json':
+            return JsonResponse({'requests': perf.history.all()})
+        return super().get(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        perf.history.clear()
+        return redirect('perf_metrics')
+
+
 # --- Project Views ---
 class ProjectListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
     paginate_by = 15
@@ -1644,6 +1630,10 @@ class ProjectListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
 
         return queryset
 
+    def get_export_queryset(self):
+        """List queryset with the enrolment count in the same query and without the image blob"""
+        return self.get_queryset().annotate(enrolled_users_count=Count('enrolled_users')).defer('cover_image_blob')
+
     def get(self, request, *args, **kwargs):
         export_format = request.GET.get('export')
         if export_format:
@@ -1668,7 +1658,7 @@ class ProjectListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
             return self.export_csv()
 
     def export_csv(self):
-        queryset = self.get_queryset()
+        queryset = self.get_export_queryset()
         response = HttpResponse(content_type='text/csv')
         response['Content-Disposition'] = 'attachment; filename="projects.csv"'
         
@@ -1705,7 +1695,7 @@ class ProjectListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
                 'Yes' if project.is_active else 'No',
                 'Yes' if project.is_hero_highlight else 'No',
                 'Yes' if project.is_featured else 'No',
-                project.enrolled_users.count(),
+                project.enrolled_users_count,
                 project.created_at.strftime('%Y-%m-%d %H:%M:%S'),
                 project.updated_at.strftime('%Y-%m-%d %H:%M:%S')
             ])
@@ -1713,7 +1703,7 @@ class ProjectListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
         return response
 
     def export_tsv(self):
-        queryset = self.get_queryset()
+        queryset = self.get_export_queryset()
         response = HttpResponse(content_type='text/tab-separated-values')
         response['Content-Disposition'] = 'attachment; filename="projects.tsv"'
         
@@ -1750,7 +1740,7 @@ class ProjectListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
                 'Yes' if project.is_active else 'No',
                 'Yes' if project.is_hero_highlight else 'No',
                 'Yes' if project.is_featured else 'No',
-                project.enrolled_users.count(),
+                project.enrolled_users_count,
                 project.created_at.strftime('%Y-%m-%d %H:%M:%S'),
                 project.updated_at.strftime('%Y-%m-%d %H:%M:%S')
             ])
@@ -1758,7 +1748,7 @@ class ProjectListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
         return response
 
     def export_json(self):
-        queryset = self.get_queryset()
+        queryset = self.get_export_queryset()
         data = []
         
         for project in queryset:
@@ -1785,7 +1775,7 @@ class ProjectListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
                 'is_active': project.is_active,
                 'is_hero_highlight': project.is_hero_highlight,
                 'is_featured': project.is_featured,
-                'enrolled_users_count': project.enrolled_users.count(),
+                'enrolled_users_count': project.enrolled_users_count,
                 'created_at': project.created_at.isoformat(),
                 'updated_at': project.updated_at.isoformat()
             })
@@ -1798,10 +1788,7 @@ class ProjectListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
         if not XLSX_AVAILABLE:
             return HttpResponse("XLSX export not available. Please install openpyxl.", status=400)
             
-        queryset = self.get_queryset()
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Projects"
+        queryset = self.get_export_queryset()
         
         # Header row with styling
         headers = [
@@ -1812,59 +1799,42 @@ class ProjectListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
             'Is Featured', 'Enrolled Users Count', 'Created At', 'Updated At'
         ]
         
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_num, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-        
-        # Data rows
-        for row_num, project in enumerate(queryset, 2):
-            ws.cell(row=row_num, column=1, value=project.id)
-            ws.cell(row=row_num, column=2, value=project.project_id)
-            ws.cell(row=row_num, column=3, value=project.kicc_project_id)
-            ws.cell(row=row_num, column=4, value=project.title)
-            ws.cell(row=row_num, column=5, value=project.teaser)
-            ws.cell(row=row_num, column=6, value=project.background_objectives)
-            ws.cell(row=row_num, column=7, value=project.tasks_eligibility)
-            ws.cell(row=row_num, column=8, value=project.country)
-            ws.cell(row=row_num, column=9, value=project.theme)
-            ws.cell(row=row_num, column=10, value=project.duration)
-            ws.cell(row=row_num, column=11, value=project.difficulty)
-            ws.cell(row=row_num, column=12, value=project.headcount or 0)
-            ws.cell(row=row_num, column=13, value=project.total_headcount)
-            ws.cell(row=row_num, column=14, value=project.cover_image_url)
-            ws.cell(row=row_num, column=15, value=', '.join(project.video_urls) if project.video_urls else '')
-            ws.cell(row=row_num, column=16, value=', '.join(project.image_urls) if project.image_urls else '')
-            ws.cell(row=row_num, column=17, value=project.application_deadline.strftime('%Y-%m-%d %H:%M:%S') if project.application_deadline else '')
-            ws.cell(row=row_num, column=18, value=project.start_date.strftime('%Y-%m-%d') if project.start_date else '')
-            ws.cell(row=row_num, column=19, value=project.end_date.strftime('%Y-%m-%d') if project.end_date else '')
-            ws.cell(row=row_num, column=20, value='Yes' if project.is_active else 'No')
-            ws.cell(row=row_num, column=21, value='Yes' if project.is_hero_highlight else 'No')
-            ws.cell(row=row_num, column=22, value='Yes' if project.is_featured else 'No')
-            ws.cell(row=row_num, column=23, value=project.enrolled_users.count())
-            ws.cell(row=row_num, column=24, value=project.created_at.strftime('%Y-%m-%d %H:%M:%S'))
-            ws.cell(row=row_num, column=25, value=project.updated_at.strftime('%Y-%m-%d %H:%M:%S'))
-        
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)  # Max width of 50
-            ws.column_dimensions[column_letter].width = adjusted_width
-        
-        response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-        response['Content-Disposition'] = 'attachment; filename="projects.xlsx"'
-        wb.save(response)
-        return response
+        def rows():
+            for project in queryset.iterator():
+                yield [
+                    project.id,
+                    project.project_id,
+                    project.kicc_project_id,
+                    project.title,
+                    project.teaser,
+                    project.background_objectives,
+                    project.tasks_eligibility,
+                    project.country,
+                    project.theme,
+                    project.duration,
+                    project.difficulty,
+                    project.headcount or 0,
+                    project.total_headcount,
+                    project.cover_image_url,
+                    ', '.join(project.video_urls) if project.video_urls else '',
+                    ', '.join(project.image_urls) if project.image_urls else '',
+                    project.application_deadline.strftime('%Y-%m-%d %H:%M:%S') if project.application_deadline else '',
+                    project.start_date.strftime('%Y-%m-%d') if project.start_date else '',
+                    project.end_date.strftime('%Y-%m-%d') if project.end_date else '',
+                    'Yes' if project.is_active else 'No',
+                    'Yes' if project.is_hero_highlight else 'No',
+                    'Yes' if project.is_featured else 'No',
+                    project.enrolled_users_count,
+                    project.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                    project.updated_at.strftime('%Y-%m-%d %H:%M:%S'),
+                ]
+        
+        writer = StreamingXLSXWriter(header_fill="CCCCCC")
+        writer.add_sheet("Projects", headers, rows())
+        return writer.to_response('projects.xlsx')
 
     def export_html(self):
-        queryset = self.get_queryset()
+        queryset = self.get_export_queryset()
         html_content = f"""
         <!DOCTYPE html>
         <html>
@@ -1941,7 +1911,7 @@ class ProjectListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
                         <td>{'Yes' if project.is_active else 'No'}</td>
                         <td>{'Yes' if project.is_hero_highlight else 'No'}</td>
                         <td>{'Yes' if project.is_featured else 'No'}</td>
-                        <td>{project.enrolled_users.count()}</td>
+                        <td>{project.enrolled_users_count}</td>
                         <td>{project.created_at.strftime('%Y-%m-%d %H:%M:%S')}</td>
                         <td>{project.updated_at.strftime('%Y-%m-%d %H:%M:%S')}</td>
                     </tr>
@@ -2024,6 +1994,54 @@ class ProjectDetailView(LoginRequiredMixin, UserPassesTestMixin, DetailView):
         
         return context
 
+class ProjectNotifyView(LoginRequiredMixin, UserPassesTestMixin, FormView):
+    """Email an announcement to every user enrolled in a project."""
+    template_name = 'content_management/project_notify.html'
+    form_class = ProjectAnnouncementForm
+    login_url = '/login/'
+    redirect_field_name = 'next'
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def dispatch(self, request, *args, **kwargs):
+        self.project = get_object_or_404(Project, pk=kwargs['pk'])
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_recipients(self):
+        return self.project.enrolled_users.filter(is_active=True).exclude(email='').only(
+            'email', 'username', 'first_name', 'last_name'
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['project'] = self.project
+        context['recipient_count'] = self.get_recipients().count()
+        return context
+
+    def form_valid(self, form):
+        language = form.cleaned_data['language']
+        recipients = [recipient_from_user(user, language) for user in self.get_recipients()]
+        sent, error = send_batch_email(
+            subject=form.cleaned_data['subject'],
+            recipients=recipients,
+            template_name='users/emails/project_announcement_email.html',
+            plain_text_template='users/emails/project_announcement_email.txt',
+            context={
+                'project': self.project,
+                'message': form.cleaned_data['message'],
+                'project_url': self.request.build_absolute_uri(reverse('content_project_detail', args=[self.project.pk])),
+                'protocol': 'https' if self.request.is_secure() else 'http',
+                'domain': self.request.get_host(),
+            },
+            tags=['project-announcement'],
+        )
+        if error:
+            logger.error(f"Project announcement for {self.project.pk} failed: {error}")
+        return self.render_to_response(self.get_context_data(
+            form=self.form_class(), announcement_sent=True, sent_count=sent, send_error=error,
+        ))
+
 class ProjectCreateView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
     model = Project
     template_name = 'content_management/project_form.html'
@@ -2264,10 +2282,7 @@ class NewsEventListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
         if not XLSX_AVAILABLE:
             return HttpResponse("XLSX export not available. Please install openpyxl.", status=400)
             
-        queryset = self.get_queryset()
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "News Events"
+        queryset = self.get_queryset().defer('cover_image_blob')
         
         headers = [
             'ID', 'News Event ID', 'Title', 'Body', 'Content Type', 'Cover Image URL', 
@@ -2275,44 +2290,29 @@ class NewsEventListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
             'Is Hero Highlight', 'Is Featured', 'Created At', 'Updated At'
         ]
         
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_num, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-        
-        for row_num, item in enumerate(queryset, 2):
-            ws.cell(row=row_num, column=1, value=item.id)
-            ws.cell(row=row_num, column=2, value=item.news_event_id)
-            ws.cell(row=row_num, column=3, value=item.title)
-            ws.cell(row=row_num, column=4, value=item.body)
-            ws.cell(row=row_num, column=5, value=item.content_type)
-            ws.cell(row=row_num, column=6, value=item.cover_image_url)
-            ws.cell(row=row_num, column=7, value=item.external_link)
-            ws.cell(row=row_num, column=8, value=', '.join(item.video_urls) if item.video_urls else '')
-            ws.cell(row=row_num, column=9, value=', '.join(item.image_urls) if item.image_urls else '')
-            ws.cell(row=row_num, column=10, value=item.publish_date.strftime('%Y-%m-%d %H:%M:%S') if item.publish_date else '')
-            ws.cell(row=row_num, column=11, value='Yes' if item.is_published else 'No')
-            ws.cell(row=row_num, column=12, value='Yes' if item.is_hero_highlight else 'No')
-            ws.cell(row=row_num, column=13, value='Yes' if item.is_featured else 'No')
-            ws.cell(row=row_num, column=14, value=item.created_at.strftime('%Y-%m-%d %H:%M:%S'))
-            ws.cell(row=row_num, column=15, value=item.updated_at.strftime('%Y-%m-%d %H:%M:%S'))
-        
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-        
-        response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-        response['Content-Disposition'] = 'attachment; filename="news_events.xlsx"'
-        wb.save(response)
-        return response
+        def rows():
+            for item in queryset.iterator():
+                yield [
+                    item.id,
+                    item.news_event_id,
+                    item.title,
+                    item.body,
+                    item.content_type,
+                    item.cover_image_url,
+                    item.external_link,
+                    ', '.join(item.video_urls) if item.video_urls else '',
+                    ', '.join(item.image_urls) if item.image_urls else '',
+                    item.publish_date.strftime('%Y-%m-%d %H:%M:%S') if item.publish_date else '',
+                    'Yes' if item.is_published else 'No',
+                    'Yes' if item.is_hero_highlight else 'No',
+                    'Yes' if item.is_featured else 'No',
+                    item.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                    item.updated_at.strftime('%Y-%m-%d %H:%M:%S'),
+                ]
+        
+        writer = StreamingXLSXWriter(header_fill="CCCCCC")
+        writer.add_sheet("News Events", headers, rows())
+        return writer.to_response('news_events.xlsx')
 
     def export_html(self):
         queryset = self.get_queryset()
@@ -2695,10 +2695,7 @@ class SuccessStoryListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
         if not XLSX_AVAILABLE:
             return HttpResponse("XLSX export not available. Please install openpyxl.", status=400)
             
-        queryset = self.get_queryset()
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Success Stories"
+        queryset = self.get_queryset().defer('cover_image_blob', 'related_project__cover_image_blob')
         
         headers = [
             'ID', 'Success Story ID', 'Title', 'Body', 'Related Project', 'Cover Image URL', 
@@ -2706,45 +2703,30 @@ class SuccessStoryListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
             'Total Hours Contributed', 'Is Published', 'Published At', 'Created At', 'Updated At'
         ]
         
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_num, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-        
-        for row_num, story in enumerate(queryset, 2):
-            ws.cell(row=row_num, column=1, value=story.id)
-            ws.cell(row=row_num, column=2, value=story.success_story_id)
-            ws.cell(row=row_num, column=3, value=story.title)
-            ws.cell(row=row_num, column=4, value=story.body)
-            ws.cell(row=row_num, column=5, value=story.related_project.title if story.related_project else '')
-            ws.cell(row=row_num, column=6, value=story.cover_image_url)
-            ws.cell(row=row_num, column=7, value='Yes' if story.is_hero_highlight else 'No')
-            ws.cell(row=row_num, column=8, value='Yes' if story.is_featured else 'No')
-            ws.cell(row=row_num, column=9, value=', '.join(story.image_urls) if story.image_urls else '')
-            ws.cell(row=row_num, column=10, value=', '.join(story.video_urls) if story.video_urls else '')
-            ws.cell(row=row_num, column=11, value=story.beneficiaries)
-            ws.cell(row=row_num, column=12, value=story.total_hours_contributed)
-            ws.cell(row=row_num, column=13, value='Yes' if story.is_published else 'No')
-            ws.cell(row=row_num, column=14, value=story.published_at.strftime('%Y-%m-%d %H:%M:%S') if story.published_at else '')
-            ws.cell(row=row_num, column=15, value=story.created_at.strftime('%Y-%m-%d %H:%M:%S'))
-            ws.cell(row=row_num, column=16, value=story.updated_at.strftime('%Y-%m-%d %H:%M:%S'))
-        
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-        
-        response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-        response['Content-Disposition'] = 'attachment; filename="success_stories.xlsx"'
-        wb.save(response)
-        return response
+        def rows():
+            for story in queryset.iterator():
+                yield [
+                    story.id,
+                    story.success_story_id,
+                    story.title,
+                    story.body,
+                    story.related_project.title if story.related_project else '',
+                    story.cover_image_url,
+                    'Yes' if story.is_hero_highlight else 'No',
+                    'Yes' if story.is_featured else 'No',
+                    ', '.join(story.image_urls) if story.image_urls else '',
+                    ', '.join(story.video_urls) if story.video_urls else '',
+                    story.beneficiaries,
+                    story.total_hours_contributed,
+                    'Yes' if story.is_published else 'No',
+                    story.published_at.strftime('%Y-%m-%d %H:%M:%S') if story.published_at else '',
+                    story.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                    story.updated_at.strftime('%Y-%m-%d %H:%M:%S'),
+                ]
+        
+        writer = StreamingXLSXWriter(header_fill="CCCCCC")
+        writer.add_sheet("Success Stories", headers, rows())
+        return writer.to_response('success_stories.xlsx')
 
     def export_html(self):
         queryset = self.get_queryset()
@@ -3132,50 +3114,32 @@ class FAQListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
             return HttpResponse("XLSX export not available. Please install openpyxl.", status=400)
             
         queryset = self.get_queryset()
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "FAQs"
         
         headers = [
             'ID', 'FAQ ID', 'Question', 'Answer', 'Order', 'Is Schema Ready', 
             'Thumbs Up', 'Thumbs Down', 'Total Votes', 'Helpfulness Ratio %', 'Created At', 'Updated At'
         ]
         
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_num, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-        
-        for row_num, faq in enumerate(queryset, 2):
-            ws.cell(row=row_num, column=1, value=faq.id)
-            ws.cell(row=row_num, column=2, value=faq.faq_id)
-            ws.cell(row=row_num, column=3, value=faq.question)
-            ws.cell(row=row_num, column=4, value=faq.answer)
-            ws.cell(row=row_num, column=5, value=faq.order)
-            ws.cell(row=row_num, column=6, value='Yes' if faq.is_schema_ready else 'No')
-            ws.cell(row=row_num, column=7, value=faq.thumbs_up)
-            ws.cell(row=row_num, column=8, value=faq.thumbs_down)
-            ws.cell(row=row_num, column=9, value=faq.total_votes)
-            ws.cell(row=row_num, column=10, value=f"{faq.helpfulness_ratio}%" if faq.total_votes > 0 else '0%')
-            ws.cell(row=row_num, column=11, value=faq.created_at.strftime('%Y-%m-%d %H:%M:%S'))
-            ws.cell(row=row_num, column=12, value=faq.updated_at.strftime('%Y-%m-%d %H:%M:%S'))
-        
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-        
-        response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-        response['Content-Disposition'] = 'attachment; filename="faqs.xlsx"'
-        wb.save(response)
-        return response
+        def rows():
+            for faq in queryset.iterator():
+                yield [
+                    faq.id,
+                    faq.faq_id,
+                    faq.question,
+                    faq.answer,
+                    faq.order,
+                    'Yes' if faq.is_schema_ready else 'No',
+                    faq.thumbs_up,
+                    faq.thumbs_down,
+                    faq.total_votes,
+                    f"{faq.helpfulness_ratio}%" if faq.total_votes > 0 else '0%',
+                    faq.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                    faq.updated_at.strftime('%Y-%m-%d %H:%M:%S'),
+                ]
+        
+        writer = StreamingXLSXWriter(header_fill="CCCCCC")
+        writer.add_sheet("FAQs", headers, rows())
+        return writer.to_response('faqs.xlsx')
 
     def export_html(self):
         queryset = self.get_queryset()
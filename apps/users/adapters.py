@@ -36,15 +36,7 @@ class CustomAccountAdapter(DefaultAccountAdapter):
                 return reverse('onboarding')
 
             # Check if user needs onboarding (either flag is False or required fields are empty)
-            needs_onboarding = (
-                not getattr(user, 'onboarding_complete', False) or
-                not user.date_of_birth or
-                not user.guardian_name or
-                not user.guardian_relation or
-                not user.address or
-                not user.contact or
-                not user.country_code
-            )
+            needs_onboarding = user.needs_onboarding
 
             logger.info(f"CustomAccountAdapter: onboarding_complete={getattr(user, 'onboarding_complete', 'N/A')}, needs_onboarding={needs_onboarding}")
 
@@ -2,7 +2,9 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from django.utils.html import format_html
 from django.db.models import Count, Q
-from .models import CustomUser, Certificate
+from django.utils import timezone
+from .cache_utils import user_cache
+from .models import CustomUser, Certificate, UserSyncOutbox, EmailOutbox
 
 
 @admin.register(Certificate)
@@ -22,6 +24,43 @@ class CertificateAdmin(admin.ModelAdmin):
     view_certificate_link.short_description = "Certificate"
 
 
+@admin.register(UserSyncOutbox)
+class UserSyncOutboxAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'event', 'status', 'attempts', 'next_attempt_at', 'sent_at', 'created_at')
+    list_filter = ('status', 'event')
+    search_fields = ('user__email', 'user__username', 'last_error')
+    readonly_fields = ('user', 'idempotency_key', 'event', 'payload', 'attempts', 'created_at', 'sent_at', 'last_error')
+    list_select_related = ('user',)
+    actions = ['retry_now']
+
+    def retry_now(self, request, queryset):
+        """Reschedule selected entries for immediate delivery"""
+        count = queryset.exclude(status=UserSyncOutbox.Status.SENT).update(
+            status=UserSyncOutbox.Status.PENDING, attempts=0, next_attempt_at=timezone.now(),
+        )
+        self.message_user(request, f'{count} sync(s) rescheduled.')
+    retry_now.short_description = 'Retry selected syncs now'
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('id', 'subject', 'to', 'provider', 'status', 'attempts', 'next_attempt_at', 'sent_at', 'created_at')
+    list_filter = ('status', 'provider')
+    search_fields = ('subject', 'to', 'last_error')
+    readonly_fields = ('subject', 'from_email', 'to', 'tags', 'provider', 'attempts', 'created_at', 'sent_at', 'last_error')
+    exclude = ('text_body', 'html_body')
+
+
+class UserSyncOutboxInline(admin.TabularInline):
+    model = UserSyncOutbox
+    fields = ('event', 'status', 'attempts', 'next_attempt_at', 'sent_at', 'last_error')
+    readonly_fields = fields
+    extra = 0
+    max_num = 0
+    can_delete = False
+    verbose_name_plural = 'KICC Sync Status'
+
+
 @admin.register(CustomUser)
 class CustomUserAdmin(UserAdmin):
     """
@@ -68,6 +107,8 @@ class CustomUserAdmin(UserAdmin):
     
     ordering = ('-date_joined',)
     
+    inlines = [UserSyncOutboxInline]
+    
     list_per_page = 50
     
     date_hierarchy = 'date_joined'
@@ -160,7 +201,7 @@ class CustomUserAdmin(UserAdmin):
     
     def enrolled_projects_count(self, obj):
         """Display number of enrolled projects with color coding"""
-        count = obj.enrolled_projects.count()
+        count = obj._enrolled_projects_count
         if count == 0:
             color = 'gray'
         elif count <= 3:
@@ -171,6 +212,7 @@ class CustomUserAdmin(UserAdmin):
             color = 'blue'
         return format_html('<span style="color: {}; font-weight: bold;">{}</span>', color, count)
     enrolled_projects_count.short_description = 'Enrolled Projects'
+    enrolled_projects_count.admin_order_field = '_enrolled_projects_count'
     
     def enrolled_projects_display(self, obj):
         """Display list of enrolled projects with links to admin"""
@@ -195,28 +237,36 @@ class CustomUserAdmin(UserAdmin):
         return format_html('<span style="color: gray;">Never</span>')
     last_login_display.short_description = 'Last Login'
     
+    def update_users(self, queryset, **fields):
+        """``queryset.update(**fields)`` that also drops this process's cached copies of the users"""
+        ids = list(queryset.values_list('pk', flat=True))
+        count = CustomUser.objects.filter(pk__in=ids).update(**fields)
+        for user_id in ids:
+            user_cache.invalidate(user_id)
+        return count
+
     # Custom actions
     def activate_users(self, request, queryset):
         """Activate selected users"""
-        count = queryset.update(is_active=True)
+        count = self.update_users(queryset, is_active=True)
         self.message_user(request, f'{count} user(s) successfully activated.')
     activate_users.short_description = 'Activate selected users'
     
     def deactivate_users(self, request, queryset):
         """Deactivate selected users"""
-        count = queryset.update(is_active=False)
+        count = self.update_users(queryset, is_active=False)
         self.message_user(request, f'{count} user(s) successfully deactivated.')
     deactivate_users.short_description = 'Deactivate selected users'
     
     def make_staff(self, request, queryset):
         """Grant staff status to selected users"""
-        count = queryset.update(is_staff=True)
+        count = self.update_users(queryset, is_staff=True)
         self.message_user(request, f'{count} user(s) granted staff status.')
     make_staff.short_description = 'Grant staff status'
     
     def remove_staff(self, request, queryset):
         """Remove staff status from selected users"""
-        count = queryset.update(is_staff=False)
+        count = self.update_users(queryset, is_staff=False)
         self.message_user(request, f'{count} user(s) removed from staff.')
     remove_staff.short_description = 'Remove staff status'
     
@@ -242,7 +292,7 @@ class CustomUserAdmin(UserAdmin):
     mark_email_unverified.short_description = 'Mark selected users as email unverified'
     
     def get_queryset(self, request):
-        """Optimize queryset with prefetch for enrolled projects"""
+        """Annotate enrolled project counts so the changelist doesn't query per row"""
         qs = super().get_queryset(request)
-        qs = qs.prefetch_related('enrolled_projects')
+        qs = qs.annotate(_enrolled_projects_count=Count('enrolled_projects', distinct=True))
         return qs
@@ -2,6 +2,7 @@ from rest_framework import viewsets, generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from .serializers import (
     UserSerializer,
     UserRegistrationSerializer,
@@ -9,7 +10,7 @@ from .serializers import (
     CertificateSerializer,
     SocialAccountSerializer
 )
-from .sync_utils import sync_user_after_registration
+from .sync_utils import enqueue_user_sync
 from .models import Certificate
 from allauth.socialaccount.models import SocialAccount
 import logging
@@ -40,15 +41,11 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        # Create the user
-        user = serializer.save()
-        
-        # Sync user to KICC in background (non-blocking)
-        try:
-            sync_user_after_registration(user)
-        except Exception as e:
-            logger.warning(f"User sync to KICC failed for {user.email}: {str(e)}")
-            # Don't fail the registration if sync fails
+        # Create the user and queue the KICC sync atomically; it is delivered
+        # after the commit as configured by USER_SYNC_DELIVERY
+        with transaction.atomic():
+            user = serializer.save()
+            enqueue_user_sync(user)
         
         headers = self.get_success_headers(serializer.data)
         return Response(
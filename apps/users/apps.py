@@ -8,3 +8,4 @@ class UsersConfig(AppConfig):
     def ready(self):
         # Import signals to ensure they're connected
         import apps.users.views  # noqa
+        import apps.users.sync_utils  # noqa
@@ -0,0 +1,93 @@
+"""
+Short-lived, per-process cache of authenticated users.
+
+``AuthenticationMiddleware`` normally reads the user row on every request.
+``CachedAuthenticationMiddleware`` reuses a copy kept here for
+``AUTH_USER_CACHE_TTL`` seconds. Saves and deletes made in this process drop
+the entry immediately. Other processes pick up the change when their own copy
+expires, so a deactivated user or one who lost staff status keeps their
+permissions there until then; the cache is off unless the setting is raised
+from its default of 0.
+"""
+import copy
+import threading
+import time
+
+from django.conf import settings
+from django.contrib import auth
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.crypto import constant_time_compare
+
+
+class UserCache:
+    """Thread-safe mapping of (user id, backend path) to a user instance with an expiry time."""
+
+    def __init__(self, max_size=1000):
+        self.max_size = max_size
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if expires_at < time.monotonic():
+            self.invalidate(key[0])
+            return None
+        # Each request gets its own copy, so changes made in a view never leak into the cache
+        return copy.copy(user)
+
+    def set(self, key, user, ttl):
+        with self._lock:
+            if len(self._entries) >= self.max_size:
+                self._entries.clear()
+            self._entries[key] = (time.monotonic() + ttl, copy.copy(user))
+
+    def invalidate(self, user_id):
+        user_id = str(user_id)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache()
+
+
+def get_cached_user(request):
+    """
+    Drop-in replacement for ``django.contrib.auth.get_user``.
+    A cached user is only returned if it still matches the session's auth hash.
+    Any other case, such as a changed password, an unknown backend or a flushed
+    session, falls through to Django.
+    """
+    ttl = getattr(settings, 'AUTH_USER_CACHE_TTL', 0)
+    if ttl <= 0:
+        return auth.get_user(request)
+
+    user_id = request.session.get(auth.SESSION_KEY)
+    if user_id is None:
+        return auth.get_user(request)
+
+    key = (str(user_id), request.session.get(auth.BACKEND_SESSION_KEY))
+    session_hash = request.session.get(auth.HASH_SESSION_KEY)
+    user = user_cache.get(key)
+    if user is not None and session_hash and constant_time_compare(session_hash, user.get_session_auth_hash()):
+        return user
+
+    user = auth.get_user(request)
+    if user.is_authenticated:
+        user_cache.set(key, user, ttl)
+    return user
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
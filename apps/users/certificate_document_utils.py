@@ -0,0 +1,234 @@
+"""
+Certificate documents (PNG and PDF) rendered with Pillow.
+
+A document is drawn once as an A4 landscape image and saved both as PNG and as
+a single-page PDF in the default storage. The file name is a version derived
+from the certificate's index summary, the language and the verification URL,
+so a changed name, title or layout yields a new file and a stale one is never
+served. Documents are rendered in a background thread once a certificate is
+issued (``CERTIFICATE_RENDER_INPROCESS``) or by ``manage.py render_certificates``,
+and on demand if a download comes first.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import hashlib
+import io
+import logging
+import threading
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.urls import reverse
+from django.utils import translation
+from django.utils.dateformat import format as format_date
+from PIL import Image, ImageDraw, ImageFont
+
+from .certificate_utils import certificate_summary
+from .models import Certificate
+
+logger = logging.getLogger(__name__)
+
+CERTIFICATE_FORMATS = {
+    'png': 'image/png',
+    'pdf': 'application/pdf',
+}
+
+# A4 landscape at 150 dpi
+PAGE_SIZE = (1754, 1240)
+PAGE_DPI = 150
+PRIMARY_BLUE = (9, 52, 104)
+TEXT_DARK = (31, 41, 55)
+TEXT_MUTED = (75, 85, 99)
+TEXT_FAINT = (156, 163, 175)
+
+
+def certificate_base_url():
+    """Site URL printed in the verification line of rendered documents"""
+    base_url = getattr(settings, 'CERTIFICATE_BASE_URL', '')
+    if not base_url:
+        base_url = 'https://' + (settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else 'example.com')
+    return base_url.rstrip('/')
+
+
+def document_version(summary, language=None, base_url=None):
+    """Version of the rendered document for a certificate summary; also its ETag"""
+    language = language or translation.get_language() or settings.LANGUAGE_CODE
+    base_url = base_url or certificate_base_url()
+    return hashlib.sha256(f"{summary['version']}:{language}:{base_url}".encode()).hexdigest()[:16]
+
+
+def document_path(summary, fmt, language=None, base_url=None):
+    return f"certificates/{summary['certificate_id']}/{document_version(summary, language, base_url)}.{fmt}"
+
+
+@lru_cache(maxsize=32)
+def _font(size):
+    font_path = getattr(settings, 'CERTIFICATE_FONT_PATH', '')
+    if font_path:
+        return ImageFont.truetype(font_path, size)
+    return ImageFont.load_default(size=size)
+
+
+@lru_cache(maxsize=8)
+def _static_image(path, height):
+    found = finders.find(path)
+    if not found:
+        return None
+    image = Image.open(found).convert('RGBA')
+    return image.resize((round(image.width * height / image.height), height))
+
+
+def _fit_font(draw, text, max_size, min_size, width):
+    """Largest font between the two sizes that fits ``text`` on one line"""
+    size = max_size
+    while size > min_size and draw.textlength(text, font=_font(size)) > width:
+        size -= 2
+    return _font(size)
+
+
+def _wrap(draw, text, font, width, max_lines):
+    # Titles without spaces (e.g. Chinese) wrap between characters
+    words = text.split(' ') if ' ' in text else list(text)
+    separator = ' ' if ' ' in text else ''
+    lines = ['']
+    for word in words:
+        candidate = lines[-1] + separator + word if lines[-1] else word
+        if draw.textlength(candidate, font=font) <= width or not lines[-1]:
+            lines[-1] = candidate
+        elif len(lines) < max_lines:
+            lines.append(word)
+        else:
+            lines[-1] = lines[-1].rstrip() + '...'
+            break
+    return lines
+
+
+def _center(draw, y, text, font, fill):
+    draw.text((PAGE_SIZE[0] / 2, y), text, font=font, fill=fill, anchor='ma')
+
+
+def _paste_centered(page, image, x, y):
+    if image is not None:
+        page.paste(image, (round(x - image.width / 2), y), image)
+
+
+def render_certificate_image(summary, base_url=None):
+    """Draw the certificate for ``summary`` in the active language"""
+    base_url = base_url or certificate_base_url()
+    width, height = PAGE_SIZE
+    page = Image.new('RGB', PAGE_SIZE, 'white')
+    draw = ImageDraw.Draw(page)
+
+    draw.rectangle((24, 24, width - 25, height - 25), outline=PRIMARY_BLUE, width=10)
+    draw.rectangle((48, 48, width - 49, height - 49), outline=TEXT_FAINT, width=2)
+
+    _paste_centered(page, _static_image('images/logo.png', 130), width / 2, 80)
+    _center(draw, 225, 'CERTIFICATE', _font(88), TEXT_DARK)
+    _center(draw, 325, 'OF COMPLETION', _font(40), TEXT_MUTED)
+
+    _center(draw, 420, 'This is to certify that', _font(32), TEXT_MUTED)
+    name_font = _fit_font(draw, summary['full_name'], 72, 36, width - 400)
+    _center(draw, 470, summary['full_name'], name_font, PRIMARY_BLUE)
+    draw.line((width / 2 - 420, 565, width / 2 + 420, 565), fill=TEXT_FAINT, width=2)
+
+    _center(draw, 590, 'has successfully completed the project', _font(32), TEXT_MUTED)
+    title_font = _fit_font(draw, summary['project_title'], 56, 36, width - 300)
+    for i, line in enumerate(_wrap(draw, summary['project_title'], title_font, width - 300, 2)):
+        _center(draw, 640 + i * (title_font.size + 12), line, title_font, TEXT_DARK)
+
+    if summary['start_date'] and summary['end_date']:
+        period = f"from {format_date(summary['start_date'], 'F d, Y')} to {format_date(summary['end_date'], 'F d, Y')}"
+        _center(draw, 800, period, _font(30), TEXT_MUTED)
+
+    for x, signature, role in (
+        (width * 0.22, 'images/certificates/signature_director.png', 'Program Director'),
+        (width * 0.78, 'images/certificates/signature_chairman.png', 'Chairman'),
+    ):
+        _paste_centered(page, _static_image(signature, 90), x, 880)
+        draw.line((x - 160, 980, x + 160, 980), fill=TEXT_FAINT, width=2)
+        draw.text((x, 995), role, font=_font(30), fill=TEXT_DARK, anchor='ma')
+        draw.text((x, 1035), 'Global Devotion Association', font=_font(20), fill=TEXT_MUTED, anchor='ma')
+
+    draw.ellipse((width / 2 - 90, 880, width / 2 + 90, 1060), outline=PRIMARY_BLUE, width=5)
+    _center(draw, 955, 'GDA SEAL', _font(26), PRIMARY_BLUE)
+
+    verify_url = base_url + reverse('certificate_verification_url', args=[summary['certificate_id']])
+    footer = f"Certificate ID: {summary['certificate_id']}  |  Issued: {format_date(summary['issued_at'], 'F d, Y')}"
+    _center(draw, 1110, footer, _font(20), TEXT_FAINT)
+    _center(draw, 1140, f'Verify: {verify_url}', _font(20), TEXT_FAINT)
+    return page
+
+
+def render_certificate_documents(summary, base_url=None):
+    """
+    Render and store the PNG and PDF for ``summary`` in the active language,
+    unless they exist already.
+
+    Returns:
+        int: Number of files written
+    """
+    base_url = base_url or certificate_base_url()
+    missing = [fmt for fmt in CERTIFICATE_FORMATS if not default_storage.exists(document_path(summary, fmt, base_url=base_url))]
+    if not missing:
+        return 0
+    page = render_certificate_image(summary, base_url)
+    for fmt in missing:
+        output = io.BytesIO()
+        page.save(output, format=fmt.upper(), resolution=PAGE_DPI)
+        default_storage.save(document_path(summary, fmt, base_url=base_url), ContentFile(output.getvalue()))
+    return len(missing)
+
+
+def certificate_document(summary, fmt):
+    """Storage path of the document in the active language, rendering it if needed"""
+    path = document_path(summary, fmt)
+    if not default_storage.exists(path):
+        render_certificate_documents(summary)
+    return path
+
+
+def prerender_certificates(certificate_ids=None):
+    """
+    Render missing documents in the default language for the given
+    certificates (all certificates if None).
+
+    Returns:
+        int: Number of files written
+    """
+    if certificate_ids is None:
+        certificate_ids = Certificate.objects.values_list('certificate_id', flat=True).iterator()
+    written = 0
+    with translation.override(settings.LANGUAGE_CODE):
+        for certificate_id in certificate_ids:
+            summary = certificate_summary(certificate_id)
+            if summary is not None:
+                written += render_certificate_documents(summary)
+    return written
+
+
+_render_executor = None
+_render_lock = threading.Lock()
+
+
+def _render_in_background(certificate_ids):
+    try:
+        prerender_certificates(certificate_ids)
+    except Exception as e:
+        logger.error(f"Certificate rendering failed: {str(e)}")
+    finally:
+        close_old_connections()
+
+
+def schedule_certificate_documents(certificate_ids):
+    """Render documents for new certificates in a background thread once the transaction commits"""
+    global _render_executor
+    certificate_ids = list(certificate_ids)
+    if not certificate_ids or not getattr(settings, 'CERTIFICATE_RENDER_INPROCESS', True):
+        return
+    with _render_lock:
+        if _render_executor is None:
+            _render_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='certificate-render')
+    transaction.on_commit(lambda: _render_executor.submit(_render_in_background, certificate_ids))
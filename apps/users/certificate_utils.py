@@ -0,0 +1,246 @@
+"""
+Certificate issuance and the verification index.
+
+Bulk issuance for projects that have ended:
+
+``issue_certificates`` gives every enrolled user who doesn't hold a certificate
+for the project one in a single ``bulk_create``. Certificate ids are drawn as a
+batch and checked against the table in one query, and only the colliding ones
+are redrawn, so the insert doesn't trip over the unique ``certificate_id``.
+Users who already hold a certificate are skipped, so re-running it for the same
+project issues nothing new.
+
+The verification index maps a certificate id to a small summary (holder name,
+project titles in every language, dates and a content version) kept in the
+cache, so verifying or viewing a certificate doesn't join users and projects.
+Unknown ids are cached too, for a shorter time. Entries are dropped when the
+certificate, its holder's name or its project changes, and otherwise expire
+after ``CERTIFICATE_INDEX_CACHE_SECONDS``.
+"""
+from datetime import date
+import hashlib
+import logging
+import re
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.urls import reverse
+from django.utils.translation import get_language
+from modeltranslation.utils import build_localized_fieldname
+
+from apps.content.models import Project
+from apps.content_management.perf import record_cache_access
+
+from .email_utils import recipient_from_user, send_batch_email
+from .models import Certificate
+
+logger = logging.getLogger(__name__)
+
+# Rounds of redrawing colliding ids before giving up
+CERTIFICATE_ID_ATTEMPTS = 5
+
+CERTIFICATE_INDEX_CACHE_SECONDS = 60 * 60 * 24
+# Unknown ids are remembered for less time, since the certificate may be issued later
+CERTIFICATE_MISS_CACHE_SECONDS = 60
+# Bump when the certificate layout changes, so rendered documents and ETags are renewed
+CERTIFICATE_LAYOUT_VERSION = 1
+
+CERTIFICATE_ID_RE = re.compile(r'^[A-Za-z0-9-]{1,100}$')
+
+
+def project_has_ended(project, today=None):
+    """Certificates are available from the project's end date on"""
+    today = today or date.today()
+    return bool(project.end_date) and project.end_date <= today
+
+
+def unique_certificate_ids(project, count):
+    """
+    ``count`` distinct certificate ids for ``project`` that aren't in use yet.
+
+    Raises:
+        RuntimeError: If free ids couldn't be found in CERTIFICATE_ID_ATTEMPTS rounds
+    """
+    ids = set()
+    for _ in range(CERTIFICATE_ID_ATTEMPTS):
+        missing = count - len(ids)
+        if missing <= 0:
+            break
+        candidates = {Certificate.make_certificate_id(project) for _ in range(missing)} - ids
+        taken = set(Certificate.objects.filter(certificate_id__in=candidates).values_list('certificate_id', flat=True))
+        ids |= candidates - taken
+    if len(ids) < count:
+        raise RuntimeError(f"Could not generate {count} unique certificate ids for project {project.pk}")
+    return list(ids)
+
+
+def issue_certificates(project, notify=False, protocol='https', domain=None):
+    """
+    Issue certificates to every enrolled user of an ended project who has none.
+
+    Args:
+        project: Project whose enrolled users receive certificates
+        notify (bool): Queue one batch email telling the new holders
+        protocol (str): Protocol for links in the email
+        domain (str, optional): Domain for links in the email (defaults to the first ALLOWED_HOSTS entry)
+
+    Returns:
+        list: The certificates created by this call; empty if the project hasn't ended
+    """
+    if not project_has_ended(project):
+        return []
+
+    users = list(
+        project.enrolled_users.exclude(certificates__project=project)
+        .only('email', 'username', 'first_name', 'last_name', 'is_active')
+    )
+    if not users:
+        return []
+
+    with transaction.atomic():
+        ids = unique_certificate_ids(project, len(users))
+        # A concurrent run may have issued some of these in the meantime;
+        # those rows are skipped and the certificates read back are the ones inserted here
+        Certificate.objects.bulk_create(
+            [Certificate(user=user, project=project, certificate_id=certificate_id)
+             for user, certificate_id in zip(users, ids)],
+            ignore_conflicts=True,
+        )
+        users_by_id = {user.pk: user for user in users}
+        certificates = list(Certificate.objects.filter(certificate_id__in=ids))
+        for certificate in certificates:
+            certificate.user = users_by_id[certificate.user_id]
+            certificate.project = project
+
+    forget_certificates(ids)
+    logger.info(f"Issued {len(certificates)} certificate(s) for project {project.pk}")
+    # Imported here: the document module builds on this one
+    from .certificate_document_utils import schedule_certificate_documents
+    schedule_certificate_documents([certificate.certificate_id for certificate in certificates])
+    if notify:
+        notify_certificate_holders(project, certificates, protocol=protocol, domain=domain)
+    return certificates
+
+
+def notify_certificate_holders(project, certificates, protocol='https', domain=None):
+    """
+    Email the holders of newly issued certificates in one batch.
+
+    Returns:
+        tuple: (number of messages queued or sent: int, error_message: str or None)
+    """
+    domain = domain or (settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else 'example.com')
+    base_url = f'{protocol}://{domain}'
+    recipients = [
+        recipient_from_user(
+            certificate.user,
+            certificate_id=certificate.certificate_id,
+            certificate_url=base_url + reverse('view_certificate', args=[certificate.certificate_id]),
+        )
+        for certificate in certificates
+        if certificate.user.is_active
+    ]
+    sent, error = send_batch_email(
+        subject=f'Your certificate for {project.title} - GDA',
+        recipients=recipients,
+        template_name='users/emails/certificate_issued_email.html',
+        plain_text_template='users/emails/certificate_issued_email.txt',
+        context={
+            'project': project,
+            'verify_url': base_url + reverse('verify_certificate'),
+            'protocol': protocol,
+            'domain': domain,
+        },
+        tags=['certificate', 'transactional'],
+    )
+    if error:
+        logger.error(f"Certificate notification for project {project.pk} failed: {error}")
+    return sent, error
+
+
+def _index_key(certificate_id):
+    return f'certificate_index:{certificate_id}'
+
+
+def _load_summary(certificate_id):
+    # modeltranslation only localizes the model's own fields, so read each language's column
+    title_columns = {code: build_localized_fieldname('title', code) for code in dict(settings.LANGUAGES)}
+    titles = {f'project_{column}': F(f'project__{column}') for column in title_columns.values()}
+    row = (
+        Certificate.objects.filter(certificate_id=certificate_id)
+        .values(
+            'certificate_id', 'user_id', 'user__first_name', 'user__last_name', 'project_id',
+            'project__title', 'project__start_date', 'project__end_date', 'issued_at', **titles
+        )
+        .first()
+    )
+    if row is None:
+        return None
+    summary = {
+        'certificate_id': row['certificate_id'],
+        'user_id': row['user_id'],
+        'full_name': f"{row['user__first_name']} {row['user__last_name']}".strip(),
+        'project_id': row['project_id'],
+        'project_titles': {code: row[f'project_{column}'] or row['project__title'] for code, column in title_columns.items()},
+        'start_date': row['project__start_date'],
+        'end_date': row['project__end_date'],
+        'issued_at': row['issued_at'],
+    }
+    content = repr((CERTIFICATE_LAYOUT_VERSION, sorted(summary.items())))
+    summary['version'] = hashlib.sha256(content.encode()).hexdigest()[:16]
+    return summary
+
+
+def certificate_summary(certificate_id):
+    """
+    Cached summary of a certificate for verification and rendering, or None
+    if there is no such certificate. ``project_title`` is in the active language.
+    """
+    if not certificate_id or not CERTIFICATE_ID_RE.match(certificate_id):
+        return None
+    key = _index_key(certificate_id)
+    summary = cache.get(key)
+    record_cache_access(summary is not None)
+    if summary is None:
+        summary = _load_summary(certificate_id)
+        if summary is None:
+            # Cached as False: a miss that is known, not an empty cache
+            cache.set(key, False, CERTIFICATE_MISS_CACHE_SECONDS)
+        else:
+            cache.set(key, summary, CERTIFICATE_INDEX_CACHE_SECONDS)
+    if not summary:
+        return None
+    titles = summary['project_titles']
+    return dict(summary, project_title=titles.get(get_language()) or titles.get(settings.LANGUAGE_CODE) or '')
+
+
+def forget_certificates(certificate_ids):
+    """Drop index entries, known or unknown, for the given certificate ids"""
+    cache.delete_many([_index_key(certificate_id) for certificate_id in certificate_ids])
+
+
+@receiver(post_save, sender=Certificate)
+@receiver(post_delete, sender=Certificate)
+def certificate_changed(sender, instance, created=False, **kwargs):
+    forget_certificates([instance.certificate_id])
+    if created:
+        from .certificate_document_utils import schedule_certificate_documents
+        schedule_certificate_documents([instance.certificate_id])
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def certificate_holder_changed(sender, instance, created=False, update_fields=None, **kwargs):
+    # Logins save only last_login; only a name change shows on certificates
+    if created or update_fields is not None and not {'first_name', 'last_name'} & set(update_fields):
+        return
+    forget_certificates(Certificate.objects.filter(user=instance).values_list('certificate_id', flat=True))
+
+
+@receiver(post_save, sender=Project)
+def certificate_project_changed(sender, instance, created=False, **kwargs):
+    if not created:
+        forget_certificates(Certificate.objects.filter(project=instance).values_list('certificate_id', flat=True))
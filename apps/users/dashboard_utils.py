@@ -0,0 +1,98 @@
+"""
+Data for the profile dashboard.
+
+Everything that depends on the user's enrollments comes from one annotated
+project query: lifecycle status, the user's certificate and the impact totals
+of published success stories. Certificates are rebuilt from that query instead
+of being read separately. The global widgets (recent news, FAQs) are shared
+cache entries; only the user's FAQ votes are read per request.
+"""
+from django.db.models import Exists, OuterRef, Q, Subquery, Sum
+
+from apps.content.card_utils import card_lists, faq_widget
+from apps.content.models import FAQVote, Project, SuccessStory
+
+from .models import Certificate
+
+PROFILE_FAQ_COUNT = 10
+PROFILE_STORY_COUNT = 5
+
+
+def _story_total(field):
+    """Sum of ``field`` over the published success stories of the outer project."""
+    return Subquery(
+        SuccessStory.objects.filter(related_project=OuterRef('pk'), is_published=True)
+        .order_by()
+        .values('related_project')
+        .annotate(total=Sum(field))
+        .values('total')
+    )
+
+
+def dashboard_projects(user):
+    """Projects the user is enrolled in or holds a certificate for, annotated for the dashboard."""
+    certificate = Certificate.objects.filter(user=user, project=OuterRef('pk'))
+    return (
+        Project.objects
+        .defer('cover_image_blob')
+        .annotate(
+            is_enrolled=Exists(Project.enrolled_users.through.objects.filter(project=OuterRef('pk'), customuser=user)),
+            certificate_pk=Subquery(certificate.values('pk')[:1]),
+            certificate_code=Subquery(certificate.values('certificate_id')[:1]),
+            certificate_issued_at=Subquery(certificate.values('issued_at')[:1]),
+            story_beneficiaries=_story_total('beneficiaries'),
+            story_hours=_story_total('total_hours_contributed'),
+        )
+        .filter(Q(is_enrolled=True) | Q(certificate_pk__isnull=False))
+    )
+
+
+def profile_dashboard(user):
+    """Context for the profile page's overview, projects and certificates tabs."""
+    upcoming_projects, current_projects, past_projects = [], [], []
+    certificates, eligible_projects = [], []
+    for project in dashboard_projects(user):
+        project.user_certificate = None
+        if project.certificate_pk is not None:
+            project.user_certificate = Certificate(
+                pk=project.certificate_pk, user=user, project=project,
+                certificate_id=project.certificate_code, issued_at=project.certificate_issued_at,
+            )
+            certificates.append(project.user_certificate)
+        if not project.is_enrolled:
+            continue
+        if project.status == Project.Status.COMPLETED:
+            past_projects.append(project)
+            if project.user_certificate is None:
+                eligible_projects.append(project)
+        elif project.status == Project.Status.RUNNING:
+            current_projects.append(project)
+        else:
+            upcoming_projects.append(project)
+    certificates.sort(key=lambda certificate: certificate.issued_at, reverse=True)
+
+    enrolled_ids = [project.pk for project in upcoming_projects + current_projects + past_projects]
+    success_stories = []
+    if enrolled_ids:
+        success_stories = list(
+            SuccessStory.objects.filter(is_published=True, related_project__in=enrolled_ids)
+            .select_related('related_project')
+            .defer('cover_image_blob', 'related_project__cover_image_blob')
+            .order_by('-published_at')[:PROFILE_STORY_COUNT]
+        )
+
+    faqs = faq_widget(PROFILE_FAQ_COUNT)
+    votes = dict(FAQVote.objects.filter(user=user, faq__in=[faq['id'] for faq in faqs]).values_list('faq_id', 'vote_type')) if faqs else {}
+
+    return {
+        'upcoming_projects': upcoming_projects,
+        'current_projects': current_projects,
+        'past_projects': past_projects,
+        'certificates': certificates,
+        'eligible_projects': eligible_projects,
+        'recent_news_events': card_lists('recent_news_events')['recent_news_events'],
+        'success_stories': success_stories,
+        'faqs': [{**faq, 'user_vote': votes.get(faq['id'])} for faq in faqs],
+        'total_beneficiaries': sum(project.story_beneficiaries or 0 for project in past_projects),
+        'total_hours': sum(project.story_hours or 0 for project in past_projects),
+    }
@@ -0,0 +1,65 @@
+"""
+Range-hash digests over user email sets, used to reconcile GDA and KICC.
+
+Every email is mapped to the SHA-256 of its normalized form. A bucket is the
+set of hashes sharing a hex prefix, and its digest is the hash of its sorted
+members, so two sides agree on a bucket exactly when they hold the same
+emails in it. Reconciliation compares the 16 top-level buckets, splits only
+the ones that differ into their 16 children, and repeats until the differing
+buckets are small enough to transfer outright (a Merkle tree over the hash
+space).
+"""
+import hashlib
+from bisect import bisect_left
+from typing import Dict, Iterable, List
+
+HEX_DIGITS = '0123456789abcdef'
+
+
+def email_hash(email: str) -> str:
+    """Hash of the normalized email, shared by both sides of a reconciliation"""
+    return hashlib.sha256(email.strip().lower().encode()).hexdigest()
+
+
+def child_prefixes(prefix: str) -> List[str]:
+    """The 16 buckets one level below ``prefix``"""
+    return [prefix + digit for digit in HEX_DIGITS]
+
+
+class EmailDigestIndex:
+    """Sorted email hashes supporting digest and membership queries by prefix"""
+
+    def __init__(self, emails: Iterable[str]):
+        by_hash = {email_hash(email): email for email in emails if email}
+        self.hashes = sorted(by_hash)
+        self.emails_by_hash = by_hash
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def _bounds(self, prefix: str):
+        # 'g' sorts after every hex digit, closing the prefix range
+        return bisect_left(self.hashes, prefix), bisect_left(self.hashes, prefix + 'g')
+
+    def digest(self, prefix: str) -> Dict:
+        start, end = self._bounds(prefix)
+        members = self.hashes[start:end]
+        return {
+            'count': len(members),
+            'digest': hashlib.sha256('\n'.join(members).encode()).hexdigest() if members else '',
+        }
+
+    def digests(self, prefixes: Iterable[str]) -> Dict[str, Dict]:
+        return {prefix: self.digest(prefix) for prefix in prefixes}
+
+    def emails(self, prefixes: Iterable[str]) -> List[str]:
+        """Emails whose hash falls in any of the given buckets"""
+        emails = []
+        for prefix in prefixes:
+            start, end = self._bounds(prefix)
+            emails.extend(self.emails_by_hash[h] for h in self.hashes[start:end])
+        return emails
+
+
+def is_valid_prefix(prefix) -> bool:
+    return isinstance(prefix, str) and len(prefix) <= 64 and all(c in HEX_DIGITS for c in prefix)
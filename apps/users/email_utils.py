@@ -3,10 +3,21 @@ Email utility module for sending HTML emails with fallback to plain text.
 Provides helper functions for sending verification, password reset, and other transactional emails.
 """
 
-from django.core.mail import EmailMultiAlternatives
+from django.core.mail import EmailMultiAlternatives, get_connection
 from django.template.loader import render_to_string
 from django.conf import settings
+from django.db import transaction
+from django.utils import timezone, translation
+from datetime import timedelta
+from functools import lru_cache
+import html
 import logging
+import random
+import re
+import threading
+import time
+
+from .outbox_utils import OutboxSender
 
 logger = logging.getLogger(__name__)
 
@@ -19,11 +30,16 @@ def send_html_email(
     plain_text_template=None,
     from_email=None,
     fail_silently=False,
-    tags=None
+    tags=None,
+    queue=None
 ):
     """
     Send an HTML email with optional plain text fallback.
     
+    By default (``EMAIL_OUTBOX_ENABLED``) the rendered message is stored in
+    the email outbox and delivered by the background sender, so the caller
+    doesn't wait on the SMTP server.
+    
     Args:
         subject (str): Email subject line
         recipient_list (list): List of recipient email addresses
@@ -33,6 +49,7 @@ def send_html_email(
         from_email (str, optional): Sender email address (defaults to DEFAULT_FROM_EMAIL)
         fail_silently (bool): Whether to suppress exceptions during sending
         tags (list, optional): Email tags for tracking (if using services like SendGrid)
+        queue (bool, optional): Queue instead of sending now (defaults to EMAIL_OUTBOX_ENABLED)
     
     Returns:
         tuple: (success: bool, error_message: str or None)
@@ -52,7 +69,8 @@ def send_html_email(
             return False, error_msg
         
         # Check if email authentication is configured (for Gmail/SMTP)
-        if not settings.EMAIL_HOST_USER or not settings.EMAIL_HOST_PASSWORD:
+        uses_smtp = settings.EMAIL_BACKEND == 'django.core.mail.backends.smtp.EmailBackend'
+        if uses_smtp and (not settings.EMAIL_HOST_USER or not settings.EMAIL_HOST_PASSWORD):
             error_msg = (
                 "Email configuration error: EMAIL_HOST_USER or EMAIL_HOST_PASSWORD not set. "
                 "Email functionality requires proper SMTP authentication credentials."
@@ -84,6 +102,13 @@ def send_html_email(
         if not text_content:
             text_content = _extract_text_from_html(html_content)
         
+        if queue is None:
+            queue = getattr(settings, 'EMAIL_OUTBOX_ENABLED', True)
+        if queue:
+            queue_email(subject, recipient_list, text_content, html_content, from_email, tags)
+            logger.info(f"HTML email '{subject}' queued for {recipient_list}")
+            return True, None
+        
         # Create email message
         msg = EmailMultiAlternatives(
             subject=subject,
@@ -113,6 +138,360 @@ def send_html_email(
         return False, str(e)
 
 
+def queue_email(subject, recipient_list, text_content, html_content=None, from_email=None, tags=None):
+    """
+    Store a rendered email in the outbox and wake the background sender once
+    the surrounding transaction commits.
+    
+    Returns:
+        EmailOutbox: The queued message
+    """
+    from .models import EmailOutbox
+    
+    entry = EmailOutbox.objects.create(
+        subject=subject,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(recipient_list),
+        text_body=text_content or '',
+        html_body=html_content or '',
+        tags=list(tags or []),
+        provider=_email_provider(recipient_list),
+    )
+    transaction.on_commit(wake_email_sender)
+    return entry
+
+
+def _email_provider(recipient_list):
+    """Mail domain of the first recipient, the key for per-provider rate limits"""
+    if not recipient_list:
+        return ''
+    return recipient_list[0].rsplit('@', 1)[-1].lower()
+
+
+class EmailRateLimiter:
+    """
+    Per-provider token buckets, configured in messages per minute by
+    ``EMAIL_OUTBOX_RATE_LIMITS`` (``'*'`` is the default for other providers).
+    """
+    
+    def __init__(self, limits=None):
+        self.limits = limits if limits is not None else getattr(settings, 'EMAIL_OUTBOX_RATE_LIMITS', {'*': 60})
+        self.buckets = {}
+        self.lock = threading.Lock()
+    
+    def _rate(self, provider):
+        per_minute = self.limits.get(provider, self.limits.get('*'))
+        return per_minute / 60 if per_minute else None
+    
+    def acquire(self, provider):
+        """
+        Take a token for ``provider``.
+        
+        Returns:
+            float: 0 if the message may be sent now, otherwise seconds until a token is free
+        """
+        rate = self._rate(provider)
+        if rate is None:
+            return 0
+        capacity = max(rate * 60, 1)
+        with self.lock:
+            now = time.monotonic()
+            tokens, updated = self.buckets.get(provider, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            if tokens >= 1:
+                self.buckets[provider] = (tokens - 1, now)
+                return 0
+            self.buckets[provider] = (tokens, now)
+            return (1 - tokens) / rate
+
+
+# Shared by the sender thread and the management command within a process.
+# Limits are per process, not shared between web processes or workers.
+rate_limiter = EmailRateLimiter()
+
+
+def _email_retry_delay(attempts):
+    base = getattr(settings, 'EMAIL_OUTBOX_BACKOFF_SECONDS', 60)
+    delay = min(base * 2 ** max(attempts - 1, 0), getattr(settings, 'EMAIL_OUTBOX_BACKOFF_MAX_SECONDS', 3600))
+    return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+
+def _claim_email_batch(batch_size, lease_seconds=300):
+    """Claim due messages, leasing them so concurrent senders skip them"""
+    from .models import EmailOutbox
+    
+    now = timezone.now()
+    with transaction.atomic():
+        entries = list(
+            EmailOutbox.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=EmailOutbox.Status.PENDING, next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        EmailOutbox.objects.filter(pk__in=[entry.pk for entry in entries]).update(
+            next_attempt_at=now + timedelta(seconds=lease_seconds)
+        )
+    return entries
+
+
+def _build_message(entry, connection):
+    msg = EmailMultiAlternatives(
+        subject=entry.subject,
+        body=entry.text_body,
+        from_email=entry.from_email,
+        to=entry.to,
+        connection=connection
+    )
+    if entry.html_body:
+        msg.attach_alternative(entry.html_body, "text/html")
+    if entry.tags:
+        msg.tags = entry.tags
+    return msg
+
+
+def send_queued_emails(batch_size=50, limiter=None):
+    """
+    Deliver one batch of queued emails over a single backend connection.
+    Failures are retried with exponential backoff until EMAIL_OUTBOX_MAX_ATTEMPTS;
+    messages over their provider's rate limit are deferred without using an attempt.
+    
+    Returns:
+        dict: Counts of sent, retried, failed and deferred messages
+    """
+    from .models import EmailOutbox
+    
+    limiter = limiter or rate_limiter
+    max_attempts = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 6)
+    counts = {'sent': 0, 'retried': 0, 'failed': 0, 'deferred': 0}
+    entries = _claim_email_batch(batch_size)
+    if not entries:
+        return counts
+    
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        # Leave the batch leased; it is retried once the lease expires
+        logger.error(f"Could not open email connection: {str(e)}")
+        return counts
+    
+    try:
+        for entry in entries:
+            now = timezone.now()
+            wait = limiter.acquire(entry.provider)
+            if wait:
+                entry.next_attempt_at = now + timedelta(seconds=wait)
+                counts['deferred'] += 1
+                continue
+            
+            entry.attempts += 1
+            try:
+                connection.send_messages([_build_message(entry, connection)])
+            except Exception as e:
+                entry.last_error = str(e)
+                if entry.attempts >= max_attempts:
+                    entry.status = EmailOutbox.Status.FAILED
+                    # Requeuing a failed message needs a fresh one-time link anyway
+                    entry.text_body = entry.html_body = ''
+                    counts['failed'] += 1
+                else:
+                    entry.next_attempt_at = now + _email_retry_delay(entry.attempts)
+                    counts['retried'] += 1
+                logger.error(f"Failed to send queued email '{entry.subject}' to {entry.to}: {str(e)}")
+                # Start over with a fresh connection in case this one broke
+                connection.close()
+                try:
+                    connection.open()
+                except Exception:
+                    pass
+                continue
+            
+            entry.status = EmailOutbox.Status.SENT
+            entry.sent_at = now
+            entry.last_error = ''
+            # Bodies may contain one-time links; don't keep them once delivered
+            entry.text_body = entry.html_body = ''
+            counts['sent'] += 1
+    finally:
+        connection.close()
+        EmailOutbox.objects.bulk_update(
+            entries, ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at', 'text_body', 'html_body']
+        )
+    
+    logger.info(f"Email outbox batch: {counts}")
+    return counts
+
+
+email_sender = OutboxSender(
+    'email-outbox-sender', send_queued_emails, lambda: getattr(settings, 'EMAIL_OUTBOX_POLL_SECONDS', 30)
+)
+
+
+def wake_email_sender():
+    """Deliver queued mail per EMAIL_OUTBOX_DELIVERY: wake the sender thread, send inline, or leave it to the worker"""
+    email_sender.deliver(getattr(settings, 'EMAIL_OUTBOX_DELIVERY', 'thread'))
+
+
+RECIPIENT_TOKEN_RE = re.compile(r'__recipient_(\w+?)__')
+
+
+class RecipientPlaceholders:
+    """
+    Stand-in for the per-recipient context of a batch email. ``{{ recipient.first_name }}``
+    renders as a placeholder token that is substituted for each message, so
+    the template itself is rendered only once per locale. Use the values
+    unfiltered; filters would apply to the token, not the value.
+    """
+    
+    def __getitem__(self, key):
+        return f'__recipient_{key}__'
+
+
+class CompiledEmailPart:
+    """Rendered text split around recipient placeholders for fast substitution"""
+    
+    def __init__(self, text):
+        # Even items are literal text, odd items are recipient keys
+        self.parts = RECIPIENT_TOKEN_RE.split(text)
+    
+    def render(self, values, escape=False):
+        out = []
+        for i, part in enumerate(self.parts):
+            if i % 2:
+                value = str(values.get(part, ''))
+                out.append(html.escape(value) if escape else value)
+            else:
+                out.append(part)
+        return ''.join(out)
+
+
+@lru_cache(maxsize=64)
+def _cached_text_from_html(html_content):
+    return _extract_text_from_html(html_content)
+
+
+def recipient_from_user(user, language=None, **extra):
+    """Batch email recipient dict for a user, with common substitution values"""
+    recipient = {
+        'email': user.email,
+        'username': user.username,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'full_name': user.get_full_name() or user.username,
+        'language': language,
+    }
+    recipient.update(extra)
+    return recipient
+
+
+def send_batch_email(
+    subject,
+    recipients,
+    template_name,
+    context=None,
+    plain_text_template=None,
+    from_email=None,
+    tags=None,
+    queue=None,
+    batch_size=100
+):
+    """
+    Send one templated email to many recipients.
+    
+    The templates are rendered once per locale with ``recipient`` bound to
+    placeholders (see RecipientPlaceholders), and the plain text derived from
+    the HTML is cached. Each recipient's values are then substituted into the
+    rendered output. Messages are queued in the outbox with one bulk insert,
+    or sent directly over a single connection with ``send_messages``.
+    
+    Args:
+        subject (str): Email subject line (lazy translations are evaluated per locale)
+        recipients (iterable): Dicts with ``email``, optional ``language`` and substitution values
+        template_name (str): Path to HTML email template
+        context (dict, optional): Context shared by all recipients
+        plain_text_template (str, optional): Path to plain text template
+        from_email (str, optional): Sender email address (defaults to DEFAULT_FROM_EMAIL)
+        tags (list, optional): Email tags for tracking
+        queue (bool, optional): Queue instead of sending now (defaults to EMAIL_OUTBOX_ENABLED)
+        batch_size (int): Messages per send_messages call when sending directly
+    
+    Returns:
+        tuple: (number of messages sent or queued: int, error_message: str or None)
+    """
+    from .models import EmailOutbox
+    
+    from_email = from_email or settings.DEFAULT_FROM_EMAIL
+    recipients = [recipient for recipient in recipients if recipient.get('email')]
+    if not recipients:
+        return 0, None
+    if queue is None:
+        queue = getattr(settings, 'EMAIL_OUTBOX_ENABLED', True)
+    
+    try:
+        by_language = {}
+        for recipient in recipients:
+            by_language.setdefault(recipient.get('language') or settings.LANGUAGE_CODE, []).append(recipient)
+        
+        messages = []
+        for language, group in by_language.items():
+            with translation.override(language):
+                render_context = dict(context or {}, recipient=RecipientPlaceholders())
+                html_content = render_to_string(template_name, render_context)
+                text_content = render_to_string(plain_text_template, render_context) if plain_text_template else None
+                localized_subject = str(subject)
+            html_part = CompiledEmailPart(html_content)
+            text_part = CompiledEmailPart(text_content or _cached_text_from_html(html_content))
+            for recipient in group:
+                messages.append((
+                    localized_subject,
+                    recipient['email'],
+                    text_part.render(recipient),
+                    html_part.render(recipient, escape=True),
+                ))
+        
+        if queue:
+            EmailOutbox.objects.bulk_create([
+                EmailOutbox(
+                    subject=message_subject,
+                    from_email=from_email,
+                    to=[email],
+                    text_body=text_body,
+                    html_body=html_body,
+                    tags=list(tags or []),
+                    provider=_email_provider([email]),
+                )
+                for message_subject, email, text_body, html_body in messages
+            ], batch_size=500)
+            transaction.on_commit(wake_email_sender)
+            logger.info(f"Batch email '{subject}' queued for {len(messages)} recipients")
+            return len(messages), None
+        
+        # Open explicitly so every batch reuses the same connection
+        connection = get_connection(fail_silently=False)
+        connection.open()
+        sent = 0
+        try:
+            for start in range(0, len(messages), batch_size):
+                batch = []
+                for message_subject, email, text_body, html_body in messages[start:start + batch_size]:
+                    msg = EmailMultiAlternatives(subject=message_subject, body=text_body, from_email=from_email,
+                                                 to=[email], connection=connection)
+                    msg.attach_alternative(html_body, "text/html")
+                    if tags:
+                        msg.tags = tags
+                    batch.append(msg)
+                sent += connection.send_messages(batch) or 0
+        finally:
+            connection.close()
+        logger.info(f"Batch email '{subject}' sent to {sent} recipients")
+        return sent, None
+    
+    except Exception as e:
+        error_msg = f"Failed to send batch email '{subject}': {str(e)}"
+        logger.error(error_msg)
+        return 0, str(e)
+
+
 def _extract_text_from_html(html_content):
     """
     Extract plain text from HTML content for email fallback.
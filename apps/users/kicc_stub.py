@@ -0,0 +1,140 @@
+"""
+In-memory stand-in for the KICC sync API, for load testing and local
+development of the GDA-KICC user sync without a KICC deployment
+"""
+import json
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+from .digest_utils import EmailDigestIndex
+
+logger = logging.getLogger(__name__)
+
+SYNC_PREFIX = '/api/accounts/sync/'
+
+
+class KICCStubServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server implementing KICC's sync endpoints over an in-memory
+    user store. ``latency`` (seconds) and ``failure_rate`` (0-1, answered with
+    503) simulate a slow or flaky KICC.
+    """
+    daemon_threads = True
+
+    def __init__(self, address, api_key: str, latency: float = 0.0, failure_rate: float = 0.0):
+        super().__init__(address, KICCStubHandler)
+        self.api_key = api_key
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.users: Dict[str, Dict] = {}
+        self.idempotency_keys = set()
+        self.request_count = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def create_user(self, user_data: Dict) -> Dict:
+        email = (user_data.get('email') or '').strip().lower()
+        if not email:
+            return {'email': user_data.get('email'), 'status': 'error', 'error': 'Email is required'}
+        with self.lock:
+            key = user_data.get('idempotency_key')
+            if email in self.users or (key and key in self.idempotency_keys):
+                return {'email': user_data['email'], 'status': 'exists'}
+            self.users[email] = user_data
+            if key:
+                self.idempotency_keys.add(key)
+        return {'email': user_data['email'], 'status': 'created'}
+
+
+class KICCStubHandler(BaseHTTPRequestHandler):
+    server: KICCStubServer
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real deployment
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+    def send_json(self, status: int, data: Optional[Dict] = None):
+        body = json.dumps(data or {}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_json(self) -> Dict:
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            return json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            return {}
+
+    def prepare(self) -> Optional[str]:
+        """Apply auth, latency and failure simulation; return the endpoint name or None if answered"""
+        with self.server.lock:
+            self.server.request_count += 1
+        url = urlparse(self.path)
+        if not url.path.startswith(SYNC_PREFIX):
+            self.send_json(404, {'error': 'Not found'})
+            return None
+        if self.headers.get('X-Sync-API-Key') != self.server.api_key:
+            self.send_json(401, {'error': 'Invalid sync API key'})
+            return None
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if self.server.failure_rate and random.random() < self.server.failure_rate:
+            self.send_json(503, {'error': 'Simulated failure'})
+            return None
+        return url.path[len(SYNC_PREFIX):].strip('/')
+
+    def do_GET(self):
+        endpoint = self.prepare()
+        if endpoint == 'check-user':
+            email = parse_qs(urlparse(self.path).query).get('email', [''])[0]
+            self.send_json(200, {'exists': email.strip().lower() in self.server.users, 'email': email})
+        elif endpoint == 'health':
+            self.send_json(200, {'status': 'healthy', 'service': 'KICC Sync Stub'})
+        elif endpoint is not None:
+            self.send_json(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        endpoint = self.prepare()
+        if endpoint is None:
+            return
+        data = self.read_json()
+        if endpoint == 'create-user':
+            data.setdefault('idempotency_key', self.headers.get('Idempotency-Key'))
+            result = self.server.create_user(data)
+            status = {'created': 201, 'exists': 409}.get(result['status'], 400)
+            self.send_json(status, result)
+        elif endpoint == 'create-users':
+            self.send_json(200, {'results': [self.server.create_user(user) for user in data.get('users', [])]})
+        elif endpoint in ('digest', 'bucket-users'):
+            with self.server.lock:
+                index = EmailDigestIndex(list(self.server.users))
+            prefixes = data.get('prefixes', [])
+            if endpoint == 'digest':
+                self.send_json(200, {'digests': index.digests(prefixes)})
+            else:
+                self.send_json(200, {'users': [self.server.users[email] for email in index.emails(prefixes)]})
+        elif endpoint == 'check-users':
+            emails = data.get('emails', [])
+            self.send_json(200, {'results': {email: email.strip().lower() in self.server.users for email in emails}})
+        else:
+            self.send_json(404, {'error': 'Not found'})
+
+
+def start_stub_server(host: str = '127.0.0.1', port: int = 0, api_key: str = 'gda-kicc-sync-key-2024-secure',
+                      latency: float = 0.0, failure_rate: float = 0.0) -> KICCStubServer:
+    """Start a stub server on a background thread; call ``shutdown()`` to stop it"""
+    server = KICCStubServer((host, port), api_key, latency, failure_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
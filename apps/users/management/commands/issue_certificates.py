@@ -0,0 +1,45 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from apps.content.models import Project
+from apps.users.certificate_utils import issue_certificates
+
+
+class Command(BaseCommand):
+    help = 'Issue certificates to the enrolled users of ended projects; safe to re-run, e.g. from cron'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'project_ids',
+            nargs='*',
+            type=int,
+            help='Primary keys of the projects to issue for (defaults to every ended project)',
+        )
+        parser.add_argument(
+            '--notify',
+            action='store_true',
+            help='Email the new certificate holders',
+        )
+        parser.add_argument(
+            '--domain',
+            help='Domain for links in the email (defaults to the first ALLOWED_HOSTS entry)',
+        )
+        parser.add_argument(
+            '--protocol',
+            default='https',
+            help='Protocol for links in the email',
+        )
+
+    def handle(self, *args, **options):
+        projects = Project.objects.filter(end_date__lte=date.today()).defer('cover_image_blob')
+        if options['project_ids']:
+            projects = projects.filter(pk__in=options['project_ids'])
+        total = 0
+        for project in projects:
+            issued = issue_certificates(
+                project, notify=options['notify'], protocol=options['protocol'], domain=options['domain'],
+            )
+            if issued:
+                self.stdout.write(f'{project.title}: {len(issued)} certificate(s)')
+            total += len(issued)
+        self.stdout.write(self.style.SUCCESS(f'Issued {total} certificate(s)'))
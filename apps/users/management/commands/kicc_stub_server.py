@@ -0,0 +1,32 @@
+import os
+
+from django.core.management.base import BaseCommand
+from apps.users.kicc_stub import KICCStubServer
+
+
+class Command(BaseCommand):
+    help = 'Run an in-memory stand-in for the KICC sync API (for load testing the user sync)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1', help='Interface to listen on')
+        parser.add_argument('--port', type=int, default=8765, help='Port to listen on')
+        parser.add_argument('--latency-ms', type=int, default=0, help='Delay added to every request')
+        parser.add_argument('--failure-rate', type=float, default=0.0, help='Fraction of requests answered with 503')
+
+    def handle(self, *args, **options):
+        server = KICCStubServer(
+            (options['host'], options['port']),
+            api_key=os.getenv('KICC_API_KEY', 'gda-kicc-sync-key-2024-secure'),
+            latency=options['latency_ms'] / 1000,
+            failure_rate=options['failure_rate'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'KICC stub listening on {server.base_url}; set KICC_API_BASE_URL={server.base_url} to use it'
+        ))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(f'Stopped after {server.request_count} requests, {len(server.users)} users stored')
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+from apps.users.sync_utils import UserSyncManager, process_sync_outbox
+
+
+class Command(BaseCommand):
+    help = 'Deliver pending user syncs from the KICC sync outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Number of outbox entries to claim per batch',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep draining the outbox until interrupted',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=10,
+            help='Seconds to wait between polls when the outbox is empty (with --loop)',
+        )
+
+    def handle(self, *args, **options):
+        sync_manager = UserSyncManager()
+        if not sync_manager.is_sync_enabled():
+            self.stdout.write(self.style.WARNING('User sync is disabled; nothing to do'))
+            return
+
+        try:
+            while True:
+                counts = process_sync_outbox(options['batch_size'], sync_manager)
+                if any(counts.values()):
+                    self.stdout.write(self.style.SUCCESS(
+                        f"Sent {counts['sent']}, rescheduled {counts['retried']}, failed {counts['failed']}"
+                    ))
+                if not options['loop']:
+                    break
+                # Drain full batches back to back, poll when idle
+                if sum(counts.values()) < options['batch_size']:
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Stopped')
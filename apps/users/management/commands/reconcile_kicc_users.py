@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.users.sync_utils import UserSyncManager, reconcile_with_kicc
+
+
+class Command(BaseCommand):
+    help = 'Detect and repair drift between the GDA and KICC user sets using range-hash digests'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report the users missing on either side',
+        )
+        parser.add_argument(
+            '--leaf-size',
+            type=int,
+            default=32,
+            help='Fetch a differing bucket once it holds at most this many users',
+        )
+        parser.add_argument(
+            '--max-depth',
+            type=int,
+            default=6,
+            help='Maximum hash prefix length to split buckets down to',
+        )
+
+    def handle(self, *args, **options):
+        sync_manager = UserSyncManager()
+        if not sync_manager.is_sync_enabled():
+            self.stdout.write(self.style.WARNING('User sync is disabled; nothing to do'))
+            return
+
+        report = reconcile_with_kicc(
+            sync_manager, leaf_size=options['leaf_size'], max_depth=options['max_depth'], dry_run=options['dry_run'],
+        )
+        if not report['success']:
+            raise CommandError('Reconciliation aborted: KICC sync API request failed')
+
+        self.stdout.write(
+            f"Compared {report['buckets_compared']} buckets in {report['rounds']} rounds, "
+            f"fetched {report['buckets_fetched']}"
+        )
+        for email in report['missing_in_kicc']:
+            self.stdout.write(f'Missing in KICC: {email}')
+        for email in report['missing_in_gda']:
+            self.stdout.write(f'Missing in GDA: {email}')
+
+        if options['dry_run']:
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"Queued {report['queued']} user(s) for KICC, created {report['created']} user(s) in GDA"
+        ))
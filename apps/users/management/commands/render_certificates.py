@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from apps.users.certificate_document_utils import prerender_certificates
+
+
+class Command(BaseCommand):
+    help = 'Render missing certificate PDF/PNG documents; run as a worker or from cron when CERTIFICATE_RENDER_INPROCESS is off'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'certificate_ids',
+            nargs='*',
+            help='Certificate ids to render (defaults to every certificate)',
+        )
+
+    def handle(self, *args, **options):
+        written = prerender_certificates(options['certificate_ids'] or None)
+        self.stdout.write(self.style.SUCCESS(f'Rendered {written} certificate document(s)'))
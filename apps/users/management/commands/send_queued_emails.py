@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+from apps.users.email_utils import send_queued_emails
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued emails from the email outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Number of messages to send per connection',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep draining the outbox until interrupted',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Seconds to wait between polls when the outbox is empty (with --loop)',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            while True:
+                counts = send_queued_emails(options['batch_size'])
+                if any(counts.values()):
+                    self.stdout.write(self.style.SUCCESS(
+                        f"Sent {counts['sent']}, rescheduled {counts['retried']}, "
+                        f"failed {counts['failed']}, rate-limited {counts['deferred']}"
+                    ))
+                if not options['loop']:
+                    break
+                if sum(counts.values()) < options['batch_size']:
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Stopped')
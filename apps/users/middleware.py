@@ -1,6 +1,10 @@
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
 from django.shortcuts import redirect
 from django.urls import reverse
+from django.utils.functional import SimpleLazyObject, cached_property
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
@@ -8,65 +12,77 @@ logger = logging.getLogger(__name__)
 from django.contrib.auth import logout
 from django.contrib import messages
 
+from .cache_utils import get_cached_user
+
+
+# Session copy of CustomUser.needs_onboarding, so most requests don't read the user row
+ONBOARDING_SESSION_KEY = '_needs_onboarding'
+
+
+def remember_onboarding_state(request, user):
+    """Store the user's current onboarding state in the session; call after saving profile changes."""
+    request.session[ONBOARDING_SESSION_KEY] = user.needs_onboarding
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """
+    ``AuthenticationMiddleware`` that loads ``request.user`` through the
+    per-process user cache (see ``cache_utils``).
+    """
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_cached_user(request))
+
 
 class OnboardingMiddleware:
     """
     Middleware to redirect users to onboarding if they haven't completed it.
     If a user has started onboarding but navigates away, they will be logged out.
+
+    Static, media, blob and API requests (``ONBOARDING_BYPASS_PATHS``) pass
+    straight through without loading the session or the user.
     """
 
     def __init__(self, get_response):
         self.get_response = get_response
+        self.bypass_paths = tuple(getattr(
+            settings, 'ONBOARDING_BYPASS_PATHS',
+            ('/static/', '/media/', '/blob/', '/api/', '/api-auth/', '/health/'),
+        ))
+
+    @cached_property
+    def is_excluded_path(self):
+        # Resolved on the first request rather than at startup, once the URLconf is importable
+        prefixes = (reverse('onboarding'), reverse('account_logout'), reverse('login'), '/admin/') + self.bypass_paths
+        return re.compile('|'.join(re.escape(prefix) for prefix in prefixes)).match
 
     def __call__(self, request):
-        # List of paths that should be excluded from the onboarding check
-        excluded_paths = [
-            reverse('onboarding'),
-            reverse('account_logout'),
-            reverse('login'),
-        ]
-        
-        # Check if user is authenticated
-        if request.user.is_authenticated:
-            # Check if user needs onboarding
+        if self.is_excluded_path(request.path):
+            return self.get_response(request)
+
+        needs_onboarding = request.session.get(ONBOARDING_SESSION_KEY)
+        if needs_onboarding is None and request.user.is_authenticated:
+            needs_onboarding = request.user.needs_onboarding
+            request.session[ONBOARDING_SESSION_KEY] = needs_onboarding
+
+        if needs_onboarding:
             user = request.user
-            needs_onboarding = (
-                not getattr(user, 'onboarding_complete', False) or
-                not user.date_of_birth or
-                not user.guardian_name or
-                not user.guardian_relation or
-                not user.address or
-                not user.contact or
-                not user.country_code
-            )
-
-            # Check if the current path should be excluded
-            is_excluded_path = any(
-                request.path.startswith(path) for path in excluded_paths
-            ) or request.path.startswith(
-                '/admin/'
-            ) or request.path.startswith(
-                '/static/'
-            ) or request.path.startswith(
-                '/media/'
-            )
-
-            if needs_onboarding and not is_excluded_path:
-                # If user has visited onboarding but tries to navigate away, log them out
-                if request.session.get('onboarding_visited', False):
-                    logger.warning(
-                        f"User {user.username} navigated away from onboarding. Logging out."
-                    )
-                    logout(request)
-                    messages.warning(
-                        request,
-                        "You must complete your profile to continue. Please log in again to complete the onboarding process."
-                    )
-                    return redirect('login')
-                
-                # If user needs onboarding and hasn't visited yet, redirect them
-                logger.info(f"Redirecting {user.username} to onboarding from {request.path}")
-                return redirect('onboarding')
+            # If user has visited onboarding but tries to navigate away, log them out
+            if request.session.get('onboarding_visited', False):
+                logger.warning(
+                    f"User {user.username} navigated away from onboarding. Logging out."
+                )
+                logout(request)
+                messages.warning(
+                    request,
+                    "You must complete your profile to continue. Please log in again to complete the onboarding process."
+                )
+                return redirect('login')
+
+            # If user needs onboarding and hasn't visited yet, redirect them
+            logger.info(f"Redirecting {user.username} to onboarding from {request.path}")
+            return redirect('onboarding')
 
         response = self.get_response(request)
-        return response
\ No newline at end of file
+        return response
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-19 12:41
+
+from django.db import migrations, models
+
+
+def backfill_needs_onboarding(apps, schema_editor):
+    """Clear the flag for users who already completed onboarding with every required field filled."""
+    CustomUser = apps.get_model('users', 'CustomUser')
+    CustomUser.objects.filter(onboarding_complete=True, date_of_birth__isnull=False).exclude(
+        models.Q(guardian_name='') | models.Q(guardian_relation='') | models.Q(address='')
+        | models.Q(contact='') | models.Q(country_code='')
+    ).update(needs_onboarding=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_emailoutbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='needs_onboarding',
+            field=models.BooleanField(default=True, editable=False),
+        ),
+        migrations.RunPython(backfill_needs_onboarding, migrations.RunPython.noop),
+    ]
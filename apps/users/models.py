@@ -1,5 +1,10 @@
+import uuid
+from datetime import date
+
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.db.models.functions import Lower
+from django.utils import timezone
 from .country_choices import COUNTRY_CHOICES
 
 # Create your models here.
@@ -31,10 +36,35 @@ class CustomUser(AbstractUser):
     # Track if onboarding is complete
     onboarding_complete = models.BooleanField(default=False)
     email_verified = models.BooleanField(default=False)
+    # Derived from the fields above on every save; read by OnboardingMiddleware
+    needs_onboarding = models.BooleanField(default=True, editable=False)
+
+    ONBOARDING_REQUIRED_FIELDS = (
+        'date_of_birth', 'guardian_name', 'guardian_relation', 'address', 'contact', 'country_code',
+    )
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Case-insensitive email lookups (sync existence checks)
+            models.Index(Lower('email'), name='users_email_lower_idx'),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.email})"
 
+    def compute_needs_onboarding(self):
+        """True if onboarding isn't complete or any required profile field is empty."""
+        return not self.onboarding_complete or not all(
+            getattr(self, name) for name in self.ONBOARDING_REQUIRED_FIELDS
+        )
+
+    def save(self, *args, **kwargs):
+        self.needs_onboarding = self.compute_needs_onboarding()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'needs_onboarding'}
+        super().save(*args, **kwargs)
+
 
 class Certificate(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='certificates')
@@ -46,19 +76,90 @@ class Certificate(models.Model):
         unique_together = ('user', 'project')
         ordering = ['-issued_at']
 
+    @staticmethod
+    def make_certificate_id(project=None):
+        """Format: GDA{YEAR}-{UUID_SEGMENT}, using the project end year if available"""
+        year = date.today().year
+        if project and project.end_date:
+            year = project.end_date.year
+        return f"GDA{year}-{str(uuid.uuid4()).split('-')[0].upper()}"
+
     def save(self, *args, **kwargs):
         if not self.certificate_id:
-            import uuid
-            from datetime import date
-            
-            # Use project end year if available, otherwise current year
-            year = date.today().year
-            if self.project and self.project.end_date:
-                year = self.project.end_date.year
-            
-            # Format: GDA{YEAR}-{UUID_SEGMENT}
-            self.certificate_id = f"GDA{year}-{str(uuid.uuid4()).split('-')[0].upper()}"
+            self.certificate_id = self.make_certificate_id(self.project)
         super().save(*args, **kwargs)
 
     def __str__(self):
         return f"Certificate: {self.user.get_full_name()} - {self.project.title}"
+
+
+class UserSyncOutbox(models.Model):
+    """
+    Pending KICC sync for a user, written in the same transaction as the user
+    and delivered by the ``process_user_sync_outbox`` worker.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', 'Pending'
+        SENT = 'SENT', 'Sent'
+        FAILED = 'FAILED', 'Failed'
+
+    user = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, blank=True, related_name='sync_outbox')
+    idempotency_key = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    event = models.CharField(max_length=30, default='create_user')
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = 'KICC Sync Outbox Entry'
+        verbose_name_plural = 'KICC Sync Outbox'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.event} {self.payload.get('email', '')} ({self.status})"
+
+
+class EmailOutbox(models.Model):
+    """
+    Rendered email waiting for delivery by the background sender
+    (see email_utils.send_queued_emails).
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', 'Pending'
+        SENT = 'SENT', 'Sent'
+        FAILED = 'FAILED', 'Failed'
+
+    subject = models.CharField(max_length=255)
+    from_email = models.CharField(max_length=255)
+    to = models.JSONField(default=list)
+    text_body = models.TextField(blank=True)
+    html_body = models.TextField(blank=True)
+    tags = models.JSONField(default=list, blank=True)
+    # Recipient mail domain, used for per-provider rate limiting
+    provider = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = 'Queued Email'
+        verbose_name_plural = 'Email Outbox'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.status})"
@@ -0,0 +1,76 @@
+"""
+Background delivery shared by the email and KICC sync outboxes.
+
+An outbox row is written in the transaction that produces it. After the
+transaction commits, the outbox is drained one of three ways, chosen per
+outbox in settings:
+
+- ``thread``: a daemon thread in the web process, woken on commit and polling
+  for retries. Needs a long-running server (gunicorn, runserver).
+- ``inline``: drained in the request right after the commit. For serverless
+  platforms (e.g. Vercel), where the process is frozen once the response is sent.
+- ``worker``: left to a ``manage.py ... --loop`` worker (see docker-compose.yml).
+"""
+import logging
+import threading
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+DELIVERY_MODES = ('thread', 'inline', 'worker')
+
+
+class OutboxSenderThread(threading.Thread):
+    """
+    Daemon thread that calls ``drain`` whenever it is woken and otherwise
+    every ``interval`` seconds, until a pass delivers nothing.
+    ``drain`` returns a dict of counts, like ``send_queued_emails``.
+    """
+
+    def __init__(self, name, drain, interval):
+        super().__init__(name=name, daemon=True)
+        self.drain = drain
+        self.interval = interval
+        self.wakeup = threading.Event()
+
+    def run(self):
+        while True:
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
+            try:
+                while sum(self.drain().values()):
+                    pass
+            except Exception as e:
+                logger.error(f"{self.name} error: {str(e)}")
+            finally:
+                close_old_connections()
+
+
+class OutboxSender:
+    """Starts its sender thread on the first wake-up and signals it afterwards"""
+
+    def __init__(self, name, drain, interval):
+        self.name = name
+        self.drain = drain
+        self.interval = interval
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def wake(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = OutboxSenderThread(self.name, self.drain, self.interval())
+                self._thread.start()
+        self._thread.wakeup.set()
+
+    def deliver(self, mode):
+        """Deliver after a commit according to ``mode`` (one of DELIVERY_MODES)"""
+        if mode == 'thread':
+            self.wake()
+        elif mode == 'inline':
+            try:
+                self.drain()
+            except Exception as e:
+                # The rows stay PENDING for the next drain
+                logger.error(f"{self.name} inline delivery failed: {str(e)}")
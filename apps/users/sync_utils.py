@@ -2,15 +2,52 @@
 User synchronization utilities for GDA-KICC integration
 """
 import os
+import random
+import threading
+import uuid
 import requests
 import logging
+from requests.adapters import HTTPAdapter
+from datetime import timedelta
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from typing import Dict, Optional, Tuple, Any
+from django.core.cache import cache
+from django.db import transaction
+from django.contrib.auth.hashers import make_password
+from django.db.models import Count, F, Max
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.db.models.functions import Lower
+from django.utils import timezone
+from typing import Dict, List, Optional, Tuple, Any
+from .digest_utils import EmailDigestIndex, child_prefixes, email_hash
+from .models import UserSyncOutbox
+from .outbox_utils import OutboxSender
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_sync_session() -> requests.Session:
+    """
+    Process-wide pooled session for KICC requests, so repeated syncs reuse
+    keep-alive connections instead of opening a new one per call
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                pool_size = int(os.getenv('KICC_SYNC_POOL_SIZE', '10'))
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
 
 class UserSyncManager:
     """Handles user synchronization between GDA and KICC"""
@@ -19,6 +56,13 @@ class UserSyncManager:
         self.kicc_api_base = os.getenv('KICC_API_BASE_URL', 'https://kicc-backend-2nig.onrender.com')
         self.kicc_api_key = os.getenv('KICC_API_KEY', 'gda-kicc-sync-key-2024-secure')
         self.sync_enabled = os.getenv('ENABLE_USER_SYNC', 'True') == 'True'
+        self.max_attempts = int(os.getenv('KICC_SYNC_MAX_ATTEMPTS', '8'))
+        self.backoff_seconds = int(os.getenv('KICC_SYNC_BACKOFF_SECONDS', '30'))
+        self.backoff_max_seconds = int(os.getenv('KICC_SYNC_BACKOFF_MAX_SECONDS', '21600'))
+        self.batch_size = int(os.getenv('KICC_SYNC_BATCH_SIZE', '100'))
+        # Set to False after KICC answers 404/405 on a batch endpoint
+        self.batch_supported = True
+        self.session = get_sync_session()
         
     def is_sync_enabled(self) -> bool:
         """Check if user sync is enabled"""
@@ -37,38 +81,39 @@ class UserSyncManager:
         Sync user from GDA to KICC
         Returns: (success: bool, error_message: Optional[str])
         """
+        return self.send_user_payload(build_user_payload(user))
+
+    def send_user_payload(self, user_data: Dict, idempotency_key: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+        """
+        Send prepared user data to KICC
+        Returns: (success: bool, error_message: Optional[str])
+        """
         if not self.is_sync_enabled():
             logger.info("User sync is disabled")
             return True, None
-        
+
+        email = user_data.get('email')
         try:
-            # Prepare user data for KICC
-            user_data = {
-                'email': user.email,
-                'username': user.username,
-                'first_name': user.first_name,
-                'last_name': user.last_name,
-                'phone': user.contact,
-                'date_of_birth': user.date_of_birth.isoformat() if user.date_of_birth else None,
-                'membership_type': 'GENERAL',  # Default membership for KICC
-                'source_platform': 'GDA'
-            }
-            
+            headers = self.get_sync_headers()
+            if idempotency_key:
+                # Lets KICC discard a retry of a request it already applied
+                headers['Idempotency-Key'] = str(idempotency_key)
+
             # Make API request to KICC
             url = f"{self.kicc_api_base}/api/accounts/sync/create-user/"
-            response = requests.post(
+            response = self.session.post(
                 url,
                 json=user_data,
-                headers=self.get_sync_headers(),
+                headers=headers,
                 timeout=10
             )
             
             if response.status_code == 201:
-                logger.info(f"Successfully synced user {user.email} to KICC")
+                logger.info(f"Successfully synced user {email} to KICC")
                 return True, None
             elif response.status_code == 409:
                 # User already exists in KICC
-                logger.info(f"User {user.email} already exists in KICC")
+                logger.info(f"User {email} already exists in KICC")
                 return True, None
             else:
                 error_msg = f"KICC sync failed with status {response.status_code}: {response.text}"
@@ -83,6 +128,113 @@ class UserSyncManager:
             error_msg = f"Unexpected error during KICC sync: {str(e)}"
             logger.error(error_msg)
             return False, error_msg
+
+    def send_user_payloads(self, items: List[Tuple[Dict, Optional[str]]]) -> List[Tuple[bool, Optional[str]]]:
+        """
+        Send several prepared users (payload, idempotency key) to KICC using
+        sync/create-users/, one request per ``batch_size`` users
+        Returns one (success, error_message) per item, in order
+        """
+        if not self.is_sync_enabled():
+            return [(True, None)] * len(items)
+
+        results = []
+        for start in range(0, len(items), self.batch_size):
+            results.extend(self._send_user_batch(items[start:start + self.batch_size]))
+        return results
+
+    def _send_user_batch(self, items: List[Tuple[Dict, Optional[str]]]) -> List[Tuple[bool, Optional[str]]]:
+        if not self.batch_supported:
+            return [self.send_user_payload(user_data, key) for user_data, key in items]
+
+        users = [dict(user_data, idempotency_key=str(key)) if key else user_data for user_data, key in items]
+        try:
+            url = f"{self.kicc_api_base}/api/accounts/sync/create-users/"
+            response = self.session.post(
+                url,
+                json={'users': users},
+                headers=self.get_sync_headers(),
+                timeout=30
+            )
+        except requests.exceptions.RequestException as e:
+            error_msg = f"Network error during KICC batch sync: {str(e)}"
+            logger.error(error_msg)
+            return [(False, error_msg)] * len(items)
+
+        if response.status_code in (404, 405):
+            # Older KICC deployments only have the single-user endpoint
+            logger.info("KICC has no batch create endpoint, syncing users one by one")
+            self.batch_supported = False
+            return [self.send_user_payload(user_data, key) for user_data, key in items]
+
+        if response.status_code != 200:
+            error_msg = f"KICC batch sync failed with status {response.status_code}: {response.text}"
+            logger.error(error_msg)
+            return [(False, error_msg)] * len(items)
+
+        try:
+            item_results = response.json()['results']
+        except (ValueError, KeyError, TypeError):
+            item_results = None
+        if not isinstance(item_results, list) or len(item_results) != len(items):
+            error_msg = "KICC batch sync returned an unexpected response"
+            logger.error(error_msg)
+            return [(False, error_msg)] * len(items)
+
+        results = []
+        for (user_data, key), item_result in zip(items, item_results):
+            if item_result.get('status') in ('created', 'exists'):
+                results.append((True, None))
+            else:
+                results.append((False, item_result.get('error') or f"KICC rejected user {user_data.get('email')}"))
+        return results
+
+    def _post_sync_batches(self, endpoint: str, prefixes: List[str], key: str) -> Tuple[Any, bool]:
+        """POST prefixes to a reconciliation endpoint in chunks, merging the ``key`` parts of the responses"""
+        merged = None
+        url = f"{self.kicc_api_base}/api/accounts/sync/{endpoint}/"
+        for start in range(0, len(prefixes), self.batch_size):
+            try:
+                response = self.session.post(
+                    url,
+                    json={'prefixes': prefixes[start:start + self.batch_size]},
+                    headers=self.get_sync_headers(),
+                    timeout=30
+                )
+                if response.status_code != 200:
+                    logger.error(f"KICC {endpoint} request failed: {response.status_code}")
+                    return merged, False
+                part = response.json()[key]
+            except Exception as e:
+                logger.error(f"Error calling KICC {endpoint}: {str(e)}")
+                return merged, False
+            if merged is None:
+                merged = part
+            elif isinstance(merged, dict):
+                merged.update(part)
+            else:
+                merged.extend(part)
+        return merged if merged is not None else {}, True
+
+    def fetch_digests(self, prefixes: List[str]) -> Tuple[Dict[str, Dict], bool]:
+        """
+        Get KICC's range-hash digests for the given email hash prefixes
+        Returns: (digests by prefix, sync_success: bool)
+        """
+        return self._post_sync_batches('digest', prefixes, 'digests')
+
+    def fetch_bucket_users(self, prefixes: List[str]) -> Tuple[List[Dict], bool]:
+        """
+        Get KICC's users whose email hash falls in the given buckets
+        Returns: (user payloads, sync_success: bool)
+        """
+        users, success = self._post_sync_batches('bucket-users', prefixes, 'users')
+        return users or [], success
+
+    def retry_delay(self, attempts: int) -> timedelta:
+        """Exponential backoff with jitter for the given number of failed attempts"""
+        delay = min(self.backoff_seconds * 2 ** max(attempts - 1, 0), self.backoff_max_seconds)
+        return timedelta(seconds=delay * random.uniform(0.5, 1.0))
     
     def check_user_exists_in_kicc(self, email: str) -> Tuple[bool, bool]:
         """
@@ -94,7 +246,7 @@ class UserSyncManager:
         
         try:
             url = f"{self.kicc_api_base}/api/accounts/sync/check-user/"
-            response = requests.get(
+            response = self.session.get(
                 url,
                 params={'email': email},
                 headers=self.get_sync_headers(),
@@ -112,11 +264,67 @@ class UserSyncManager:
             logger.error(f"Error checking user in KICC: {str(e)}")
             return False, False
 
+    def check_users_exist_in_kicc(self, emails: List[str]) -> Tuple[Dict[str, bool], bool]:
+        """
+        Check which of the given emails exist in KICC using sync/check-users/,
+        one request per ``batch_size`` emails
+        Returns: (exists by email: Dict[str, bool], sync_success: bool)
+        """
+        if not self.is_sync_enabled():
+            return {email: False for email in emails}, True
+
+        existing = {}
+        for start in range(0, len(emails), self.batch_size):
+            chunk = emails[start:start + self.batch_size]
+            if not self.batch_supported:
+                for email in chunk:
+                    exists, success = self.check_user_exists_in_kicc(email)
+                    if not success:
+                        return existing, False
+                    existing[email] = exists
+                continue
+
+            try:
+                url = f"{self.kicc_api_base}/api/accounts/sync/check-users/"
+                response = self.session.post(
+                    url,
+                    json={'emails': chunk},
+                    headers=self.get_sync_headers(),
+                    timeout=30
+                )
+                if response.status_code in (404, 405):
+                    logger.info("KICC has no batch check endpoint, checking users one by one")
+                    self.batch_supported = False
+                    return self.check_users_exist_in_kicc(emails)
+                if response.status_code != 200:
+                    logger.error(f"Failed to check users in KICC: {response.status_code}")
+                    return existing, False
+                results = response.json()['results']
+                existing.update({email: bool(results.get(email, False)) for email in chunk})
+            except Exception as e:
+                logger.error(f"Error checking users in KICC: {str(e)}")
+                return existing, False
+        return existing, True
+
+
+def build_user_payload(user: Any) -> Dict:
+    """Prepare user data for KICC"""
+    return {
+        'email': user.email,
+        'username': user.username,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'phone': user.contact,
+        'date_of_birth': user.date_of_birth.isoformat() if user.date_of_birth else None,
+        'membership_type': 'GENERAL',  # Default membership for KICC
+        'source_platform': 'GDA'
+    }
+
 
 def sync_user_after_registration(user: Any) -> None:
     """
     Sync user to KICC after successful registration in GDA
-    This function is called from user registration flow
+    Blocks on the KICC request; registration uses enqueue_user_sync instead
     """
     if not user or not user.email:
         return
@@ -130,6 +338,118 @@ def sync_user_after_registration(user: Any) -> None:
         # We don't want to break the user experience
 
 
+def enqueue_user_sync(user: Any) -> Optional[UserSyncOutbox]:
+    """
+    Record a pending KICC sync for the user in the outbox, delivered per
+    USER_SYNC_DELIVERY once the transaction commits.
+    Call inside the transaction that creates the user so the two commit together.
+    """
+    if not user or not user.email or not UserSyncManager().is_sync_enabled():
+        return None
+    entry = UserSyncOutbox.objects.create(user=user, payload=build_user_payload(user))
+    transaction.on_commit(deliver_user_syncs)
+    return entry
+
+
+def claim_sync_batch(batch_size: int = 50, lease_seconds: int = 300) -> List[UserSyncOutbox]:
+    """
+    Claim up to ``batch_size`` due outbox entries.
+
+    Claimed entries are pushed ``lease_seconds`` into the future, so another
+    worker skips them while they are in flight and a crashed worker's entries
+    are picked up again after the lease expires.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        entries = list(
+            UserSyncOutbox.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=UserSyncOutbox.Status.PENDING, next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        UserSyncOutbox.objects.filter(pk__in=[entry.pk for entry in entries]).update(
+            attempts=F('attempts') + 1,
+            next_attempt_at=now + timedelta(seconds=lease_seconds),
+        )
+    for entry in entries:
+        entry.attempts += 1
+    return entries
+
+
+def process_sync_outbox(batch_size: int = 50, sync_manager: Optional[UserSyncManager] = None) -> Dict[str, int]:
+    """
+    Deliver one batch of pending KICC syncs.
+    Failed entries are rescheduled with exponential backoff and marked FAILED
+    once they reach the maximum number of attempts.
+    Returns counts of sent, retried and failed entries.
+    """
+    sync_manager = sync_manager or UserSyncManager()
+    counts = {'sent': 0, 'retried': 0, 'failed': 0}
+    if not sync_manager.is_sync_enabled():
+        return counts
+
+    entries = claim_sync_batch(batch_size)
+    results = sync_manager.send_user_payloads([(entry.payload, entry.idempotency_key) for entry in entries])
+    now = timezone.now()
+    for entry, (success, error) in zip(entries, results):
+        if success:
+            entry.status = UserSyncOutbox.Status.SENT
+            entry.sent_at = now
+            entry.last_error = ''
+            counts['sent'] += 1
+        elif entry.attempts >= sync_manager.max_attempts:
+            entry.status = UserSyncOutbox.Status.FAILED
+            entry.last_error = error or ''
+            counts['failed'] += 1
+        else:
+            entry.next_attempt_at = now + sync_manager.retry_delay(entry.attempts)
+            entry.last_error = error or ''
+            counts['retried'] += 1
+
+    if entries:
+        UserSyncOutbox.objects.bulk_update(entries, ['status', 'sent_at', 'last_error', 'next_attempt_at'])
+    return counts
+
+
+user_sync_sender = OutboxSender(
+    'user-sync-sender', process_sync_outbox, lambda: getattr(settings, 'USER_SYNC_POLL_SECONDS', 30)
+)
+
+
+def deliver_user_syncs() -> None:
+    """Drain the sync outbox after a commit: in a background thread, inline, or not at all (worker)"""
+    user_sync_sender.deliver(getattr(settings, 'USER_SYNC_DELIVERY', 'thread'))
+
+
+def normalize_email_key(email: str) -> str:
+    """Case-insensitive key for matching emails across GDA and KICC"""
+    return email.strip().lower()
+
+
+def existing_users_by_email(emails: List[str]) -> Dict[str, Any]:
+    """
+    Return existing users keyed by normalized email, with one query on the
+    lower(email) index
+    """
+    keys = {normalize_email_key(email) for email in emails if email}
+    if not keys:
+        return {}
+    users = User.objects.alias(email_key=Lower('email')).filter(email_key__in=keys)
+    return {normalize_email_key(user.email): user for user in users}
+
+
+def parse_sync_date_of_birth(value: Optional[str]) -> Optional[Any]:
+    """Parse an ISO date_of_birth from sync data, ignoring invalid values"""
+    if not value:
+        return None
+    try:
+        from datetime import datetime
+        return datetime.fromisoformat(value).date()
+    except (ValueError, TypeError):
+        logger.warning(f"Invalid date_of_birth format: {value}")
+        return None
+
+
 def create_user_from_sync(user_data: Dict) -> Tuple[Optional[Any], bool, Optional[str]]:
     """
     Create a GDA user from KICC sync data
@@ -141,42 +461,207 @@ def create_user_from_sync(user_data: Dict) -> Tuple[Optional[Any], bool, Optiona
             return None, False, "Email is required"
         
         # Check if user already exists
-        existing_user = User.objects.filter(email=email).first()
+        existing_user = existing_users_by_email([email]).get(normalize_email_key(email))
         if existing_user:
             return existing_user, False, None
         
-        # Parse date_of_birth if provided
-        date_of_birth = None
-        if user_data.get('date_of_birth'):
-            try:
-                from datetime import datetime
-                date_of_birth = datetime.fromisoformat(user_data['date_of_birth']).date()
-            except (ValueError, TypeError):
-                logger.warning(f"Invalid date_of_birth format: {user_data.get('date_of_birth')}")
-                date_of_birth = None
-        
-        # Create new user
+        # Create new user with an unusable password (user will need to reset it);
+        # create_user stores it in the same INSERT, nothing is hashed
         user = User.objects.create_user(
             username=user_data.get('username', email.split('@')[0]),
             email=email,
+            password=None,
             first_name=user_data.get('first_name', ''),
             last_name=user_data.get('last_name', ''),
             contact=user_data.get('phone', ''),
-            date_of_birth=date_of_birth,
+            date_of_birth=parse_sync_date_of_birth(user_data.get('date_of_birth')),
             login_method='email',
             onboarding_complete=False
         )
         
-        # Set a random password (user will need to reset it)
-        import secrets
-        temp_password = secrets.token_urlsafe(32)
-        user.set_password(temp_password)
-        user.save()
-        
         logger.info(f"Created GDA user from KICC sync: {email}")
         return user, True, None
         
     except Exception as e:
         error_msg = f"Error creating user from sync: {str(e)}"
         logger.error(error_msg)
-        return None, False, error_msg
\ No newline at end of file
+        return None, False, error_msg
+
+
+def create_users_from_sync(users_data: List[Dict]) -> List[Dict]:
+    """
+    Create GDA users from a batch of KICC sync data.
+    Existing emails and taken usernames are found with one query each and the
+    new users are inserted with a single bulk_create. That bypasses save() and
+    the post_save signals: the fields save() derives (needs_onboarding) are set
+    here, and the user receivers (user cache, certificate names) have nothing
+    to do for a user that didn't exist.
+    Returns one {'email', 'status', 'user_id'|'error'} result per item, in order;
+    status is 'created', 'exists' or 'error'.
+    """
+    existing = existing_users_by_email([user_data.get('email') or '' for user_data in users_data])
+    usernames = {
+        user_data.get('username') or (user_data.get('email') or '').split('@')[0]
+        for user_data in users_data
+    }
+    taken_usernames = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+
+    results, new_users, batch_keys = [], [], {}
+    for user_data in users_data:
+        email = user_data.get('email')
+        if not email:
+            results.append({'email': email, 'status': 'error', 'error': 'Email is required'})
+            continue
+
+        key = normalize_email_key(email)
+        if key in existing:
+            results.append({'email': email, 'status': 'exists', 'user_id': existing[key].id})
+            continue
+        if key in batch_keys:
+            # Repeated within the batch: point at the user created for the first occurrence
+            results.append({'email': email, 'status': 'exists', 'user': batch_keys[key]})
+            continue
+
+        username = User.normalize_username(user_data.get('username') or email.split('@')[0])
+        if username in taken_usernames:
+            results.append({'email': email, 'status': 'error', 'error': f'Username {username} is already taken'})
+            continue
+        taken_usernames.add(username)
+
+        user = User(
+            username=username,
+            email=User.objects.normalize_email(email),
+            password=make_password(None),
+            first_name=user_data.get('first_name', ''),
+            last_name=user_data.get('last_name', ''),
+            contact=user_data.get('phone', ''),
+            date_of_birth=parse_sync_date_of_birth(user_data.get('date_of_birth')),
+            login_method='email',
+            onboarding_complete=False
+        )
+        user.needs_onboarding = user.compute_needs_onboarding()
+        batch_keys[key] = user
+        new_users.append(user)
+        results.append({'email': email, 'status': 'created', 'user': user})
+
+    if new_users:
+        with transaction.atomic():
+            User.objects.bulk_create(new_users)
+        logger.info(f"Created {len(new_users)} GDA users from KICC batch sync")
+
+    for result in results:
+        user = result.pop('user', None)
+        if user is not None:
+            result['user_id'] = user.id
+    return results
+
+
+# Changed after any user save that may have touched the email, and any delete
+DIGEST_INDEX_VERSION_KEY = 'user_digest_index:version'
+
+_digest_index = (None, None)
+_digest_index_lock = threading.Lock()
+
+
+def local_digest_index() -> EmailDigestIndex:
+    """
+    Digest index of GDA's user emails, kept per process and rebuilt only when
+    the user table changed. The table's state is the user count, highest id
+    and latest date_joined (which catch bulk inserts, as they send no
+    signals) plus a shared version bumped by user saves and deletes, so
+    checking it costs one aggregate query and a cache get. Email changes made
+    with QuerySet.update() are not seen until the next tracked change.
+    """
+    global _digest_index
+    version = cache.get_or_set(DIGEST_INDEX_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+    state = User.objects.aggregate(count=Count('id'), max_id=Max('id'), joined=Max('date_joined'))
+    key = (version, state['count'], state['max_id'], state['joined'])
+    with _digest_index_lock:
+        if _digest_index[0] != key:
+            emails = User.objects.exclude(email='').values_list('email', flat=True).iterator()
+            _digest_index = (key, EmailDigestIndex(emails))
+        return _digest_index[1]
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_digest_index(sender, instance, update_fields=None, **kwargs):
+    # Logins save only last_login. Bump after commit so no process rebuilds
+    # from the old rows under the new version.
+    if update_fields is None or 'email' in update_fields:
+        transaction.on_commit(lambda: cache.delete(DIGEST_INDEX_VERSION_KEY))
+
+
+def reconcile_with_kicc(sync_manager: Optional[UserSyncManager] = None, leaf_size: int = 32,
+                        max_depth: int = 6, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Find and repair drift between the GDA and KICC user sets.
+
+    Buckets of the email hash space are compared level by level (see
+    digest_utils); only buckets whose digests differ are split further, and
+    once a differing bucket holds at most ``leaf_size`` users on both sides
+    (or ``max_depth`` is reached) its users are fetched from KICC.
+    Users missing from KICC are queued in the sync outbox; users missing
+    from GDA are created locally. With ``dry_run`` nothing is repaired.
+    """
+    sync_manager = sync_manager or UserSyncManager()
+    report = {
+        'rounds': 0, 'buckets_compared': 0, 'buckets_fetched': 0,
+        'missing_in_kicc': [], 'missing_in_gda': [], 'queued': 0, 'created': 0, 'success': True,
+    }
+    local = local_digest_index()
+
+    prefixes, leaves = [''], []
+    while prefixes:
+        report['rounds'] += 1
+        report['buckets_compared'] += len(prefixes)
+        remote, success = sync_manager.fetch_digests(prefixes)
+        if not success:
+            report['success'] = False
+            return report
+
+        next_prefixes = []
+        for prefix in prefixes:
+            mine = local.digest(prefix)
+            theirs = remote.get(prefix) or {'count': 0, 'digest': ''}
+            if mine['digest'] == theirs['digest']:
+                continue
+            if max(mine['count'], theirs['count']) <= leaf_size or len(prefix) >= max_depth:
+                leaves.append(prefix)
+            else:
+                next_prefixes.extend(child_prefixes(prefix))
+        prefixes = next_prefixes
+
+    if not leaves:
+        return report
+
+    remote_users, success = sync_manager.fetch_bucket_users(leaves)
+    if not success:
+        report['success'] = False
+        return report
+    report['buckets_fetched'] = len(leaves)
+
+    remote_by_hash = {email_hash(user['email']): user for user in remote_users if user.get('email')}
+    local_emails = local.emails(leaves)
+    report['missing_in_kicc'] = [email for email in local_emails if email_hash(email) not in remote_by_hash]
+    local_hashes = {email_hash(email) for email in local_emails}
+    missing_in_gda = [user for h, user in remote_by_hash.items() if h not in local_hashes]
+    report['missing_in_gda'] = [user['email'] for user in missing_in_gda]
+
+    if dry_run:
+        return report
+
+    if report['missing_in_kicc']:
+        users = list(existing_users_by_email(report['missing_in_kicc']).values())
+        # Users with a delivery already pending don't need another one
+        pending = set(UserSyncOutbox.objects.filter(
+            user__in=users, status=UserSyncOutbox.Status.PENDING,
+        ).values_list('user_id', flat=True))
+        entries = UserSyncOutbox.objects.bulk_create([
+            UserSyncOutbox(user=user, payload=build_user_payload(user)) for user in users if user.pk not in pending
+        ])
+        report['queued'] = len(entries)
+    if missing_in_gda:
+        results = create_users_from_sync(missing_in_gda)
+        report['created'] = sum(1 for result in results if result['status'] == 'created')
+    return report
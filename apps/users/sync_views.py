@@ -9,11 +9,18 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from django.contrib.auth import get_user_model
 from django.views.decorators.csrf import csrf_exempt
-from .sync_utils import create_user_from_sync
+from .digest_utils import is_valid_prefix
+from .sync_utils import (
+    build_user_payload, create_user_from_sync, create_users_from_sync, existing_users_by_email,
+    local_digest_index, normalize_email_key
+)
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
+# Largest batch accepted by the batch sync endpoints
+SYNC_BATCH_MAX = 500
+
 
 def validate_sync_api_key(request):
     """Validate the sync API key from request headers"""
@@ -110,7 +117,7 @@ def sync_check_user(request):
             )
         
         # Check if user exists
-        user_exists = User.objects.filter(email=email).exists()
+        user_exists = normalize_email_key(email) in existing_users_by_email([email])
         
         return Response(
             {
@@ -128,6 +135,142 @@ def sync_check_user(request):
         )
 
 
+@csrf_exempt
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def sync_create_users(request):
+    """
+    Create several users in GDA from KICC sync data
+    Body: {"users": [...]}; returns one result per user, in order
+    """
+    # Validate API key
+    if not validate_sync_api_key(request):
+        return Response(
+            {'error': 'Invalid sync API key'},
+            status=status.HTTP_401_UNAUTHORIZED
+        )
+    
+    users = request.data.get('users') if isinstance(request.data, dict) else None
+    if not isinstance(users, list) or not all(isinstance(user_data, dict) for user_data in users):
+        return Response(
+            {'error': 'users must be a list of objects'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if len(users) > SYNC_BATCH_MAX:
+        return Response(
+            {'error': f'At most {SYNC_BATCH_MAX} users per request'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        results = create_users_from_sync(users)
+    except Exception as e:
+        logger.error(f"Error in sync_create_users: {str(e)}")
+        return Response(
+            {'error': 'Internal server error'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    
+    logger.info(f"Batch sync processed {len(results)} users from KICC")
+    return Response({'results': results}, status=status.HTTP_200_OK)
+
+
+@csrf_exempt
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def sync_check_users(request):
+    """
+    Check which of several users exist in GDA
+    Body: {"emails": [...]}; returns {"results": {email: exists}}
+    """
+    # Validate API key
+    if not validate_sync_api_key(request):
+        return Response(
+            {'error': 'Invalid sync API key'},
+            status=status.HTTP_401_UNAUTHORIZED
+        )
+    
+    emails = request.data.get('emails') if isinstance(request.data, dict) else None
+    if not isinstance(emails, list) or not all(isinstance(email, str) for email in emails):
+        return Response(
+            {'error': 'emails must be a list of strings'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if len(emails) > SYNC_BATCH_MAX:
+        return Response(
+            {'error': f'At most {SYNC_BATCH_MAX} emails per request'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    # One query for the whole batch
+    existing = existing_users_by_email(emails)
+    return Response(
+        {'results': {email: normalize_email_key(email) in existing for email in emails}},
+        status=status.HTTP_200_OK
+    )
+
+
+def get_sync_prefixes(request):
+    """Validated list of hash prefixes from a digest/bucket request body, or None"""
+    prefixes = request.data.get('prefixes') if isinstance(request.data, dict) else None
+    if not isinstance(prefixes, list) or len(prefixes) > SYNC_BATCH_MAX or not all(map(is_valid_prefix, prefixes)):
+        return None
+    return prefixes
+
+
+@csrf_exempt
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def sync_digest(request):
+    """
+    Range-hash digests of GDA's user emails for reconciliation
+    Body: {"prefixes": ["0", "1a", ...]}; returns {"digests": {prefix: {"count", "digest"}}}
+    """
+    # Validate API key
+    if not validate_sync_api_key(request):
+        return Response(
+            {'error': 'Invalid sync API key'},
+            status=status.HTTP_401_UNAUTHORIZED
+        )
+    
+    prefixes = get_sync_prefixes(request)
+    if prefixes is None:
+        return Response(
+            {'error': f'prefixes must be a list of at most {SYNC_BATCH_MAX} hex strings'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    index = local_digest_index()
+    return Response({'digests': index.digests(prefixes)}, status=status.HTTP_200_OK)
+
+
+@csrf_exempt
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def sync_bucket_users(request):
+    """
+    Users whose email hash falls in the given buckets, for reconciliation
+    Body: {"prefixes": [...]}; returns {"users": [...]} in sync payload format
+    """
+    # Validate API key
+    if not validate_sync_api_key(request):
+        return Response(
+            {'error': 'Invalid sync API key'},
+            status=status.HTTP_401_UNAUTHORIZED
+        )
+    
+    prefixes = get_sync_prefixes(request)
+    if prefixes is None:
+        return Response(
+            {'error': f'prefixes must be a list of at most {SYNC_BATCH_MAX} hex strings'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    index = local_digest_index()
+    users = existing_users_by_email(index.emails(prefixes))
+    return Response({'users': [build_user_payload(user) for user in users.values()]}, status=status.HTTP_200_OK)
+
+
 @csrf_exempt
 @api_view(['GET'])
 @permission_classes([AllowAny])
@@ -1,10 +1,673 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import CustomUser, UserSyncOutbox
+from .sync_utils import UserSyncManager, process_sync_outbox
 
 
 class UsersSmokeTest(TestCase):
     def test_index_or_login(self):
         response = self.client.get('/')
         self.assertIn(response.status_code, (200, 302, 404))
-from django.test import TestCase
 
-# Create your tests here.
+
+class UserSyncOutboxTest(TestCase):
+    def register(self, username='outbox'):
+        return self.client.post('/api/users/', {
+            'username': username, 'email': f'{username}@example.com',
+            'password': 'Str0ng-pass-123', 'password2': 'Str0ng-pass-123',
+            'first_name': 'Out', 'last_name': 'Box', 'date_of_birth': '2000-01-01',
+        })
+
+    def setUp(self):
+        self.session = mock.Mock()
+
+    def sync_manager(self):
+        manager = UserSyncManager()
+        manager.sync_enabled = True
+        manager.max_attempts = 2
+        manager.session = self.session
+        return manager
+
+    @mock.patch('requests.Session.request')
+    def test_registration_queues_sync_without_calling_kicc(self, request):
+        with mock.patch.dict('os.environ', {'ENABLE_USER_SYNC': 'True'}):
+            response = self.register()
+        self.assertEqual(response.status_code, 201)
+        request.assert_not_called()
+        entry = UserSyncOutbox.objects.get()
+        self.assertEqual(entry.user.username, 'outbox')
+        self.assertEqual(entry.status, UserSyncOutbox.Status.PENDING)
+        self.assertEqual(entry.payload['email'], 'outbox@example.com')
+        self.assertEqual(entry.payload['date_of_birth'], '2000-01-01')
+
+    @override_settings(USER_SYNC_DELIVERY='inline')
+    def test_registration_sync_is_delivered_after_commit(self):
+        self.session.post.return_value = mock.Mock(status_code=200, json=lambda: {'results': [{'status': 'created'}]})
+        with mock.patch.dict('os.environ', {'ENABLE_USER_SYNC': 'True'}), \
+                mock.patch('apps.users.sync_utils.get_sync_session', return_value=self.session):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.register()
+        self.assertEqual(response.status_code, 201)
+        entry = UserSyncOutbox.objects.get()
+        self.assertEqual(entry.status, UserSyncOutbox.Status.SENT)
+        self.assertEqual(self.session.post.call_args.kwargs['json']['users'][0]['email'], 'outbox@example.com')
+
+    @override_settings(USER_SYNC_DELIVERY='worker')
+    def test_worker_delivery_leaves_sync_pending(self):
+        with mock.patch.dict('os.environ', {'ENABLE_USER_SYNC': 'True'}), \
+                mock.patch('apps.users.sync_utils.get_sync_session', return_value=self.session):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.register()
+        self.session.post.assert_not_called()
+        self.assertEqual(UserSyncOutbox.objects.get().status, UserSyncOutbox.Status.PENDING)
+
+    def test_worker_retries_with_backoff_then_gives_up(self):
+        user = CustomUser.objects.create_user(username='retry', email='retry@example.com')
+        entry = UserSyncOutbox.objects.create(user=user, payload={'email': user.email})
+        self.session.post.return_value = mock.Mock(status_code=503, text='unavailable')
+
+        self.assertEqual(process_sync_outbox(sync_manager=self.sync_manager()), {'sent': 0, 'retried': 1, 'failed': 0})
+        entry.refresh_from_db()
+        self.assertEqual(entry.attempts, 1)
+        self.assertGreater(entry.next_attempt_at, timezone.now())
+        self.assertIn('503', entry.last_error)
+
+        # Not due yet: nothing is claimed
+        self.assertEqual(process_sync_outbox(sync_manager=self.sync_manager()), {'sent': 0, 'retried': 0, 'failed': 0})
+
+        UserSyncOutbox.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(process_sync_outbox(sync_manager=self.sync_manager()), {'sent': 0, 'retried': 0, 'failed': 1})
+        entry.refresh_from_db()
+        self.assertEqual(entry.status, UserSyncOutbox.Status.FAILED)
+
+    def test_worker_sends_batches_with_idempotency_keys(self):
+        entries = [
+            UserSyncOutbox.objects.create(payload={'email': f'user{i}@example.com'})
+            for i in range(3)
+        ]
+        self.session.post.return_value = mock.Mock(status_code=200, json=lambda: {'results': [
+            {'email': 'user0@example.com', 'status': 'created'},
+            {'email': 'user1@example.com', 'status': 'exists'},
+            {'email': 'user2@example.com', 'status': 'error', 'error': 'Invalid phone'},
+        ]})
+
+        self.assertEqual(process_sync_outbox(sync_manager=self.sync_manager()), {'sent': 2, 'retried': 1, 'failed': 0})
+        self.assertEqual(self.session.post.call_count, 1)
+        url = self.session.post.call_args.args[0]
+        users = self.session.post.call_args.kwargs['json']['users']
+        self.assertTrue(url.endswith('/sync/create-users/'))
+        self.assertEqual([user['idempotency_key'] for user in users], [str(entry.idempotency_key) for entry in entries])
+        self.assertEqual(
+            list(UserSyncOutbox.objects.order_by('id').values_list('status', 'last_error')),
+            [('SENT', ''), ('SENT', ''), ('PENDING', 'Invalid phone')],
+        )
+
+    def test_worker_falls_back_to_single_requests_without_batch_endpoint(self):
+        entry = UserSyncOutbox.objects.create(payload={'email': 'single@example.com'})
+        self.session.post.side_effect = [mock.Mock(status_code=404), mock.Mock(status_code=201)]
+
+        self.assertEqual(process_sync_outbox(sync_manager=self.sync_manager()), {'sent': 1, 'retried': 0, 'failed': 0})
+        self.assertTrue(self.session.post.call_args.args[0].endswith('/sync/create-user/'))
+        self.assertEqual(self.session.post.call_args.kwargs['headers']['Idempotency-Key'], str(entry.idempotency_key))
+
+
+@mock.patch.dict('os.environ', {'KICC_API_KEY': 'test-key'})
+class SyncBatchEndpointTest(TestCase):
+    def post(self, url, data):
+        return self.client.post(url, data, content_type='application/json', HTTP_X_SYNC_API_KEY='test-key')
+
+    def test_check_users_uses_one_query(self):
+        CustomUser.objects.create_user(username='known', email='known@example.com')
+        with self.assertNumQueries(1):
+            response = self.post('/sync/check-users/', {'emails': ['known@example.com', 'new@example.com']})
+        self.assertEqual(response.json()['results'], {'known@example.com': True, 'new@example.com': False})
+
+    def test_create_users_reports_per_user_results(self):
+        CustomUser.objects.create_user(username='known', email='known@example.com')
+        response = self.post('/sync/create-users/', {'users': [
+            {'email': 'known@example.com'}, {'email': 'fresh@example.com', 'username': 'fresh'}, {'username': 'no-email'},
+        ]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['status'] for r in response.json()['results']], ['exists', 'created', 'error'])
+        fresh = CustomUser.objects.get(email='fresh@example.com', username='fresh')
+        self.assertEqual(fresh.needs_onboarding, fresh.compute_needs_onboarding())
+        self.assertTrue(fresh.needs_onboarding)
+
+    def test_create_users_is_constant_queries_and_case_insensitive(self):
+        CustomUser.objects.create_user(username='known', email='Known@Example.com')
+        for count in (2, 20):
+            users = [{'email': f'Bulk{count}-{i}@example.com', 'username': f'bulk{count}-{i}'} for i in range(count)]
+            users.append({'email': 'KNOWN@example.com'})
+            # existence + usernames + savepoint/INSERT/release
+            with self.assertNumQueries(5):
+                response = self.post('/sync/create-users/', {'users': users})
+            results = response.json()['results']
+            self.assertEqual(results[-1]['status'], 'exists')
+            self.assertEqual([r['status'] for r in results[:-1]], ['created'] * count)
+        user = CustomUser.objects.get(username='bulk20-3')
+        self.assertEqual(user.email, 'Bulk20-3@example.com')
+        self.assertFalse(user.has_usable_password())
+
+    def test_create_users_handles_duplicates_within_batch_and_taken_usernames(self):
+        CustomUser.objects.create_user(username='taken', email='taken@example.com')
+        response = self.post('/sync/create-users/', {'users': [
+            {'email': 'dup@example.com'}, {'email': 'DUP@example.com'}, {'email': 'other@example.com', 'username': 'taken'},
+        ]})
+        results = response.json()['results']
+        self.assertEqual([r['status'] for r in results], ['created', 'exists', 'error'])
+        self.assertEqual(results[0]['user_id'], results[1]['user_id'])
+
+    def test_single_check_user_is_case_insensitive(self):
+        CustomUser.objects.create_user(username='known', email='known@example.com')
+        response = self.client.get('/sync/check-user/', {'email': 'KNOWN@example.com'}, HTTP_X_SYNC_API_KEY='test-key')
+        self.assertTrue(response.json()['exists'])
+
+    def test_rejects_invalid_key(self):
+        response = self.client.post('/sync/check-users/', {'emails': []}, content_type='application/json')
+        self.assertEqual(response.status_code, 401)
+
+
+class KICCStubServerTest(TestCase):
+    def setUp(self):
+        from .kicc_stub import start_stub_server
+        self.server = start_stub_server(api_key='stub-key')
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def sync_manager(self):
+        with mock.patch.dict('os.environ', {
+            'KICC_API_BASE_URL': self.server.base_url, 'KICC_API_KEY': 'stub-key', 'ENABLE_USER_SYNC': 'True',
+            'KICC_SYNC_BATCH_SIZE': '10',
+        }):
+            return UserSyncManager()
+
+    def test_outbox_drains_against_stub_in_batches(self):
+        for i in range(25):
+            UserSyncOutbox.objects.create(payload={'email': f'stub{i}@example.com'})
+        counts = process_sync_outbox(batch_size=100, sync_manager=self.sync_manager())
+        self.assertEqual(counts, {'sent': 25, 'retried': 0, 'failed': 0})
+        self.assertEqual(self.server.request_count, 3)
+        self.assertEqual(len(self.server.users), 25)
+
+        existing, success = self.sync_manager().check_users_exist_in_kicc(['stub0@example.com', 'missing@example.com'])
+        self.assertTrue(success)
+        self.assertEqual(existing, {'stub0@example.com': True, 'missing@example.com': False})
+
+    def test_reconciliation_repairs_only_differing_buckets(self):
+        from .sync_utils import reconcile_with_kicc
+        shared = [f'shared{i}@example.com' for i in range(200)]
+        for email in shared:
+            CustomUser.objects.create_user(username=email.split('@')[0], email=email)
+            self.server.users[email] = {'email': email, 'username': email.split('@')[0]}
+        CustomUser.objects.create_user(username='gdaonly', email='GDAonly@example.com')
+        self.server.users['kicconly@example.com'] = {'email': 'kicconly@example.com', 'username': 'kicconly'}
+
+        report = reconcile_with_kicc(self.sync_manager(), leaf_size=8, dry_run=True)
+        self.assertEqual(report['missing_in_kicc'], ['GDAonly@example.com'])
+        self.assertEqual(report['missing_in_gda'], ['kicconly@example.com'])
+        # Only the two differing leaf buckets are transferred
+        self.assertEqual(report['buckets_fetched'], 2)
+        self.assertFalse(UserSyncOutbox.objects.exists())
+
+        report = reconcile_with_kicc(self.sync_manager(), leaf_size=8)
+        self.assertEqual((report['queued'], report['created']), (1, 1))
+        self.assertTrue(CustomUser.objects.filter(email='kicconly@example.com').exists())
+        process_sync_outbox(sync_manager=self.sync_manager())
+
+        report = reconcile_with_kicc(self.sync_manager(), leaf_size=8)
+        self.assertEqual(report['rounds'], 1)
+        self.assertEqual((report['missing_in_kicc'], report['missing_in_gda']), ([], []))
+
+    def test_gda_digest_endpoint_matches_local_index(self):
+        from .digest_utils import EmailDigestIndex
+        for i in range(5):
+            CustomUser.objects.create_user(username=f'd{i}', email=f'D{i}@example.com')
+        with mock.patch.dict('os.environ', {'KICC_API_KEY': 'test-key'}):
+            response = self.client.post('/sync/digest/', {'prefixes': ['', 'a']}, content_type='application/json',
+                                        HTTP_X_SYNC_API_KEY='test-key')
+            users = self.client.post('/sync/bucket-users/', {'prefixes': ['']}, content_type='application/json',
+                                     HTTP_X_SYNC_API_KEY='test-key').json()['users']
+        index = EmailDigestIndex(f'd{i}@example.com' for i in range(5))
+        self.assertEqual(response.json()['digests'], index.digests(['', 'a']))
+        self.assertEqual(len(users), 5)
+
+
+class LocalDigestIndexTest(TestCase):
+    def test_index_is_reused_until_users_change(self):
+        from .digest_utils import email_hash
+        from .sync_utils import local_digest_index
+        user = CustomUser.objects.create_user(username='first', email='first@example.com')
+        index = local_digest_index()
+        # Only the table state is read while nothing changed
+        with self.assertNumQueries(1):
+            self.assertIs(local_digest_index(), index)
+
+        # Bulk inserts send no signals but move the table state
+        CustomUser.objects.bulk_create([CustomUser(username='bulk', email='bulk@example.com')])
+        self.assertEqual(local_digest_index().emails(['']), [e for _, e in sorted(
+            (email_hash(e), e) for e in ['first@example.com', 'bulk@example.com'])])
+
+        # Email edits keep count and ids but bump the version once committed
+        user.email = 'renamed@example.com'
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+        self.assertIn('renamed@example.com', local_digest_index().emails(['']))
+
+        index = local_digest_index()
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save(update_fields=['last_login'])
+        self.assertIs(local_digest_index(), index)
+
+
+class EmailOutboxTest(TestCase):
+    def queue(self, to='someone@example.com'):
+        from .email_utils import send_html_email
+        return send_html_email(
+            subject='Verify your email - GDA',
+            recipient_list=[to],
+            template_name='users/emails/verification_email.html',
+            plain_text_template='users/emails/verification_email.txt',
+            context={'user': CustomUser(username='u', email=to), 'verification_link': 'https://example.com/verify/'},
+        )
+
+    def test_send_html_email_queues_and_sender_delivers(self):
+        from django.core import mail
+        from .email_utils import EmailRateLimiter, send_queued_emails
+        from .models import EmailOutbox
+
+        self.assertEqual(self.queue(), (True, None))
+        self.assertEqual(self.queue('other@example.com'), (True, None))
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(EmailOutbox.objects.filter(status=EmailOutbox.Status.PENDING).count(), 2)
+
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.open') as open_connection:
+            counts = send_queued_emails(limiter=EmailRateLimiter({}))
+        self.assertEqual(counts['sent'], 2)
+        self.assertEqual(open_connection.call_count, 1)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertIn('https://example.com/verify/', mail.outbox[0].body)
+        self.assertEqual(mail.outbox[0].alternatives[0][1], 'text/html')
+        entry = EmailOutbox.objects.first()
+        self.assertEqual(entry.status, EmailOutbox.Status.SENT)
+        self.assertEqual((entry.text_body, entry.html_body), ('', ''))
+
+    def test_rate_limit_defers_without_using_an_attempt(self):
+        from django.core import mail
+        from .email_utils import EmailRateLimiter, send_queued_emails
+        from .models import EmailOutbox
+
+        self.queue('a@gmail.com')
+        self.queue('b@gmail.com')
+        self.queue('c@example.com')
+        counts = send_queued_emails(limiter=EmailRateLimiter({'gmail.com': 1}))
+        self.assertEqual((counts['sent'], counts['deferred']), (2, 1))
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), ['a@gmail.com', 'c@example.com'])
+        deferred = EmailOutbox.objects.get(status=EmailOutbox.Status.PENDING)
+        self.assertEqual(deferred.attempts, 0)
+        self.assertGreater(deferred.next_attempt_at, timezone.now())
+
+    def test_failures_are_retried_with_backoff(self):
+        from .email_utils import EmailRateLimiter, send_queued_emails
+        from .models import EmailOutbox
+
+        self.queue()
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=OSError('down')):
+            counts = send_queued_emails(limiter=EmailRateLimiter({}))
+        self.assertEqual(counts['retried'], 1)
+        entry = EmailOutbox.objects.get()
+        self.assertEqual((entry.status, entry.attempts, entry.last_error), ('PENDING', 1, 'down'))
+        self.assertGreater(entry.next_attempt_at, timezone.now())
+        self.assertTrue(entry.html_body)
+
+    @override_settings(EMAIL_OUTBOX_MAX_ATTEMPTS=1)
+    def test_final_failure_clears_bodies(self):
+        from .email_utils import EmailRateLimiter, send_queued_emails
+        from .models import EmailOutbox
+
+        self.queue()
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=OSError('down')):
+            counts = send_queued_emails(limiter=EmailRateLimiter({}))
+        self.assertEqual(counts['failed'], 1)
+        entry = EmailOutbox.objects.get()
+        self.assertEqual(entry.status, EmailOutbox.Status.FAILED)
+        self.assertEqual((entry.text_body, entry.html_body), ('', ''))
+
+    @override_settings(EMAIL_OUTBOX_DELIVERY='inline')
+    def test_inline_delivery_sends_after_commit(self):
+        from django.core import mail
+        from .models import EmailOutbox
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.queue()
+            self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(EmailOutbox.objects.get().status, EmailOutbox.Status.SENT)
+
+
+class BatchEmailTest(TestCase):
+    def recipients(self):
+        from .email_utils import recipient_from_user
+        return [
+            recipient_from_user(CustomUser(username='a', email='a@example.com', first_name='Ann', last_name='<Lee>')),
+            recipient_from_user(CustomUser(username='b', email='b@example.com', first_name='Bo'), language='zh-tw'),
+            recipient_from_user(CustomUser(username='c', email='c@example.com', first_name='Cy')),
+        ]
+
+    def send(self, **kwargs):
+        from .email_utils import send_batch_email
+        return send_batch_email(
+            subject='News', recipients=self.recipients(),
+            template_name='users/emails/project_announcement_email.html',
+            context={'project': {'title': 'Beach Cleanup'}, 'message': 'See you <there>', 'project_url': 'https://example.com/p/1/'},
+            **kwargs
+        )
+
+    def test_renders_once_per_locale_and_substitutes_per_recipient(self):
+        from django.core import mail
+        from django.template import loader
+
+        with mock.patch('apps.users.email_utils.render_to_string', wraps=loader.render_to_string) as render:
+            self.assertEqual(self.send(queue=False), (3, None))
+        self.assertEqual(render.call_count, 2)
+        self.assertEqual(len(mail.outbox), 3)
+        html_body = mail.outbox[0].alternatives[0][0]
+        self.assertIn('Ann &lt;Lee&gt;', html_body)
+        self.assertIn('See you &lt;there&gt;', html_body)
+        self.assertNotIn('__recipient_', html_body)
+        bodies = {message.to[0]: message.body for message in mail.outbox}
+        self.assertIn('Ann <Lee>', bodies['a@example.com'])
+        self.assertIn('你好 Bo', bodies['b@example.com'])
+        self.assertIn('Cy', bodies['c@example.com'])
+
+    def test_queues_with_one_insert(self):
+        from .models import EmailOutbox
+        with self.assertNumQueries(1):
+            self.assertEqual(self.send(), (3, None))
+        self.assertEqual(sorted(e.to[0] for e in EmailOutbox.objects.all()), ['a@example.com', 'b@example.com', 'c@example.com'])
+
+
+class OnboardingMiddlewareTest(TestCase):
+    PROFILE = dict(
+        date_of_birth='2000-01-01', guardian_name='G', guardian_relation='Parent',
+        address='Taipei', contact='0912345678', country_code='TW',
+    )
+
+    def test_needs_onboarding_is_maintained_on_save(self):
+        user = CustomUser.objects.create_user(username='flag', email='flag@example.com', onboarding_complete=True, **self.PROFILE)
+        self.assertFalse(user.needs_onboarding)
+        user.address = ''
+        user.save(update_fields=['address'])
+        user.refresh_from_db()
+        self.assertTrue(user.needs_onboarding)
+
+    def test_incomplete_user_is_redirected_except_on_bypass_paths(self):
+        user = CustomUser.objects.create_user(username='new', email='new@example.com')
+        self.client.force_login(user)
+        self.assertRedirects(self.client.get('/projects/'), '/onboarding/', fetch_redirect_response=False)
+        self.assertEqual(self.client.get('/api/projects/').status_code, 200)
+
+    def test_onboarding_state_is_read_from_session(self):
+        user = CustomUser.objects.create_user(username='done', email='done@example.com', onboarding_complete=True, **self.PROFILE)
+        self.client.force_login(user)
+        self.assertEqual(self.client.session['_needs_onboarding'], False)
+        self.assertEqual(self.client.get('/projects/').status_code, 200)
+
+        # The cached flag is trusted until the user's profile is saved again
+        CustomUser.objects.filter(pk=user.pk).update(needs_onboarding=True)
+        self.assertEqual(self.client.get('/projects/').status_code, 200)
+
+
+class RequestFastPathTest(TestCase):
+    def setUp(self):
+        from .cache_utils import user_cache
+        user_cache.clear()
+        self.user = CustomUser.objects.create_user(
+            username='fast', email='fast@example.com', password='pw-12345!', onboarding_complete=True,
+            **OnboardingMiddlewareTest.PROFILE,
+        )
+
+    def test_lightweight_paths_skip_session_and_auth(self):
+        self.client.force_login(self.user)
+        with self.assertNumQueries(0):
+            response = self.client.get('/health/')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Set-Cookie', str(response.cookies))
+
+    def test_anonymous_api_reads_use_the_lightweight_stack(self):
+        response = self.client.get('/api/projects/')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('csrftoken', response.cookies)
+
+    def user_queries(self, path):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(path)
+        return [query for query in queries if 'FROM "users_customuser"' in query['sql']]
+
+    def test_user_cache_is_off_by_default(self):
+        self.client.force_login(self.user)
+        self.client.get('/api/projects/')
+        self.assertEqual(len(self.user_queries('/api/projects/')), 1)
+
+    @override_settings(AUTH_USER_CACHE_TTL=30)
+    def test_admin_actions_drop_cached_users(self):
+        admin_user = CustomUser.objects.create_superuser(username='admin', email='admin@example.com', password='pw-12345!')
+        self.client.force_login(self.user)
+        self.client.get('/api/projects/')
+        self.assertEqual(self.user_queries('/api/projects/'), [])
+
+        client = self.client_class()
+        client.force_login(admin_user)
+        client.post('/admin/users/customuser/', {'action': 'deactivate_users', '_selected_action': [self.user.pk]})
+        self.assertRedirects(self.client.get('/profile/'), '/accounts/login/?next=/profile/', fetch_redirect_response=False)
+
+    @override_settings(AUTH_USER_CACHE_TTL=30)
+    def test_user_is_cached_until_saved(self):
+        self.client.force_login(self.user)
+        self.assertEqual(len(self.user_queries('/api/projects/')), 1)
+        self.assertEqual(self.user_queries('/api/projects/'), [])
+
+        self.user.first_name = 'Changed'
+        self.user.save()
+        self.assertEqual(len(self.user_queries('/api/projects/')), 1)
+
+    @override_settings(AUTH_USER_CACHE_TTL=30)
+    def test_password_change_invalidates_cached_sessions(self):
+        self.client.force_login(self.user)
+        self.client.get('/api/projects/')
+        self.user.set_password('new-pw-12345!')
+        self.user.save()
+        self.assertRedirects(self.client.get('/profile/'), '/accounts/login/?next=/profile/', fetch_redirect_response=False)
+
+
+class CustomUserAdminChangelistTest(TestCase):
+    def test_query_count_does_not_grow_with_rows(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from apps.content.models import Project
+
+        self.client.force_login(CustomUser.objects.create_superuser(username='admin', email='admin@example.com', password='pw-12345!'))
+        project = Project.objects.create(
+            title='P', teaser='T', background_objectives='B', tasks_eligibility='T', country='Taiwan',
+            theme='Education', duration=5, difficulty='Easy', total_headcount=50,
+            application_deadline=timezone.now() + timedelta(days=10),
+        )
+
+        self.client.get('/admin/users/customuser/')
+
+        counts = []
+        for total in (3, 12):
+            while CustomUser.objects.count() < total:
+                user = CustomUser.objects.create_user(username=f'u{CustomUser.objects.count()}', email=f'u{CustomUser.objects.count()}@example.com')
+                project.enrolled_users.add(user)
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get('/admin/users/customuser/')
+            self.assertContains(response, '<span style="color: green; font-weight: bold;">1</span>')
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+
+class ProfileDashboardTest(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from apps.content.models import FAQ, FAQVote, SuccessStory
+        from apps.content.tests import make_project
+        from .models import Certificate
+        cache.clear()
+        self.user = CustomUser.objects.create_user(
+            username='dash', email='dash@example.com', onboarding_complete=True, **OnboardingMiddlewareTest.PROFILE,
+        )
+        today = timezone.now().date()
+        past = dict(application_deadline=timezone.now() - timedelta(days=30), start_date=today - timedelta(days=20), end_date=today - timedelta(days=10))
+        self.upcoming = make_project(title='Upcoming')
+        self.certified = make_project(title='Certified', **past)
+        self.eligible = make_project(title='Eligible', **past)
+        self.left = make_project(title='Left', **past)
+        self.user.enrolled_projects.add(self.upcoming, self.certified, self.eligible)
+        for project in (self.certified, self.left):
+            Certificate.objects.create(user=self.user, project=project)
+        for project, beneficiaries in ((self.certified, 5), (self.eligible, 7), (self.upcoming, 100)):
+            SuccessStory.objects.create(title=f'{project.title} story', body='Body', related_project=project, beneficiaries=beneficiaries, total_hours_contributed=2, published_at=timezone.now())
+        faq = FAQ.objects.create(question='Why?', answer='Because', order=1)
+        FAQVote.objects.create(user=self.user, faq=faq, vote_type='UP')
+
+    def test_dashboard_data(self):
+        from .dashboard_utils import profile_dashboard
+        with self.assertNumQueries(6):
+            data = profile_dashboard(self.user)
+        self.assertEqual([p.title for p in data['upcoming_projects']], ['Upcoming'])
+        self.assertEqual({p.title for p in data['past_projects']}, {'Certified', 'Eligible'})
+        self.assertEqual([p.title for p in data['eligible_projects']], ['Eligible'])
+        # Certificates for projects the user has left are still listed
+        self.assertEqual({c.project.title for c in data['certificates']}, {'Certified', 'Left'})
+        self.assertEqual((data['total_beneficiaries'], data['total_hours']), (12, 4))
+        self.assertEqual(len(data['success_stories']), 3)
+        self.assertEqual(data['faqs'][0]['user_vote'], 'UP')
+
+        # Global widgets come from the shared cache on the next load: projects, stories, votes, change cursor
+        with self.assertNumQueries(4):
+            profile_dashboard(self.user)
+
+    def test_profile_page_renders(self):
+        self.client.force_login(self.user)
+        response = self.client.get('/profile/')
+        self.assertContains(response, 'Certified')
+        self.assertContains(response, 'Why?')
+
+
+class CertificateIssuanceTest(TestCase):
+    def setUp(self):
+        from apps.content.tests import make_project
+        from .models import Certificate
+        today = timezone.now().date()
+        self.project = make_project(
+            title='Beach Cleanup', application_deadline=timezone.now() - timedelta(days=30),
+            start_date=today - timedelta(days=20), end_date=today - timedelta(days=1),
+        )
+        self.users = [
+            CustomUser.objects.create_user(username=f'v{i}', email=f'v{i}@example.com', first_name=f'V{i}')
+            for i in range(5)
+        ]
+        self.project.enrolled_users.add(*self.users)
+        self.existing = Certificate.objects.create(user=self.users[0], project=self.project)
+
+    def test_issues_missing_certificates_in_one_insert_and_is_idempotent(self):
+        from .certificate_utils import issue_certificates
+        from .models import Certificate
+        # users without a certificate, id collision check, insert, read back (plus the savepoint)
+        with self.assertNumQueries(6):
+            issued = issue_certificates(self.project)
+        self.assertEqual(sorted(c.user.username for c in issued), ['v1', 'v2', 'v3', 'v4'])
+        self.assertEqual(Certificate.objects.filter(project=self.project).count(), 5)
+        self.assertTrue(all(c.certificate_id.startswith(f'GDA{self.project.end_date.year}-') for c in issued))
+        self.assertEqual(issue_certificates(self.project), [])
+
+    def test_redraws_colliding_ids(self):
+        from .certificate_utils import issue_certificates
+        ids = iter([self.existing.certificate_id, 'GDA2000-A', 'GDA2000-B', 'GDA2000-C', 'GDA2000-D'])
+        with mock.patch('apps.users.models.Certificate.make_certificate_id', side_effect=lambda project: next(ids)):
+            issued = issue_certificates(self.project)
+        self.assertEqual(sorted(c.certificate_id for c in issued), ['GDA2000-A', 'GDA2000-B', 'GDA2000-C', 'GDA2000-D'])
+
+    def test_skips_projects_that_have_not_ended(self):
+        from .certificate_utils import issue_certificates
+        self.project.end_date = timezone.now().date() + timedelta(days=1)
+        self.assertEqual(issue_certificates(self.project), [])
+
+    def test_notifies_new_holders_in_one_batch(self):
+        from django.core.management import call_command
+        from .models import EmailOutbox
+        call_command('issue_certificates', self.project.pk, '--notify', '--domain', 'gda.example', stdout=mock.MagicMock())
+        entries = list(EmailOutbox.objects.all())
+        self.assertEqual(sorted(e.to[0] for e in entries), ['v1@example.com', 'v2@example.com', 'v3@example.com', 'v4@example.com'])
+        entry = next(e for e in entries if e.to == ['v1@example.com'])
+        certificate_id = self.users[1].certificates.get().certificate_id
+        self.assertIn(certificate_id, entry.text_body)
+        self.assertIn(f'https://gda.example/profile/certificates/view/{certificate_id}/', entry.html_body)
+
+
+class CertificateVerificationTest(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from apps.content.tests import make_project
+        from .models import Certificate
+        cache.clear()
+        self.user = CustomUser.objects.create_user(
+            username='holder', email='holder@example.com', first_name='Ann', last_name='Lee',
+            onboarding_complete=True, **OnboardingMiddlewareTest.PROFILE,
+        )
+        self.project = make_project(title='Beach Cleanup')
+        self.certificate = Certificate.objects.create(user=self.user, project=self.project)
+        self.url = f'/verify-certificate/{self.certificate.certificate_id}'
+
+    def test_verification_is_served_from_the_index(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertContains(response, 'Ann Lee')
+        self.assertContains(response, 'Beach Cleanup')
+
+    def test_unknown_ids_are_negatively_cached(self):
+        with self.assertNumQueries(1):
+            self.client.get('/verify-certificate/GDA2000-NOPE')
+        with self.assertNumQueries(0):
+            response = self.client.post('/verify-certificate/', {'certificate_id': 'GDA2000-NOPE'})
+        self.assertContains(response, 'Invalid certificate ID')
+        # Ids that can't exist don't reach the database or the cache
+        with self.assertNumQueries(0):
+            self.client.get('/verify-certificate/' + 'X' * 200)
+
+    def test_index_follows_name_and_title_changes(self):
+        self.client.get(self.url)
+        self.user.first_name = 'Anna'
+        self.user.save()
+        self.project.title = 'Harbour Cleanup'
+        self.project.save()
+        response = self.client.get(self.url)
+        self.assertContains(response, 'Anna Lee')
+        self.assertContains(response, 'Harbour Cleanup')
+
+    def test_documents_are_rendered_once_and_revalidated(self):
+        import tempfile
+        from django.test import override_settings
+        from . import certificate_document_utils as documents
+        other = CustomUser.objects.create_user(username='other', email='other@example.com', onboarding_complete=True, **OnboardingMiddlewareTest.PROFILE)
+        url = f'/profile/certificates/download/{self.certificate.certificate_id}.pdf'
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            self.client.force_login(self.user)
+            with mock.patch.object(documents, 'render_certificate_image', wraps=documents.render_certificate_image) as render:
+                response = self.client.get(url)
+                self.assertTrue(b''.join(response.streaming_content).startswith(b'%PDF'))
+                png = self.client.get(url.replace('.pdf', '.png'))
+                self.assertEqual(png['Content-Type'], 'image/png')
+                png.close()
+            self.assertEqual(render.call_count, 1)
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+            self.client.force_login(other)
+            self.assertEqual(self.client.get(url).status_code, 302)
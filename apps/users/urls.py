@@ -20,6 +20,7 @@ urlpatterns = [
     path('profile/delete-account/', views.delete_account, name='delete_account'),
     path('profile/certificates/generate/<int:project_id>/', views.generate_certificate, name='generate_certificate'),
     path('profile/certificates/view/<str:certificate_id>/', views.view_certificate, name='view_certificate'),
+    path('profile/certificates/download/<str:certificate_id>.<str:fmt>', views.certificate_download, name='certificate_download'),
     path('onboarding/', views.onboarding, name='onboarding'),
     
     # Keep custom email verification URLs (used by custom email system)
@@ -32,5 +33,9 @@ urlpatterns = [
     # Sync API endpoints
     path('sync/create-user/', sync_views.sync_create_user, name='sync_create_user'),
     path('sync/check-user/', sync_views.sync_check_user, name='sync_check_user'),
+    path('sync/create-users/', sync_views.sync_create_users, name='sync_create_users'),
+    path('sync/check-users/', sync_views.sync_check_users, name='sync_check_users'),
+    path('sync/digest/', sync_views.sync_digest, name='sync_digest'),
+    path('sync/bucket-users/', sync_views.sync_bucket_users, name='sync_bucket_users'),
     path('sync/health/', sync_views.sync_health_check, name='sync_health_check'),
 ]
@@ -12,11 +12,18 @@ from django.urls import reverse
 from .forms import CustomUserRegistrationForm, CustomAuthenticationForm, CustomPasswordResetForm, CustomSetPasswordForm, ResendVerificationForm, CustomUserProfileForm, CustomUserOnboardingForm
 from .email_utils import send_verification_email as send_verification_email_html, send_password_reset_email
 from .models import Certificate
+from .middleware import remember_onboarding_state
 import logging
 from django.utils.safestring import mark_safe
-from datetime import date
-from apps.content.models import Project, NewsEvent, SuccessStory, FAQ, FAQVote
-from django.db.models import Sum
+from apps.content.models import Project
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from django.utils.translation import get_language
+from .certificate_utils import certificate_summary, project_has_ended
+from .certificate_document_utils import CERTIFICATE_FORMATS, certificate_document, document_version
+from .dashboard_utils import profile_dashboard
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -311,55 +318,6 @@ def profile(request):
 		messages.warning(request, 'Please log in to view your profile.')
 		return redirect('login')
 	
-	# Get enrolled projects
-	enrolled_projects = request.user.enrolled_projects.all()
-	today = date.today()
-	
-	upcoming_projects = []
-	current_projects = []
-	past_projects = []
-	
-	for project in enrolled_projects:
-		if project.start_date and project.start_date > today:
-			upcoming_projects.append(project)
-		elif project.end_date and project.start_date and project.start_date <= today <= project.end_date:
-			current_projects.append(project)
-		else:
-			past_projects.append(project)
-            
-	# Certificates Logic
-	certificates = Certificate.objects.filter(user=request.user)
-	certificate_map = {cert.project_id: cert for cert in certificates}
-	
-	eligible_projects = []
-	for project in past_projects:
-		if project.id in certificate_map:
-			project.user_certificate = certificate_map[project.id]
-		else:
-			project.user_certificate = None
-			eligible_projects.append(project)
-	
-	# Additional data for dashboard
-	recent_news_events = NewsEvent.objects.filter(is_published=True).order_by('-publish_date')[:5]
-	success_stories = SuccessStory.objects.filter(is_published=True, related_project__in=enrolled_projects).order_by('-published_at')[:5]
-	faqs = FAQ.objects.all().order_by('order')[:10]
-	
-	# Get user's votes for FAQs
-	user_faq_votes = {vote.faq_id: vote.vote_type for vote in FAQVote.objects.filter(user=request.user, faq__in=faqs)}
-	for faq in faqs:
-		faq.user_vote = user_faq_votes.get(faq.id, None)
-	
-	# User impact metrics
-	impact_data = SuccessStory.objects.filter(
-		related_project__in=past_projects, 
-		is_published=True
-	).aggregate(
-		total_beneficiaries=Sum('beneficiaries'),
-		total_hours=Sum('total_hours_contributed')
-	)
-	total_beneficiaries = impact_data['total_beneficiaries'] or 0
-	total_hours = impact_data['total_hours'] or 0
-	
 	# Form for Edit Profile tab
 	form = CustomUserProfileForm(instance=request.user)
 
@@ -370,16 +328,8 @@ def profile(request):
 
 	context = {
 		'user': request.user,
-		'upcoming_projects': upcoming_projects,
-		'current_projects': current_projects,
-		'past_projects': past_projects,
-		'certificates': certificates,
-		'eligible_projects': eligible_projects,
-		'recent_news_events': recent_news_events,
-		'success_stories': success_stories,
-		'faqs': faqs,
-		'total_beneficiaries': total_beneficiaries,
-		'total_hours': total_hours,
+		# Enrollments, certificates, impact totals and the cached global widgets
+		**profile_dashboard(request.user),
 		'form': form,
 		'social_accounts': social_accounts,
 		'connected_providers': connected_providers,
@@ -399,8 +349,7 @@ def generate_certificate(request, project_id):
 		messages.error(request, "You are not enrolled in this project.")
 		return redirect('profile')
 		
-	today = date.today()
-	if not project.end_date or project.end_date > today:
+	if not project_has_ended(project):
 		messages.error(request, "This project has not ended yet.")
 		return redirect('profile')
 		
@@ -420,44 +369,78 @@ def generate_certificate(request, project_id):
 
 @login_required
 def view_certificate(request, certificate_id):
-	certificate = get_object_or_404(Certificate, certificate_id=certificate_id)
+	certificate = certificate_summary(certificate_id)
+	if certificate is None:
+		raise Http404("No such certificate")
 
 	# Check permission
-	if certificate.user != request.user and not request.user.is_staff:
+	if certificate['user_id'] != request.user.pk and not request.user.is_staff:
 		messages.error(request, "You do not have permission to view this certificate.")
 		return redirect('profile')
 
-	context = {
-		'user': certificate.user,
-		'project': certificate.project,
-		'certificate_id': certificate.certificate_id,
-		'issued_at': certificate.issued_at,
+	# The page only changes with the certificate's content and the language
+	etag = quote_etag(f"{certificate['version']}-{get_language()}")
+	response = get_conditional_response(request, etag=etag)
+	if response is None:
+		response = render(request, 'users/certificate.html', {
+			'certificate': certificate,
+			'certificate_id': certificate['certificate_id'],
+			'issued_at': certificate['issued_at'],
+		})
+	response['ETag'] = etag
+	patch_cache_control(response, private=True, no_cache=True)
+	return response
+
+
+@login_required
+def certificate_download(request, certificate_id, fmt):
+	"""
+	Certificate as a pre-rendered PDF or PNG document
+	"""
+	certificate = certificate_summary(certificate_id)
+	if certificate is None or fmt not in CERTIFICATE_FORMATS:
+		raise Http404("No such certificate")
+	if certificate['user_id'] != request.user.pk and not request.user.is_staff:
+		messages.error(request, "You do not have permission to view this certificate.")
+		return redirect('profile')
+
+	etag = quote_etag(document_version(certificate))
+	response = get_conditional_response(request, etag=etag)
+	if response is None:
+		response = FileResponse(
+			default_storage.open(certificate_document(certificate, fmt)),
+			as_attachment=fmt == 'pdf',
+			filename=f"Certificate_{certificate['certificate_id']}.{fmt}",
+			content_type=CERTIFICATE_FORMATS[fmt],
+		)
+	response['ETag'] = etag
+	patch_cache_control(response, private=True, no_cache=True)
+	return response
+
+
+def _verification_context(certificate_id):
+	certificate = certificate_summary(certificate_id)
+	return {
+		'certificate': certificate,
+		'error_message': None if certificate else "Invalid certificate ID. Please check and try again.",
 	}
-	return render(request, 'users/certificate.html', context)
 
 
 def verify_certificate(request):
 	"""
 	Public view to verify certificate by ID
-	Anyone can access this page to check certificate validity
+	Anyone can access this page to check certificate validity.
+	Lookups go through the cached verification index.
 	"""
-	certificate = None
-	error_message = None
+	context = {'certificate': None, 'error_message': None}
 
 	if request.method == 'POST':
 		certificate_id = request.POST.get('certificate_id', '').strip()
 		if certificate_id:
-			try:
-				certificate = Certificate.objects.select_related('user', 'project').get(certificate_id=certificate_id)
-			except Certificate.DoesNotExist:
-				error_message = "Invalid certificate ID. Please check and try again."
+			context = _verification_context(certificate_id)
 		else:
-			error_message = "Please enter a certificate ID."
+			context['error_message'] = "Please enter a certificate ID."
 
-	context = {
-		'certificate': certificate,
-		'error_message': error_message,
-	}
 	return render(request, 'users/verify_certificate.html', context)
 
 
@@ -465,19 +448,7 @@ def certificate_verification_url(request, certificate_id):
 	"""
 	Direct URL verification
 	"""
-	certificate = None
-	error_message = None
-	
-	try:
-		certificate = Certificate.objects.select_related('user', 'project').get(certificate_id=certificate_id)
-	except Certificate.DoesNotExist:
-		error_message = "Invalid certificate ID. Please check and try again."
-		
-	context = {
-		'certificate': certificate,
-		'error_message': error_message,
-	}
-	return render(request, 'users/verify_certificate.html', context)
+	return render(request, 'users/verify_certificate.html', _verification_context(certificate_id))
 
 
 @login_required
@@ -522,7 +493,8 @@ def profile_edit(request):
 	if request.method == 'POST':
 		form = CustomUserProfileForm(request.POST, instance=request.user)
 		if form.is_valid():
-			form.save()
+			user = form.save()
+			remember_onboarding_state(request, user)
 			messages.success(request, 'Your profile has been updated successfully.')
 			return redirect('profile')
 	else:
@@ -537,18 +509,10 @@ def onboarding(request):
 	"""
 	# Check if user actually needs onboarding
 	user = request.user
-	needs_onboarding = (
-		not getattr(user, 'onboarding_complete', False) or
-		not user.date_of_birth or
-		not user.guardian_name or
-		not user.guardian_relation or
-		not user.address or
-		not user.contact or
-		not user.country_code
-	)
-	
+
 	# If user doesn't need onboarding, logout the user
-	if not needs_onboarding:
+	if not user.needs_onboarding:
+		remember_onboarding_state(request, user)
 		return redirect('profile')
 
 	# Set a session flag to indicate the user has visited the onboarding page
@@ -569,6 +533,7 @@ def onboarding(request):
 			# Clear the session flag once onboarding is complete
 			if 'onboarding_visited' in request.session:
 				del request.session['onboarding_visited']
+			remember_onboarding_state(request, user)
 
 			return redirect('profile')
 	else:
@@ -584,18 +549,10 @@ def user_logged_in_handler(sender, request, user, **kwargs):
     """
     logger.info(f"User logged in: {user.username}")
     
-    # Check if user needs onboarding
-    needs_onboarding = (
-        not getattr(user, 'onboarding_complete', False) or
-        not user.date_of_birth or
-        not user.guardian_name or
-        not user.guardian_relation or
-        not user.address or
-        not user.contact or
-        not user.country_code
-    )
-    
-    if needs_onboarding:
+    # Cache the onboarding state for OnboardingMiddleware
+    remember_onboarding_state(request, user)
+
+    if user.needs_onboarding:
         logger.info(f"Redirecting {user.username} to onboarding")
         from django.shortcuts import redirect
         from django.urls import reverse
@@ -630,15 +587,8 @@ def pre_social_login_handler(request, sociallogin, **kwargs):
 	user = getattr(sociallogin, 'user', None)
 	needs_onboarding = False
 	if user is not None:
-		needs_onboarding = (
-			not getattr(user, 'onboarding_complete', False) or
-			not getattr(user, 'date_of_birth', None) or
-			not getattr(user, 'guardian_name', None) or
-			not getattr(user, 'guardian_relation', None) or
-			not getattr(user, 'address', None) or
-			not getattr(user, 'contact', None) or
-			not getattr(user, 'country_code', None)
-		)
+		# May not be saved yet, so compute rather than read the stored flag
+		needs_onboarding = user.compute_needs_onboarding()
 
 	if needs_onboarding:
 		try:
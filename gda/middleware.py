@@ -0,0 +1,97 @@
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.base import BaseHandler
+from django.core.handlers.exception import convert_exception_to_response
+from django.utils import translation
+from django.utils.module_loading import import_string
+
+
+class LightweightHandler(BaseHandler):
+    """
+    Resolves and runs views behind ``middleware`` instead of
+    ``settings.MIDDLEWARE``. It uses the same hook registration as Django's
+    own handler.
+    """
+
+    def __init__(self, middleware):
+        super().__init__()
+        self.middleware = list(middleware)
+        self.load_middleware()
+
+    def load_middleware(self, is_async=False):
+        self._view_middleware = []
+        self._template_response_middleware = []
+        self._exception_middleware = []
+
+        handler = convert_exception_to_response(self._get_response)
+        for middleware_path in reversed(self.middleware):
+            mw_instance = import_string(middleware_path)(handler)
+            if hasattr(mw_instance, 'process_view'):
+                self._view_middleware.insert(0, mw_instance.process_view)
+            if hasattr(mw_instance, 'process_template_response'):
+                self._template_response_middleware.append(mw_instance.process_template_response)
+            if hasattr(mw_instance, 'process_exception'):
+                self._exception_middleware.append(mw_instance.process_exception)
+            handler = convert_exception_to_response(mw_instance)
+        self._middleware_chain = handler
+
+    def __call__(self, request):
+        return self._middleware_chain(request)
+
+
+class RouteProfileMiddleware:
+    """
+    Sends asset-like requests through a reduced middleware stack.
+
+    Requests under ``LIGHTWEIGHT_PATHS`` skip the session, auth, CSRF, messages,
+    allauth and onboarding middleware. They run only ``LIGHTWEIGHT_MIDDLEWARE``.
+    Safe-method requests under ``LIGHTWEIGHT_ANONYMOUS_PATHS`` are handled the
+    same way when they carry no session cookie. ``request.user`` is always
+    anonymous on this path.
+    """
+
+    SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.paths = tuple(getattr(settings, 'LIGHTWEIGHT_PATHS', ()))
+        self.anonymous_paths = tuple(getattr(settings, 'LIGHTWEIGHT_ANONYMOUS_PATHS', ()))
+        if not self.paths and not self.anonymous_paths:
+            raise MiddlewareNotUsed
+        self.lightweight_handler = LightweightHandler(getattr(settings, 'LIGHTWEIGHT_MIDDLEWARE', ()))
+
+    def is_lightweight(self, request):
+        if request.path.startswith(self.paths):
+            return True
+        return (
+            request.path.startswith(self.anonymous_paths)
+            and request.method in self.SAFE_METHODS
+            and settings.SESSION_COOKIE_NAME not in request.COOKIES
+        )
+
+    def __call__(self, request):
+        if not self.is_lightweight(request):
+            return self.get_response(request)
+        request.user = AnonymousUser()
+        return self.lightweight_handler(request)
+
+
+class QueryLanguageMiddleware:
+    """
+    Activates the language named by ``?lang=<code>`` for the current request
+    only. Each language version of a page then has its own URL, which the
+    sitemap's hreflang alternates point at. Goes after LocaleMiddleware; the
+    visitor's saved language choice is left alone.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.languages = {code for code, _ in settings.LANGUAGES}
+
+    def __call__(self, request):
+        language = request.GET.get('lang')
+        if language in self.languages:
+            translation.activate(language)
+            request.LANGUAGE_CODE = language
+        return self.get_response(request)
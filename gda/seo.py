@@ -1,26 +1,227 @@
+"""
+Sitemaps generated from the database and served from memory.
+
+``/sitemap.xml`` is a sitemap index pointing at partitions such as
+``/sitemap-projects-1.xml``, each holding at most ``SITEMAP_URL_LIMIT`` URLs.
+Every content URL carries ``lastmod`` from ``updated_at`` and ``hreflang``
+alternates for each language (``?lang=<code>``, see QueryLanguageMiddleware).
+
+The URL list of each section is kept in process memory. At most every
+``SITEMAP_REFRESH_SECONDS`` the id of the latest ``ContentChange`` is checked;
+when it moved, only the sections whose kind appears in the new log entries are
+reloaded. Documents are rendered per host on first request, stored gzipped
+and served with an ETag of their content, so unchanged partitions keep their
+ETag across regenerations.
+"""
+from xml.sax.saxutils import escape, quoteattr
+import gzip
+import hashlib
+import os
+import threading
+import time
+
 from django.conf import settings
 from django.http import HttpResponse, FileResponse, Http404
-import os
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import quote_etag
+from django.utils.translation import to_locale
+
+# Limit per sitemap file set by the sitemaps protocol
+SITEMAP_URL_LIMIT = 50000
+
+# Static pages: (url name, priority)
+SITEMAP_PAGES = (
+    ('landing_page', '0.9'),
+    ('content_project_list', '0.9'),
+    ('content_news_event_list', '0.9'),
+    ('content_success_story_list', '0.9'),
+    ('content_faq_list', '0.9'),
+    ('taiwan', '0.9'),
+    ('taiwan_cultural_experience', '0.9'),
+    ('amazing_taiwan', '0.9'),
+    ('content_organization', '0.9'),
+    ('founder', '0.9'),
+    ('privacy_policy', '0.6'),
+    ('cookies_policy', '0.6'),
+    ('terms_of_service', '0.6'),
+    ('earth_day', '0.9'),
+    ('green_declaration_2018', '0.9'),
+    ('volunteer_video_upload', '0.6'),
+    ('life_of_gong_school', '0.9'),
+)
+
+
+def _content_sections():
+    from apps.content.models import ContentChange, NewsEvent, Project, SuccessStory
+
+    # section: (change log kind, queryset, detail url name, priority)
+    return {
+        'projects': (ContentChange.Kind.PROJECT, Project.objects.filter(is_active=True), 'content_project_detail', '0.8'),
+        'news-events': (ContentChange.Kind.NEWS_EVENT, NewsEvent.objects.filter(is_published=True), 'content_news_event_detail', '0.7'),
+        'success-stories': (ContentChange.Kind.SUCCESS_STORY, SuccessStory.objects.filter(is_published=True), 'content_success_story_detail', '0.7'),
+    }
 
-def sitemap_view(request):
+
+def _hreflang(code):
+    return to_locale(code).replace('_', '-')
+
+
+class SitemapFile:
+    """A rendered sitemap document, kept gzipped"""
+
+    def __init__(self, body):
+        self.gzipped = gzip.compress(body, mtime=0)
+        self.etag = quote_etag(hashlib.md5(body).hexdigest())
+
+    def body(self):
+        return gzip.decompress(self.gzipped)
+
+
+class SitemapStore:
     """
-    Serve the correct sitemap based on the request host.
-    This mimics the Nginx configuration for environments where Nginx is not present (e.g. Vercel).
+    Per-process sitemap entries and rendered documents.
+
+    ``entries`` maps a section to its ``(path, lastmod, priority)`` tuples;
+    ``files`` maps ``(base_url, name)`` to a SitemapFile, where name is
+    ``'index'`` or ``'<section>-<page>'``.
     """
-    host = request.get_host()
-    filename = f'sitemap_{host}.xml'
-    static_dir = os.path.join(settings.BASE_DIR, 'static')
-    filepath = os.path.join(static_dir, filename)
-    
-    if os.path.exists(filepath):
-        return FileResponse(open(filepath, 'rb'), content_type='application/xml')
-        
-    # Fallback to sitemap.xml (Index)
-    fallback_path = os.path.join(static_dir, 'sitemap.xml')
-    if os.path.exists(fallback_path):
-        return FileResponse(open(fallback_path, 'rb'), content_type='application/xml')
-        
-    raise Http404
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.cursor = None
+        self.checked_at = 0
+        self.entries = {}
+        self.files = {}
+
+    def clear(self):
+        with self.lock:
+            self.cursor = None
+            self.checked_at = 0
+            self.entries = {}
+            self.files = {}
+
+    def _load_section(self, section):
+        if section == 'pages':
+            return [(reverse(name), None, priority) for name, priority in SITEMAP_PAGES]
+        _, queryset, url_name, priority = _content_sections()[section]
+        # Reverse once and fill in the pk, rather than reversing every row
+        url_template = reverse(url_name, args=[0]).replace('/0/', '/{}/')
+        return [
+            (url_template.format(pk), updated_at.date().isoformat() if updated_at else None, priority)
+            for pk, updated_at in queryset.order_by('pk').values_list('pk', 'updated_at').iterator()
+        ]
+
+    def _reload(self, sections):
+        if not sections:
+            return
+        for section in sections:
+            self.entries[section] = self._load_section(section)
+        stale = set(sections)
+        self.files = {
+            key: file for key, file in self.files.items()
+            if key[1] != 'index' and key[1].rsplit('-', 1)[0] not in stale
+        }
+
+    def refresh(self):
+        """Reload the sections that changed since the last check, at most every SITEMAP_REFRESH_SECONDS"""
+        from apps.content.card_utils import content_cursor
+        from apps.content.models import ContentChange
+
+        interval = getattr(settings, 'SITEMAP_REFRESH_SECONDS', 60)
+        if self.cursor is not None and time.monotonic() - self.checked_at < interval:
+            return
+        with self.lock:
+            cursor = content_cursor()
+            if self.cursor is None or cursor < self.cursor:
+                # First load, or the change log was reset
+                self._reload(['pages', *_content_sections()])
+            elif cursor != self.cursor:
+                kinds = set(ContentChange.objects.filter(id__gt=self.cursor, id__lte=cursor).values_list('kind', flat=True).distinct())
+                self._reload([section for section, (kind, *_) in _content_sections().items() if kind in kinds])
+            self.cursor = cursor
+            self.checked_at = time.monotonic()
+
+    def partitions(self):
+        """``[(name, entries)]`` for every non-empty partition"""
+        partitions = []
+        for section, entries in self.entries.items():
+            for page, start in enumerate(range(0, len(entries), SITEMAP_URL_LIMIT), 1):
+                partitions.append((f'{section}-{page}', entries[start:start + SITEMAP_URL_LIMIT]))
+        return partitions
+
+    def _render_index(self, base_url):
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+                 '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+        for name, entries in self.partitions():
+            lastmod = max((lastmod for _, lastmod, _ in entries if lastmod), default=None)
+            lines.append(f'<sitemap><loc>{escape(base_url)}/sitemap-{name}.xml</loc>'
+                         + (f'<lastmod>{lastmod}</lastmod>' if lastmod else '') + '</sitemap>')
+        lines.append('</sitemapindex>')
+        return '\n'.join(lines)
+
+    def _render_urlset(self, base_url, entries):
+        languages = [code for code, _ in settings.LANGUAGES]
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+                 '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" xmlns:xhtml="http://www.w3.org/1999/xhtml">']
+        for path, lastmod, priority in entries:
+            loc = base_url + path
+            alternates = ''.join(
+                f'<xhtml:link rel="alternate" hreflang="{_hreflang(code)}" href={quoteattr(f"{loc}?lang={code}")}/>'
+                for code in languages
+            )
+            lines.append(
+                f'<url><loc>{escape(loc)}</loc>'
+                + (f'<lastmod>{lastmod}</lastmod>' if lastmod else '')
+                + f'<priority>{priority}</priority>{alternates}'
+                + f'<xhtml:link rel="alternate" hreflang="x-default" href={quoteattr(loc)}/></url>'
+            )
+        lines.append('</urlset>')
+        return '\n'.join(lines)
+
+    def get(self, base_url, name):
+        """The SitemapFile for ``name`` on ``base_url``, or None if there is no such partition"""
+        self.refresh()
+        key = (base_url, name)
+        file = self.files.get(key)
+        if file is not None:
+            return file
+        with self.lock:
+            if name == 'index':
+                body = self._render_index(base_url)
+            else:
+                entries = dict(self.partitions()).get(name)
+                if entries is None:
+                    return None
+                body = self._render_urlset(base_url, entries)
+            file = self.files[key] = SitemapFile(body.encode())
+        return file
+
+
+sitemap_store = SitemapStore()
+
+
+def sitemap_view(request, section=None, page=None):
+    """
+    Serve the sitemap index (``/sitemap.xml``) or one partition for the
+    request's host, gzipped when the client accepts it.
+    """
+    name = 'index' if section is None else f'{section}-{page}'
+    file = sitemap_store.get(f'{request.scheme}://{request.get_host()}', name)
+    if file is None:
+        raise Http404
+
+    response = get_conditional_response(request, etag=file.etag)
+    if response is None:
+        if 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', ''):
+            response = HttpResponse(file.gzipped, content_type='application/xml')
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(file.body(), content_type='application/xml')
+    response['ETag'] = file.etag
+    patch_vary_headers(response, ('Accept-Encoding',))
+    patch_cache_control(response, public=True, max_age=getattr(settings, 'SITEMAP_REFRESH_SECONDS', 60))
+    return response
 
 def robots_view(request):
     """
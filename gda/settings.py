@@ -89,21 +89,59 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
 }
+# Seconds anonymous clients/proxies may reuse content API responses (ETags still revalidate)
+API_CACHE_MAX_AGE = int(os.environ.get('API_CACHE_MAX_AGE', 60))
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'apps.content_management.middleware.PerfInstrumentationMiddleware',
+    'gda.middleware.RouteProfileMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
+    'gda.middleware.QueryLanguageMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.users.middleware.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'allauth.account.middleware.AccountMiddleware',
     'apps.users.middleware.OnboardingMiddleware',
 ]
 
+# Prefixes served by a reduced middleware stack (see gda/middleware.py): no session,
+# auth, CSRF, messages, allauth or onboarding middleware, and request.user is anonymous
+LIGHTWEIGHT_PATHS = ('/blob/', '/health/', '/robots.txt', '/sitemap')
+# Prefixes given the same treatment for GET/HEAD/OPTIONS requests without a session cookie
+LIGHTWEIGHT_ANONYMOUS_PATHS = ('/api/',)
+LIGHTWEIGHT_MIDDLEWARE = [
+    'django.middleware.locale.LocaleMiddleware',
+    'django.middleware.common.CommonMiddleware',
+]
+
+# Seconds a logged-in user is reused from a per-process cache instead of being read on
+# every request (0, the default, disables it). Saves in the same process invalidate it
+# immediately, but other processes keep a deactivated or demoted user's permissions
+# until their copy expires, so only enable it where that delay is acceptable.
+AUTH_USER_CACHE_TTL = int(os.environ.get('AUTH_USER_CACHE_TTL', 0))
+
+# Per-request query/latency instrumentation (see apps/content_management/perf.py)
+PERF_INSTRUMENTATION = os.environ.get('PERF_INSTRUMENTATION', 'True') == 'True'
+# Emit Server-Timing headers for every visitor, not only staff users
+PERF_SERVER_TIMING_PUBLIC = os.environ.get('PERF_SERVER_TIMING_PUBLIC', str(DEBUG)) == 'True'
+# 'log' writes a warning when a budget is exceeded, 'raise' fails the request (use in tests)
+PERF_BUDGET_ACTION = os.environ.get('PERF_BUDGET_ACTION', 'log')
+PERF_HISTORY_SIZE = 200
+# Budgets keyed by URL name; '*' applies to every route without its own entry.
+# Supported limits: queries, db_ms, duplicates, total_ms
+PERF_BUDGETS = {
+    '*': {'queries': 50, 'duplicates': 20},
+    'management_dashboard': {'queries': 120, 'db_ms': 1000},
+    'content_project_detail': {'queries': 30},
+    'content_news_event_detail': {'queries': 30},
+    'content_success_story_detail': {'queries': 30},
+}
+
 ROOT_URLCONF = 'gda.urls'
 
 TEMPLATES = [
@@ -288,6 +326,10 @@ STATIC_ROOT = Path(os.environ.get('STATIC_ROOT', BASE_DIR / 'staticfiles'))
 # Security-related settings — set via environment in production
 SECURE_SSL_REDIRECT = os.environ.get('SECURE_SSL_REDIRECT', 'False') == 'True'
 SESSION_COOKIE_SECURE = os.environ.get('SESSION_COOKIE_SECURE', 'False') == 'True'
+# 'django.contrib.sessions.backends.cached_db' avoids the session SELECT when CACHES is shared
+# between processes (e.g. Redis); 'django.contrib.sessions.backends.signed_cookies' needs no
+# storage at all. The default database backend works without any cache.
+SESSION_ENGINE = os.environ.get('SESSION_ENGINE', 'django.contrib.sessions.backends.db')
 CSRF_COOKIE_SECURE = os.environ.get('CSRF_COOKIE_SECURE', 'False') == 'True'
 # HSTS settings (only enable after careful consideration)
 SECURE_HSTS_SECONDS = int(os.environ.get('SECURE_HSTS_SECONDS', 0))
@@ -319,4 +361,44 @@ EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
 # Ensure DEFAULT_FROM_EMAIL is never empty - use a valid fallback
 DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', EMAIL_HOST_USER or 'noreply@example.com')
 EMAIL_SUBJECT_PREFIX = os.environ.get('EMAIL_SUBJECT_PREFIX', 'GDA ')
-EMAIL_TIMEOUT = int(os.environ.get('EMAIL_TIMEOUT', 10))
\ No newline at end of file
+EMAIL_TIMEOUT = int(os.environ.get('EMAIL_TIMEOUT', 10))
+
+# Outboxes (email, KICC user sync) are drained by a thread in each web process on
+# long-running servers. Serverless platforms freeze the process after the response
+# (Vercel sets VERCEL=1), so there they are drained in the request instead.
+LONG_RUNNING_SERVER = not os.environ.get('VERCEL')
+
+# KICC user sync outbox delivery (see apps/users/outbox_utils.py): 'thread', 'inline',
+# or 'worker' when `manage.py process_user_sync_outbox --loop` runs (docker-compose sync-worker)
+USER_SYNC_DELIVERY = os.environ.get('USER_SYNC_DELIVERY', 'thread' if LONG_RUNNING_SERVER else 'inline')
+USER_SYNC_POLL_SECONDS = int(os.environ.get('USER_SYNC_POLL_SECONDS', 30))
+
+# Email outbox: transactional emails are queued and sent in the background
+EMAIL_OUTBOX_ENABLED = os.environ.get('EMAIL_OUTBOX_ENABLED', 'True') == 'True'
+# Delivery mode as for USER_SYNC_DELIVERY; 'worker' when `manage.py send_queued_emails --loop`
+# runs (docker-compose email-worker)
+EMAIL_OUTBOX_DELIVERY = os.environ.get('EMAIL_OUTBOX_DELIVERY', 'thread' if LONG_RUNNING_SERVER else 'inline')
+EMAIL_OUTBOX_POLL_SECONDS = int(os.environ.get('EMAIL_OUTBOX_POLL_SECONDS', 30))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.environ.get('EMAIL_OUTBOX_MAX_ATTEMPTS', 6))
+EMAIL_OUTBOX_BACKOFF_SECONDS = int(os.environ.get('EMAIL_OUTBOX_BACKOFF_SECONDS', 60))
+EMAIL_OUTBOX_BACKOFF_MAX_SECONDS = int(os.environ.get('EMAIL_OUTBOX_BACKOFF_MAX_SECONDS', 3600))
+# Messages per minute by recipient mail domain; '*' applies to all others.
+# Each sending process keeps its own budget, so with the 'thread' mode the real rate
+# is this times the number of web processes; use one worker for an exact limit.
+EMAIL_OUTBOX_RATE_LIMITS = {'*': int(os.environ.get('EMAIL_OUTBOX_RATE_PER_MINUTE', 60))}
+
+# Certificates: documents are rendered in a background thread once issued;
+# disable when `manage.py render_certificates` runs as a worker or from cron
+CERTIFICATE_RENDER_INPROCESS = os.environ.get('CERTIFICATE_RENDER_INPROCESS', 'True') == 'True'
+# Site URL printed on rendered certificates (defaults to https:// + the first ALLOWED_HOSTS entry)
+CERTIFICATE_BASE_URL = os.environ.get('CERTIFICATE_BASE_URL', '')
+# TrueType font for rendered certificates; needed for names and titles outside Latin script
+CERTIFICATE_FONT_PATH = os.environ.get('CERTIFICATE_FONT_PATH', '')
+
+# Age at which content change log entries are served by /api/changes/ and move the
+# card and sitemap caches, so entries from transactions still in flight aren't skipped
+CONTENT_CHANGE_SETTLE_SECONDS = int(os.environ.get('CONTENT_CHANGE_SETTLE_SECONDS', 5))
+
+# Seconds between checks of the content change log for sitemap updates; also the
+# sitemaps' Cache-Control max-age
+SITEMAP_REFRESH_SECONDS = int(os.environ.get('SITEMAP_REFRESH_SECONDS', 60))
\ No newline at end of file
@@ -25,7 +25,7 @@ from rest_framework import routers
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 from rest_framework import permissions
-from apps.content.api_views import ProjectViewSet, NewsEventViewSet, SuccessStoryViewSet
+from apps.content.api_views import ProjectViewSet, NewsEventViewSet, SuccessStoryViewSet, ChangeFeedView
 from apps.users.api_views import UserViewSet
 
 from gda.seo import sitemap_view, robots_view
@@ -64,10 +64,12 @@ urlpatterns = [
     path('i18n/', include('django.conf.urls.i18n')),
     path('health/', lambda r: HttpResponse('OK')),
     # API URLs
+    path('api/changes/', ChangeFeedView.as_view(), name='api_changes'),
     path('', include(router.urls)),
     path('api-auth/', include('rest_framework.urls')),
     # SEO URLs
     path('sitemap.xml', sitemap_view),
+    path('sitemap-<slug:section>-<int:page>.xml', sitemap_view),
     path('robots.txt', robots_view),
     # Swagger documentation
     path('swagger<format>/', schema_view.without_ui(cache_timeout=0), name='schema-json'),